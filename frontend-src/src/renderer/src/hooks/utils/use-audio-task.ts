@@ -10,6 +10,8 @@ import { DisplayText } from '@/services/websocket-service';
 
 interface AudioTaskOptions {
   audioBase64: string
+  audioUrl?: string  // Object URL of audio received as a binary frame
+  mimeType?: string
   volumes: number[]
   sliceLength: number
   displayText?: DisplayText | null
@@ -53,16 +55,28 @@ export const useAudioTask = () => {
 
     if (currentAiState === 'interrupted') {
       console.error('Audio playback blocked. State:', currentAiState);
+      if (options.audioUrl) URL.revokeObjectURL(options.audioUrl);
       resolve();
       return;
     }
 
-    const { audioBase64, displayText, expressions, motions, forwarded } = options;
+    const {
+      audioBase64, audioUrl, mimeType, displayText, expressions, motions, forwarded,
+    } = options;
+    let audioSource = '';
+    if (audioUrl) {
+      audioSource = audioUrl;
+    } else if (audioBase64) {
+      audioSource = `data:${mimeType || 'audio/wav'};base64,${audioBase64}`;
+    }
+    const releaseAudio = () => {
+      if (audioUrl) URL.revokeObjectURL(audioUrl);
+    };
 
     if (displayText) {
       appendText(displayText.text);
       appendAI(displayText.text, displayText.name, displayText.avatar);
-      if (audioBase64) {
+      if (audioSource) {
         updateSubtitle(displayText.text);
       }
       if (!forwarded) {
@@ -76,6 +90,7 @@ export const useAudioTask = () => {
 
     if (!model) {
       console.error('Model not initialized');
+      releaseAudio();
       resolve();
       return;
     }
@@ -99,16 +114,18 @@ export const useAudioTask = () => {
       }
 
       let isFinished = false;
-      if (audioBase64) {
-        model.speak(`data:audio/wav;base64,${audioBase64}`, {
+      if (audioSource) {
+        model.speak(audioSource, {
           onFinish: () => {
             console.log("Voiceline is over");
             isFinished = true;
+            releaseAudio();
             resolve();
           },
           onError: (error) => {
             console.error("Audio playback error:", error);
             isFinished = true;
+            releaseAudio();
             resolve();
           },
         });
@@ -124,6 +141,7 @@ export const useAudioTask = () => {
       checkFinished();
     } catch (error) {
       console.error('Speak function error:', error);
+      releaseAudio();
       toaster.create({
         title: `Speak function error: ${error}`,
         type: "error",
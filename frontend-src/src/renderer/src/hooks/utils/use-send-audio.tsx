@@ -1,6 +1,10 @@
 import { useCallback } from "react";
 import { useWebSocket } from "@/context/websocket-context";
 import { useMediaCapture } from "@/hooks/utils/use-media-capture";
+import { wsService } from "@/services/websocket-service";
+
+// Sample rate of the utterances MicVAD hands to onSpeechEnd
+const VAD_SAMPLE_RATE = 16000;
 
 export function useSendAudio() {
   const { sendMessage } = useWebSocket();
@@ -13,12 +17,15 @@ export function useSendAudio() {
       // Send the audio data in chunks
       for (let index = 0; index < audio.length; index += chunkSize) {
         const endIndex = Math.min(index + chunkSize, audio.length);
-        const chunk = audio.slice(index, endIndex);
-        sendMessage({
-          type: "mic-audio-data",
-          audio: Array.from(chunk),
-          // Only send images with first chunk
-        });
+        const chunk = audio.subarray(index, endIndex);
+        // Binary int16 frames when the server supports them, JSON otherwise
+        if (!wsService.sendAudioFrame(chunk, VAD_SAMPLE_RATE)) {
+          sendMessage({
+            type: "mic-audio-data",
+            audio: Array.from(chunk),
+            // Only send images with first chunk
+          });
+        }
       }
 
       // Send end signal after all chunks
@@ -151,10 +151,13 @@ function WebSocketHandler({ children }: { children: React.ReactNode }) {
       case 'audio':
         if (aiState === 'interrupted' || aiState === 'listening') {
           console.log('Audio playback intercepted. Sentence:', message.display_text?.text);
+          if (message.audio_url) URL.revokeObjectURL(message.audio_url);
         } else {
           console.log("actions", message.actions);
           addAudioTask({
             audioBase64: message.audio || '',
+            audioUrl: message.audio_url || '',
+            mimeType: message.mime_type || 'audio/wav',
             volumes: message.volumes || [],
             sliceLength: message.slice_length || 0,
             displayText: message.display_text || null,
@@ -213,7 +216,10 @@ function WebSocketHandler({ children }: { children: React.ReactNode }) {
         break;
       case 'user-input-transcription':
         console.log('user-input-transcription: ', message.text);
-        if (message.text) {
+        if (message.partial) {
+          // Streaming ASR result while the user is still speaking
+          setSubtitleText(message.text || '');
+        } else if (message.text) {
           appendHumanMessage(message.text);
         }
         break;
@@ -48,6 +48,7 @@ export interface MessageEvent {
   files?: BackgroundFile[];
   actions?: Actions;
   text?: string;
+  partial?: boolean;
   model_info?: ModelInfo;
   conf_name?: string;
   conf_uid?: string;
@@ -63,6 +64,26 @@ export interface MessageEvent {
   client_uid?: string;
   forwarded?: boolean;
   display_text?: DisplayText;
+  audio_id?: number;
+  audio_url?: string;
+  mime_type?: string;
+  binary_audio?: boolean;
+}
+
+// Binary microphone frames: a 12-byte little-endian header (kind, version,
+// reserved, sample rate, sequence) followed by int16 PCM. See
+// src/open_llm_vtuber/utils/audio_frame.py on the server.
+const AUDIO_FRAME_HEADER_SIZE = 12;
+const AUDIO_FRAME_VERSION = 1;
+const AUDIO_FRAME_MIC_AUDIO_DATA = 1;
+
+// Compressed codecs the server may send speech in, if this browser plays them
+function playableAudioCodecs(): string[] {
+  const audio = new Audio();
+  const codecs: string[] = [];
+  if (audio.canPlayType('audio/ogg; codecs=opus')) codecs.push('opus');
+  if (audio.canPlayType('audio/mpeg')) codecs.push('mp3');
+  return codecs;
 }
 
 class WebSocketService {
@@ -76,6 +97,14 @@ class WebSocketService {
 
   private currentState: 'CONNECTING' | 'OPEN' | 'CLOSING' | 'CLOSED' = 'CLOSED';
 
+  // Audio messages waiting for their binary frame, by audio_id
+  private pendingAudio = new Map<number, MessageEvent>();
+
+  // Whether the server confirmed binary audio frames for this connection
+  private binaryAudio = false;
+
+  private audioFrameSequence = 0;
+
   static getInstance() {
     if (!WebSocketService.instance) {
       WebSocketService.instance = new WebSocketService();
@@ -84,6 +113,12 @@ class WebSocketService {
   }
 
   private initializeConnection() {
+    // Receive TTS audio as binary frames instead of base64 inside JSON
+    this.sendMessage({
+      type: 'client-capabilities',
+      binary_audio: true,
+      audio_codecs: playableAudioCodecs(),
+    });
     this.sendMessage({
       type: 'fetch-backgrounds',
     });
@@ -106,6 +141,10 @@ class WebSocketService {
 
     try {
       this.ws = new WebSocket(url);
+      this.ws.binaryType = 'arraybuffer';
+      this.pendingAudio.clear();
+      this.binaryAudio = false;
+      this.audioFrameSequence = 0;
       this.currentState = 'CONNECTING';
       this.stateSubject.next('CONNECTING');
 
@@ -116,8 +155,21 @@ class WebSocketService {
       };
 
       this.ws.onmessage = (event) => {
+        if (event.data instanceof ArrayBuffer) {
+          this.handleAudioFrame(event.data);
+          return;
+        }
         try {
           const message = JSON.parse(event.data);
+          if (message.type === 'client-capabilities-ack') {
+            this.binaryAudio = Boolean(message.binary_audio);
+            return;
+          }
+          if (message.type === 'audio' && message.audio_id !== undefined) {
+            // Emitted once its audio frame arrives
+            this.pendingAudio.set(message.audio_id, message);
+            return;
+          }
           this.messageSubject.next(message);
         } catch (error) {
           console.error('Failed to parse WebSocket message:', error);
@@ -145,6 +197,23 @@ class WebSocketService {
     }
   }
 
+  // A binary frame is a 4-byte big-endian audio_id followed by a WAV file
+  private handleAudioFrame(data: ArrayBuffer) {
+    if (data.byteLength < 4) {
+      console.warn('Ignoring short binary frame');
+      return;
+    }
+    const audioId = new DataView(data).getUint32(0);
+    const message = this.pendingAudio.get(audioId);
+    if (!message) {
+      console.warn('Audio frame without its message:', audioId);
+      return;
+    }
+    this.pendingAudio.delete(audioId);
+    const blob = new Blob([data.slice(4)], { type: message.mime_type || 'audio/wav' });
+    this.messageSubject.next({ ...message, audio_url: URL.createObjectURL(blob) });
+  }
+
   sendMessage(message: object) {
     if (this.ws?.readyState === WebSocket.OPEN) {
       this.ws.send(JSON.stringify(message));
@@ -158,6 +227,32 @@ class WebSocketService {
     }
   }
 
+  // Send microphone samples as a binary int16 frame instead of a JSON float
+  // array. Returns false (and sends nothing) if the server has not confirmed
+  // binary audio, so the caller can fall back to mic-audio-data.
+  sendAudioFrame(samples: Float32Array, sampleRate: number): boolean {
+    if (!this.binaryAudio || this.ws?.readyState !== WebSocket.OPEN) {
+      return false;
+    }
+    const frame = new ArrayBuffer(AUDIO_FRAME_HEADER_SIZE + samples.length * 2);
+    const header = new DataView(frame, 0, AUDIO_FRAME_HEADER_SIZE);
+    header.setUint8(0, AUDIO_FRAME_MIC_AUDIO_DATA);
+    header.setUint8(1, AUDIO_FRAME_VERSION);
+    header.setUint16(2, 0, true);
+    header.setUint32(4, sampleRate, true);
+    header.setUint32(8, this.audioFrameSequence, true);
+    this.audioFrameSequence = (this.audioFrameSequence + 1) >>> 0;
+
+    // Typed arrays use the platform's byte order, little-endian in every
+    // browser and Electron build we ship for
+    const pcm = new Int16Array(frame, AUDIO_FRAME_HEADER_SIZE);
+    for (let i = 0; i < samples.length; i += 1) {
+      pcm[i] = Math.max(-1, Math.min(1, samples[i])) * 32767;
+    }
+    this.ws.send(frame);
+    return true;
+  }
+
   onMessage(callback: (message: MessageEvent) => void) {
     return this.messageSubject.subscribe(callback);
   }
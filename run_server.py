@@ -1,7 +1,11 @@
 import os
 import sys
+import json
+import time
 import atexit
 import argparse
+import subprocess
+from collections import defaultdict
 from pathlib import Path
 import tomli
 import uvicorn
@@ -48,11 +52,103 @@ def parse_args():
     parser.add_argument(
         "--hf_mirror", action="store_true", help="Use Hugging Face mirror"
     )
+    parser.add_argument(
+        "--init-only",
+        action="store_true",
+        help="Load the config and initialize the engines, then exit without serving",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report where startup time goes (imports and engine init), then exit",
+    )
+    parser.add_argument(
+        "--max-startup-seconds",
+        type=float,
+        default=None,
+        help="With --profile-startup, exit with an error if startup takes longer",
+    )
     return parser.parse_args()
 
 
+def import_times(lines: list[str]) -> tuple[float, dict[str, float]]:
+    """
+    Total import time and the time of each top-level package, from the
+    `-X importtime` lines of a process (the project's own modules are
+    counted per subpackage).
+    """
+    total = 0.0
+    packages: dict[str, float] = defaultdict(float)
+    for line in lines:
+        # "import time: <self us> | <cumulative us> | <indent><module>"
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header line
+        self_us, cumulative_us, module = fields
+        name = module.strip()
+        # Modules imported at the top level are indented by one space
+        if not module.startswith("  "):
+            total += int(cumulative_us) / 1e6
+        parts = name.split(".")
+        package = (
+            ".".join(parts[:3]) if parts[:2] == ["src", "open_llm_vtuber"] else parts[0]
+        )
+        packages[package] += int(self_us) / 1e6
+    return total, packages
+
+
+def profile_startup(verbose: bool, max_seconds: float | None) -> int:
+    """
+    Start the server with `--init-only` in a child process with import
+    timing enabled, and report import time per package and the engine init
+    time. Returns the exit code.
+    """
+    command = [sys.executable, "-X", "importtime", __file__, "--init-only"]
+    if verbose:
+        command.append("--verbose")
+    start = time.perf_counter()
+    child = subprocess.run(
+        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    total = time.perf_counter() - start
+
+    import_lines = []
+    for line in child.stderr.splitlines():
+        if line.startswith("import time:"):
+            import_lines.append(line)
+        else:
+            print(line, file=sys.stderr)
+    init = None
+    for line in child.stdout.splitlines():
+        if line.startswith("startup-profile: "):
+            init = json.loads(line[len("startup-profile: ") :])
+        else:
+            print(line)
+    if child.returncode != 0 or init is None:
+        print(f"Startup failed (exit code {child.returncode})", file=sys.stderr)
+        return 1
+
+    imports, packages = import_times(import_lines)
+    print("\nStartup profile")
+    print(f"  imports       {imports:6.2f} s")
+    for package, seconds in sorted(packages.items(), key=lambda item: -item[1])[:15]:
+        print(f"    {package:<36} {seconds:6.2f} s")
+    print(f"  config        {init['config']:6.2f} s")
+    print(f"  engine init   {init['engines']:6.2f} s (timeline above)")
+    print(f"  total         {total:6.2f} s (process start to engines ready)")
+    print("Import timing itself slows imports down; compare profiles with each other.")
+
+    if max_seconds is not None and total > max_seconds:
+        print(
+            f"Startup took {total:.2f} s, over the limit of {max_seconds:g} s",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
 @logger.catch
-def run(console_log_level: str):
+def run(console_log_level: str, init_only: bool = False):
     init_logger(console_log_level)
     logger.info(f"Open-LLM-VTuber, version v{get_version()}")
     # Sync user config with default config
@@ -64,11 +160,21 @@ def run(console_log_level: str):
     atexit.register(WebSocketServer.clean_cache)
 
     # Load configurations from yaml file
+    start = time.perf_counter()
     config: Config = validate_config(read_yaml("conf.yaml"))
     server_config = config.system_config
+    config_loaded = time.perf_counter()
 
     # Initialize and run the WebSocket server
     server = WebSocketServer(config=config)
+    if init_only:
+        # Read by --profile-startup
+        timings = {
+            "config": config_loaded - start,
+            "engines": time.perf_counter() - config_loaded,
+        }
+        print(f"startup-profile: {json.dumps(timings)}", flush=True)
+        return
     uvicorn.run(
         app=server.app,
         host=server_config.host,
@@ -88,4 +194,6 @@ if __name__ == "__main__":
         )
     if args.hf_mirror:
         os.environ["HF_ENDPOINT"] = "https://hf-mirror.com"
-    run(console_log_level=console_log_level)
+    if args.profile_startup:
+        sys.exit(profile_startup(args.verbose, args.max_startup_seconds))
+    run(console_log_level=console_log_level, init_only=args.init_only)
@@ -2,9 +2,7 @@ from typing import Type, Literal
 from loguru import logger
 
 from .agents.agent_interface import AgentInterface
-from .agents.basic_memory_agent import BasicMemoryAgent
 from .stateless_llm_factory import LLMFactory as StatelessLLMFactory
-from .agents.hume_ai import HumeAIAgent
 
 
 class AgentFactory:
@@ -32,6 +30,8 @@ class AgentFactory:
         logger.info(f"Initializing agent: {conversation_agent_choice}")
 
         if conversation_agent_choice == "basic_memory_agent":
+            from .agents.basic_memory_agent import BasicMemoryAgent
+
             # Get the LLM provider choice from agent settings
             basic_memory_settings: dict = agent_settings.get("basic_memory_agent", {})
             llm_provider: str = basic_memory_settings.get("llm_provider")
@@ -91,6 +91,8 @@ class AgentFactory:
             )
 
         elif conversation_agent_choice == "hume_ai_agent":
+            from .agents.hume_ai import HumeAIAgent
+
             settings = agent_settings.get("hume_ai_agent", {})
             return HumeAIAgent(
                 api_key=settings.get("api_key"),
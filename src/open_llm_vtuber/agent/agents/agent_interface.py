@@ -52,3 +52,16 @@ class AgentInterface(ABC):
             history_uid: str - History ID
         """
         pass
+
+    def fork(self) -> "AgentInterface":
+        """
+        Create an agent for a new session from this one.
+
+        The fork shares what is stateless (the LLM client, the Live2D model)
+        and has its own conversation state. Agents that keep no
+        per-session state may return themselves, which is the default.
+
+        Returns:
+            AgentInterface - The agent of the new session
+        """
+        return self
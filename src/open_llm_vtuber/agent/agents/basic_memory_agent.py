@@ -1,3 +1,4 @@
+import copy
 from typing import AsyncIterator, List, Dict, Any, Callable, Literal
 from loguru import logger
 
@@ -54,6 +55,10 @@ class BasicMemoryAgent(AgentInterface):
         """
         super().__init__()
         self._memory = []
+        # True while `_memory` is shared with forks of this agent; the list
+        # is copied before it is first modified. Messages in it are never
+        # modified in place, only replaced.
+        self._memory_shared = False
         self._live2d_model = live2d_model
         self._tts_preprocessor_config = tts_preprocessor_config
         self._faster_first_response = faster_first_response
@@ -65,6 +70,27 @@ class BasicMemoryAgent(AgentInterface):
         self.set_system(system)
         logger.info("BasicMemoryAgent initialized.")
 
+    def fork(self) -> "BasicMemoryAgent":
+        """
+        Create an agent for a new session that shares the LLM client and
+        starts from this agent's memory and system prompt. The memory is
+        copied on write, so a fork costs a few KB until its conversation
+        diverges.
+        """
+        forked = copy.copy(self)
+        self._memory_shared = forked._memory_shared = True
+        forked._interrupt_handled = False
+        # The chat pipeline is bound to the agent it was built for
+        forked._set_llm(self._llm)
+        return forked
+
+    def _writable_memory(self) -> List[Dict[str, Any]]:
+        """The memory, copied first if it is shared with a fork"""
+        if self._memory_shared:
+            self._memory = list(self._memory)
+            self._memory_shared = False
+        return self._memory
+
     def _set_llm(self, llm: StatelessLLMInterface):
         """
         Set the (stateless) LLM to be used for chat completion.
@@ -124,13 +150,14 @@ class BasicMemoryAgent(AgentInterface):
             if display_text.avatar:
                 message_data["avatar"] = display_text.avatar
 
-        self._memory.append(message_data)
+        self._writable_memory().append(message_data)
 
     def set_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
         """Load the memory from chat history"""
         messages = get_history(conf_uid, history_uid)
 
         self._memory = []
+        self._memory_shared = False
         self._memory.append(
             {
                 "role": "system",
@@ -158,17 +185,18 @@ class BasicMemoryAgent(AgentInterface):
 
         self._interrupt_handled = True
 
-        if self._memory and self._memory[-1]["role"] == "assistant":
-            self._memory[-1]["content"] = heard_response + "..."
+        memory = self._writable_memory()
+        if memory and memory[-1]["role"] == "assistant":
+            memory[-1] = {**memory[-1], "content": heard_response + "..."}
         else:
             if heard_response:
-                self._memory.append(
+                memory.append(
                     {
                         "role": "assistant",
                         "content": heard_response + "...",
                     }
                 )
-        self._memory.append(
+        memory.append(
             {
                 "role": "system" if self.interrupt_method == "system" else "user",
                 "content": "[Interrupted by user]",
@@ -307,6 +335,6 @@ class BasicMemoryAgent(AgentInterface):
             human_name=human_name, other_ais=other_ais
         )
 
-        self._memory.append({"role": "user", "content": group_context})
+        self._writable_memory().append({"role": "user", "content": group_context})
 
         logger.debug(f"Added group conversation context: '''{group_context}'''")
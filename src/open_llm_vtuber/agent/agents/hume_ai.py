@@ -53,6 +53,15 @@ class HumeAIAgent(AgentInterface):
         self.cache_dir = Path("./cache")
         self.cache_dir.mkdir(exist_ok=True)
 
+    def fork(self) -> "HumeAIAgent":
+        """Create an agent with the same settings and its own connection."""
+        return HumeAIAgent(
+            api_key=self.api_key,
+            host=self.host,
+            config_id=self.config_id,
+            idle_timeout=self.idle_timeout,
+        )
+
     async def connect(self, resume_chat_group_id: Optional[str] = None):
         """
         Establish WebSocket connection with optional chat group resumption
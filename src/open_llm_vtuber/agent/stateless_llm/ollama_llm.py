@@ -1,10 +1,14 @@
 import atexit
+import threading
 import requests
 from loguru import logger
 from .openai_compatible_llm import AsyncLLM
 
 
 class OllamaLLM(AsyncLLM):
+    # Seconds cleanup waits for a preload still in flight before unloading
+    PRELOAD_JOIN_TIMEOUT = 5.0
+
     def __init__(
         self,
         model: str,
@@ -27,19 +31,33 @@ class OllamaLLM(AsyncLLM):
             project_id=project_id,
             temperature=temperature,
         )
+        # Preload the model in the background; the server may take a while to
+        # load it and startup does not need to wait (a chat request sent
+        # before it finishes simply waits for the load on the Ollama side)
+        self._preload_thread = threading.Thread(
+            target=self._preload, daemon=True, name="ollama-preload"
+        )
+        self._preload_thread.start()
+        # If keep_alive is less than 0, register cleanup to unload the model
+        if unload_at_exit:
+            atexit.register(self.cleanup)
+
+    def _preload(self):
+        """Load the model into Ollama's memory"""
         try:
             # preload model
             logger.info("Preloading model for Ollama")
             # Send the POST request to preload model
             logger.debug(
                 requests.post(
-                    base_url.replace("/v1", "") + "/api/chat",
+                    self.base_url.replace("/v1", "") + "/api/chat",
                     json={
-                        "model": model,
-                        "keep_alive": keep_alive,
+                        "model": self.model,
+                        "keep_alive": self.keep_alive,
                     },
                 )
             )
+            logger.info(f"Ollama: Model {self.model} loaded")
         except requests.exceptions.ConnectionError as e:
             logger.error(f"Failed to preload model: {e}")
             logger.critical(
@@ -47,9 +65,6 @@ class OllamaLLM(AsyncLLM):
             )
         except Exception as e:
             logger.error(f"Failed to preload model: {e}")
-        # If keep_alive is less than 0, register cleanup to unload the model
-        if unload_at_exit:
-            atexit.register(self.cleanup)
 
     def __del__(self):
         """Destructor to unload the model"""
@@ -58,6 +73,14 @@ class OllamaLLM(AsyncLLM):
     def cleanup(self):
         """Clean up function to unload the model when exitting"""
         if not self.cleaned and self.unload_at_exit:
+            # An unload sent before the preload finishes would be undone by it
+            preload = getattr(self, "_preload_thread", None)
+            if preload is not None and preload is not threading.current_thread():
+                preload.join(self.PRELOAD_JOIN_TIMEOUT)
+                if preload.is_alive():
+                    logger.warning(
+                        f"Ollama: Still preloading {self.model}, unloading anyway"
+                    )
             logger.info(f"Ollama: Unloading model: {self.model}")
             # Unload the model
             # unloading is just the same as preload, but with keep alive set to 0
@@ -3,9 +3,6 @@ from typing import Type
 from loguru import logger
 
 from .stateless_llm.stateless_llm_interface import StatelessLLMInterface
-from .stateless_llm.openai_compatible_llm import AsyncLLM as OpenAICompatibleLLM
-from .stateless_llm.ollama_llm import OllamaLLM
-from .stateless_llm.claude_llm import AsyncLLM as ClaudeLLM
 
 
 class LLMFactory:
@@ -28,6 +25,11 @@ class LLMFactory:
             or llm_provider == "groq_llm"
             or llm_provider == "mistral_llm"
         ):
+            # Provider SDKs are slow to import; load only the configured one
+            from .stateless_llm.openai_compatible_llm import (
+                AsyncLLM as OpenAICompatibleLLM,
+            )
+
             return OpenAICompatibleLLM(
                 model=kwargs.get("model"),
                 base_url=kwargs.get("base_url"),
@@ -36,6 +38,8 @@ class LLMFactory:
                 project_id=kwargs.get("project_id"),
             )
         if llm_provider == "ollama_llm":
+            from .stateless_llm.ollama_llm import OllamaLLM
+
             return OllamaLLM(
                 model=kwargs.get("model"),
                 base_url=kwargs.get("base_url"),
@@ -54,6 +58,8 @@ class LLMFactory:
                 model_path=kwargs.get("model_path"),
             )
         elif llm_provider == "claude_llm":
+            from .stateless_llm.claude_llm import AsyncLLM as ClaudeLLM
+
             return ClaudeLLM(
                 system=kwargs.get("system_prompt"),
                 base_url=kwargs.get("base_url"),
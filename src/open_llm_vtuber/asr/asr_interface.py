@@ -1,6 +1,9 @@
 import abc
 import numpy as np
 import asyncio
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
 
 
 class ASRInterface(metaclass=abc.ABCMeta):
@@ -8,7 +11,9 @@ class ASRInterface(metaclass=abc.ABCMeta):
     NUM_CHANNELS = 1
     SAMPLE_WIDTH = 2
 
-    async def async_transcribe_np(self, audio: np.ndarray) -> str:
+    async def async_transcribe_np(
+        self, audio: np.ndarray, client_uid: Optional[str] = None
+    ) -> str:
         """Asynchronously transcribe speech audio in numpy array format.
 
         By default, this runs the synchronous transcribe_np in a coroutine.
@@ -16,6 +21,8 @@ class ASRInterface(metaclass=abc.ABCMeta):
 
         Args:
             audio: The numpy array of the audio data to transcribe.
+            client_uid: The client the audio comes from, used by engines that
+                schedule requests per client (see ASRWorkerPool).
 
         Returns:
             str: The transcription result.
@@ -33,6 +40,20 @@ class ASRInterface(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    # Whether transcribe_batch_np is faster than transcribing one by one
+    supports_batching = False
+
+    def transcribe_batch_np(self, audios: list[np.ndarray]) -> list[str]:
+        """Transcribe several utterances and return their transcriptions in order.
+
+        By default, this transcribes the utterances one after another. Engines
+        with a batched inference path override it and set `supports_batching`.
+
+        Args:
+            audios: The numpy arrays of the utterances to transcribe.
+        """
+        return [self.transcribe_np(audio) for audio in audios]
+
     def nparray_to_audio_file(
         self, audio: np.ndarray, sample_rate: int, file_path: str
     ) -> None:
@@ -55,3 +76,65 @@ class ASRInterface(metaclass=abc.ABCMeta):
             wf.setsampwidth(2)
             wf.setframerate(sample_rate)
             wf.writeframes(audio_integer.tobytes())
+
+
+class ASRStream(metaclass=abc.ABCMeta):
+    """Incremental recognition of a single utterance.
+
+    Created by `StreamingASRInterface.create_stream`. Audio is fed while the
+    user is still speaking; the partial transcript is available after every
+    chunk and the final one when the utterance ends.
+    """
+
+    @abc.abstractmethod
+    def accept_waveform(self, audio: np.ndarray) -> str:
+        """Feed the next chunk of the utterance and decode what is ready.
+
+        Args:
+            audio: float32 samples at the engine's SAMPLE_RATE.
+
+        Returns:
+            str: The partial transcription of the utterance so far.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def finish(self) -> str:
+        """Mark the end of the utterance and decode the remaining audio.
+
+        Returns:
+            str: The final transcription of the utterance.
+        """
+        raise NotImplementedError
+
+
+class StreamingASRInterface(ASRInterface):
+    """ASR engine that can also transcribe an utterance while it is spoken.
+
+    Engines implementing this interface still provide `transcribe_np` for
+    finished utterances. Whether streaming is actually available can depend on
+    the engine's configuration, see `supports_streaming`.
+    """
+
+    @property
+    def supports_streaming(self) -> bool:
+        """Whether `create_stream` can be used with the current configuration."""
+        return True
+
+    @abc.abstractmethod
+    def create_stream(self) -> ASRStream:
+        """Start the incremental recognition of a new utterance."""
+        raise NotImplementedError
+
+    async def run_stream(self, stream: ASRStream, func: Callable[..., T], *args) -> T:
+        """Run a blocking call on a stream of this engine.
+
+        By default, this runs `func(*args)` in a worker thread. Engines that
+        schedule their own threads (see ASRWorkerPool) override it.
+
+        Args:
+            stream: The stream the call decodes, from `create_stream`.
+            func: The call, e.g. `stream.accept_waveform`.
+            *args: Arguments of `func`.
+        """
+        return await asyncio.to_thread(func, *args)
@@ -0,0 +1,304 @@
+import asyncio
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional, TypeVar
+
+import numpy as np
+from loguru import logger
+
+from .asr_interface import ASRInterface, ASRStream, StreamingASRInterface
+
+T = TypeVar("T")
+
+
+@dataclass
+class _ASRJob:
+    """An utterance waiting to be transcribed"""
+
+    client_uid: str
+    audio: np.ndarray
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class ASRWorkerPool(StreamingASRInterface):
+    """
+    Runs an ASR engine on a dedicated, bounded set of worker threads.
+
+    Transcription requests are queued per client and served round-robin
+    across clients (FIFO within a client), so one client finishing several
+    utterances in a row cannot starve the others. At most `concurrency`
+    utterances are transcribed at the same time, on threads that are not
+    shared with TTS or anything else using the default executor.
+
+    Worker `i` always uses model replica `i % replicas`, and each replica's
+    workers run on that replica's own threads. Engines that are not
+    thread-safe (e.g. faster-whisper, sherpa-onnx) should use as many
+    replicas as workers; engines backed by a remote API can share one.
+
+    Streams (`create_stream`) are spread over the replicas round-robin, and
+    their decoding (`run_stream`) runs on the threads of the replica that
+    created them, so it is bounded and isolated the same way.
+
+    For engines with a batched inference path (`supports_batching`), a worker
+    that picks up an utterance waits up to `batch_window_ms` for more to
+    arrive and transcribes up to `max_batch_size` of them in one call, which
+    raises throughput when many clients finish speaking at about the same
+    time. A window of 0 disables the wait but still batches whatever is
+    already queued.
+    """
+
+    def __init__(
+        self,
+        engine: ASRInterface,
+        create_replica: Optional[Callable[[], ASRInterface]] = None,
+        concurrency: int = 1,
+        replicas: int = 1,
+        batch_window_ms: float = 0.0,
+        max_batch_size: int = 1,
+    ):
+        """
+        Args:
+            engine: The (first) engine instance.
+            create_replica: Creates another engine instance. Required when
+                `replicas` is greater than 1.
+            concurrency: Maximum number of utterances transcribed at once.
+            replicas: Number of engine instances to spread the workers over.
+            batch_window_ms: How long a worker waits for more utterances to
+                batch with the first one.
+            max_batch_size: Maximum number of utterances per batch. Only used
+                for engines that support batching.
+        """
+        self.concurrency = max(1, concurrency)
+        replicas = max(1, min(replicas, self.concurrency))
+        if replicas > 1 and create_replica is None:
+            raise ValueError("create_replica is required for more than one replica")
+
+        self.engines: list[ASRInterface] = [engine]
+        for _ in range(replicas - 1):
+            self.engines.append(create_replica())
+        self.engine = engine
+        self.SAMPLE_RATE = engine.SAMPLE_RATE
+        self.batch_window = max(0.0, batch_window_ms) / 1000
+        self.max_batch_size = max(1, max_batch_size) if engine.supports_batching else 1
+
+        self._executors = [
+            ThreadPoolExecutor(
+                max_workers=len(range(i, self.concurrency, len(self.engines))),
+                thread_name_prefix=f"asr-worker-{i}",
+            )
+            for i in range(len(self.engines))
+        ]
+        # stream -> index of the replica that created it
+        self._stream_replicas: weakref.WeakKeyDictionary[ASRStream, int] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._next_stream_replica = 0
+        # client_uid -> queued jobs, in arrival order. Clients are moved to
+        # the back after each dequeue (round-robin).
+        self._queues: dict[str, deque[_ASRJob]] = {}
+        self._pending = 0
+        self._wakeup: Optional[asyncio.Condition] = None
+        self._workers: list[asyncio.Task] = []
+
+        self.active = 0
+        self.started = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.batches = 0
+        logger.info(
+            f"ASR worker pool: {self.concurrency} worker(s), "
+            f"{len(self.engines)} model replica(s) of {type(engine).__name__}"
+            + (
+                f", batches of up to {self.max_batch_size} within "
+                f"{self.batch_window * 1000:.0f} ms"
+                if self.max_batch_size > 1
+                else ""
+            )
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of utterances waiting for a worker"""
+        return self._pending
+
+    def stats(self) -> dict:
+        """Queue depth, active transcriptions and wait-time metrics"""
+        return {
+            "queue_depth": self._pending,
+            "active": self.active,
+            "completed": self.completed,
+            "avg_batch_size": self.started / self.batches if self.batches else 0.0,
+            "avg_wait_ms": (
+                self.total_wait / self.started * 1000 if self.started else 0.0
+            ),
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+    def transcribe_np(self, audio: np.ndarray) -> str:
+        return self.engine.transcribe_np(audio)
+
+    async def async_transcribe_np(
+        self, audio: np.ndarray, client_uid: Optional[str] = None
+    ) -> str:
+        if audio.dtype != np.float32:
+            audio = audio.astype(np.float32)
+
+        self._ensure_workers()
+        job = _ASRJob(
+            client_uid=client_uid or "",
+            audio=audio,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        async with self._wakeup:
+            self._queues.setdefault(job.client_uid, deque()).append(job)
+            self._pending += 1
+            self._wakeup.notify()
+        if self._pending > self.concurrency:
+            logger.debug(f"ASR queue depth: {self._pending}")
+        return await job.future
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if not self._workers or self._workers[0].get_loop() is not loop:
+            self._wakeup = asyncio.Condition()
+            self._workers = [self._start_worker(i) for i in range(self.concurrency)]
+            return
+        # Replace workers that died so the pool doesn't silently shrink
+        for i, worker in enumerate(self._workers):
+            if not worker.done():
+                continue
+            if worker.cancelled():
+                logger.warning(f"ASR worker {i} was cancelled, restarting it")
+            elif worker.exception() is not None:
+                logger.opt(exception=worker.exception()).error(
+                    f"ASR worker {i} failed, restarting it"
+                )
+            else:
+                logger.warning(f"ASR worker {i} exited, restarting it")
+            self._workers[i] = self._start_worker(i)
+
+    def _start_worker(self, i: int) -> asyncio.Task:
+        return asyncio.create_task(self._worker(i % len(self.engines)))
+
+    def _next_job(self) -> Optional[_ASRJob]:
+        for client_uid in list(self._queues):
+            queue = self._queues.pop(client_uid)
+            job = queue.popleft()
+            if queue:
+                self._queues[client_uid] = queue
+            self._pending -= 1
+            if not job.future.done():
+                return job
+        return None
+
+    async def _next_batch(self) -> list[_ASRJob]:
+        """Wait for a job, then collect more within the batch window."""
+        async with self._wakeup:
+            while (job := self._next_job()) is None:
+                await self._wakeup.wait()
+            batch = [job]
+            if self.max_batch_size == 1:
+                return batch
+
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                if (job := self._next_job()) is not None:
+                    batch.append(job)
+                    continue
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            return batch
+
+    async def _worker(self, replica: int) -> None:
+        loop = asyncio.get_running_loop()
+        engine = self.engines[replica]
+        executor = self._executors[replica]
+        # Engines with their own async implementation don't need a thread
+        native_async = (
+            type(engine).async_transcribe_np is not ASRInterface.async_transcribe_np
+        )
+        while True:
+            batch = await self._next_batch()
+
+            now = time.perf_counter()
+            waits = [now - job.enqueued_at for job in batch]
+            self.started += len(batch)
+            self.batches += 1
+            self.total_wait += sum(waits)
+            self.max_wait = max(self.max_wait, *waits)
+            self.active += len(batch)
+            try:
+                if len(batch) > 1:
+                    texts = await loop.run_in_executor(
+                        executor,
+                        engine.transcribe_batch_np,
+                        [job.audio for job in batch],
+                    )
+                elif native_async:
+                    texts = [await engine.async_transcribe_np(batch[0].audio)]
+                else:
+                    texts = [
+                        await loop.run_in_executor(
+                            executor, engine.transcribe_np, batch[0].audio
+                        )
+                    ]
+                for job, text in zip(batch, texts):
+                    if not job.future.done():
+                        job.future.set_result(text)
+            except Exception as e:
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+            finally:
+                self.active -= len(batch)
+                self.completed += len(batch)
+            logger.debug(
+                f"ASR of {len(batch)} utterance(s) from "
+                f"{', '.join(job.client_uid or 'unknown client' for job in batch)}: "
+                f"waited up to {max(waits) * 1000:.0f} ms, took "
+                f"{(time.perf_counter() - now) * 1000:.0f} ms"
+            )
+
+    @property
+    def supports_streaming(self) -> bool:
+        return (
+            isinstance(self.engine, StreamingASRInterface)
+            and self.engine.supports_streaming
+        )
+
+    def create_stream(self) -> ASRStream:
+        replica = self._next_stream_replica
+        self._next_stream_replica = (replica + 1) % len(self.engines)
+        stream = self.engines[replica].create_stream()
+        self._stream_replicas[stream] = replica
+        return stream
+
+    async def run_stream(self, stream: ASRStream, func: Callable[..., T], *args) -> T:
+        replica = self._stream_replicas.get(stream, 0)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executors[replica], func, *args
+        )
+
+    def close(self) -> None:
+        """Stop the workers and their threads."""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        for queue in self._queues.values():
+            for job in queue:
+                if not job.future.done():
+                    job.future.cancel()
+        self._queues.clear()
+        self._pending = 0
+        for executor in self._executors:
+            executor.shutdown(wait=False)
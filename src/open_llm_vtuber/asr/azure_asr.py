@@ -1,5 +1,5 @@
 import os
-from typing import Callable
+from typing import Callable, Optional
 import numpy as np
 from loguru import logger
 import azure.cognitiveservices.speech as speechsdk
@@ -64,7 +64,9 @@ class VoiceRecognition(ASRInterface):
             logger.warning(f"Failed to create speech recognizer: {e}")
             raise
 
-    async def async_transcribe_np(self, audio: np.ndarray) -> str:
+    async def async_transcribe_np(
+        self, audio: np.ndarray, client_uid: Optional[str] = None
+    ) -> str:
         """
         Asynchronously transcribe audio data using Azure Speech Services with auto language detection.
 
@@ -1,12 +1,21 @@
 import numpy as np
 from faster_whisper import WhisperModel
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from faster_whisper.transcribe import get_suppressed_tokens
 from .asr_interface import ASRInterface
 
 
 class VoiceRecognition(ASRInterface):
     BEAM_SEARCH = True
+    # Segments decoded as "no speech" with a low log-probability are dropped,
+    # like faster-whisper's own transcribe() does.
+    NO_SPEECH_THRESHOLD = 0.6
+    LOG_PROB_THRESHOLD = -1.0
     # SAMPLE_RATE # Defined in asr_interface.py
 
+    supports_batching = True
+
     def __init__(
         self,
         model_path: str = "distil-medium.en",
@@ -38,3 +47,79 @@ class VoiceRecognition(ASRInterface):
             return ""
         else:
             return "".join(text)
+
+    def transcribe_batch_np(self, audios: list[np.ndarray]) -> list[str]:
+        """Transcribe several utterances with one batched encoder/decoder run.
+
+        Every utterance is padded to Whisper's 30 second window, so a batch
+        costs about as much encoder time per item as a single utterance but
+        shares one pass over the model weights. Utterances longer than the
+        window go through `transcribe_np` on their own.
+        """
+        max_samples = self.model.feature_extractor.n_samples
+        results: list[str] = [""] * len(audios)
+        batch = []
+        for i, audio in enumerate(audios):
+            if len(audio) > max_samples:
+                results[i] = self.transcribe_np(audio)
+            else:
+                batch.append(i)
+
+        if len(batch) == 1:
+            results[batch[0]] = self.transcribe_np(audios[batch[0]])
+        elif batch:
+            texts = self._decode_batch([audios[i] for i in batch])
+            for i, text in zip(batch, texts):
+                results[i] = text
+        return results
+
+    def _decode_batch(self, audios: list[np.ndarray]) -> list[str]:
+        model = self.model
+        features = np.stack(
+            [
+                pad_or_trim(model.feature_extractor(audio.astype(np.float32))[..., :-1])
+                for audio in audios
+            ]
+        )
+        encoder_output = model.encode(features)
+
+        multilingual = model.model.is_multilingual
+        tokenizer = Tokenizer(
+            model.hf_tokenizer,
+            multilingual,
+            task="transcribe",
+            language=(self.LANG or "en") if multilingual else None,
+        )
+        prompt = model.get_prompt(tokenizer, [], without_timestamps=True)
+        prompts = [list(prompt) for _ in audios]
+        if multilingual and not self.LANG:
+            # Auto-detect the language of each utterance
+            language_index = prompt.index(tokenizer.language)
+            for i, languages in enumerate(model.model.detect_language(encoder_output)):
+                prompts[i][language_index] = tokenizer.tokenizer.token_to_id(
+                    languages[0][0]
+                )
+
+        generated = model.model.generate(
+            encoder_output,
+            prompts,
+            beam_size=5 if self.BEAM_SEARCH else 1,
+            max_length=model.max_length,
+            suppress_blank=True,
+            suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+            return_scores=True,
+            return_no_speech_prob=True,
+        )
+
+        texts = []
+        for result in generated:
+            tokens = result.sequences_ids[0]
+            avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+            if (
+                result.no_speech_prob > self.NO_SPEECH_THRESHOLD
+                and avg_logprob < self.LOG_PROB_THRESHOLD
+            ):
+                texts.append("")
+            else:
+                texts.append(tokenizer.decode([t for t in tokens if t < tokenizer.eot]))
+        return texts
@@ -2,12 +2,41 @@ import os
 import numpy as np
 import sherpa_onnx
 from loguru import logger
-from .asr_interface import ASRInterface
+from .asr_interface import ASRStream, StreamingASRInterface
 from .utils import download_and_extract, check_and_extract_local_file
 import onnxruntime
 
 
-class VoiceRecognition(ASRInterface):
+# Models that sherpa-onnx can run as online (streaming) recognizers
+STREAMING_MODEL_TYPES = ("transducer", "paraformer")
+
+
+class OnlineStream(ASRStream):
+    """One utterance decoded incrementally by a sherpa-onnx online recognizer"""
+
+    def __init__(self, recognizer: "sherpa_onnx.OnlineRecognizer", sample_rate: int):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.stream = recognizer.create_stream()
+
+    def _decode(self) -> str:
+        while self.recognizer.is_ready(self.stream):
+            self.recognizer.decode_stream(self.stream)
+        return self.recognizer.get_result(self.stream)
+
+    def accept_waveform(self, audio: np.ndarray) -> str:
+        self.stream.accept_waveform(self.sample_rate, audio)
+        return self._decode()
+
+    def finish(self) -> str:
+        # Trailing silence lets the model emit the last tokens
+        tail_paddings = np.zeros(int(0.66 * self.sample_rate), dtype=np.float32)
+        self.stream.accept_waveform(self.sample_rate, tail_paddings)
+        self.stream.input_finished()
+        return self._decode()
+
+
+class VoiceRecognition(StreamingASRInterface):
     def __init__(
         self,
         model_type: str = "paraformer",  # or "transducer", "nemo_ctc", "wenet_ctc", "whisper", "tdnn_ctc", "sense_voice"
@@ -37,6 +66,7 @@ class VoiceRecognition(ASRInterface):
         feature_dim: int = 80,  # Feature dimension
         use_itn: bool = True,  # Use ITN for SenseVoice models
         provider: str = "cpu",  # Provider for inference (cpu or cuda)
+        streaming: bool = False,  # Use an online recognizer (transducer or paraformer encoder/decoder)
     ) -> None:
         self.model_type = model_type
         self.encoder = encoder
@@ -64,6 +94,13 @@ class VoiceRecognition(ASRInterface):
         self.SAMPLE_RATE = sample_rate
         self.feature_dim = feature_dim
         self.use_itn = use_itn
+        self.streaming = streaming
+        if self.streaming and self.model_type not in STREAMING_MODEL_TYPES:
+            logger.warning(
+                f"Sherpa-Onnx-ASR: {self.model_type} models cannot stream. "
+                "Falling back to offline recognition."
+            )
+            self.streaming = False
 
         # we need to find a way to get cuda version of sherpa-onnx before we can
         # use the gpu provider.
@@ -80,7 +117,51 @@ class VoiceRecognition(ASRInterface):
                 self.provider = "cpu"
         logger.info(f"Sherpa-Onnx-ASR: Using {self.provider} for inference")
 
-        self.recognizer = self._create_recognizer()
+        if self.streaming:
+            self.recognizer = self._create_online_recognizer()
+        else:
+            self.recognizer = self._create_recognizer()
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.streaming
+
+    def _create_online_recognizer(self):
+        if self.model_type == "transducer":
+            return sherpa_onnx.OnlineRecognizer.from_transducer(
+                encoder=self.encoder,
+                decoder=self.decoder,
+                joiner=self.joiner,
+                tokens=self.tokens,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                hotwords_file=self.hotwords_file,
+                hotwords_score=self.hotwords_score,
+                modeling_unit=self.modeling_unit,
+                bpe_vocab=self.bpe_vocab,
+                blank_penalty=self.blank_penalty,
+                debug=self.debug,
+                provider=self.provider,
+            )
+        # Streaming paraformer models come as a separate encoder and decoder
+        return sherpa_onnx.OnlineRecognizer.from_paraformer(
+            encoder=self.encoder,
+            decoder=self.decoder,
+            tokens=self.tokens,
+            num_threads=self.num_threads,
+            sample_rate=self.SAMPLE_RATE,
+            feature_dim=self.feature_dim,
+            decoding_method=self.decoding_method,
+            debug=self.debug,
+            provider=self.provider,
+        )
+
+    def create_stream(self) -> OnlineStream:
+        if not self.streaming:
+            raise RuntimeError("Sherpa-Onnx-ASR is not configured for streaming")
+        return OnlineStream(self.recognizer, self.SAMPLE_RATE)
 
     def _create_recognizer(self):
         if self.model_type == "transducer":
@@ -199,6 +280,11 @@ class VoiceRecognition(ASRInterface):
         return recognizer
 
     def transcribe_np(self, audio: np.ndarray) -> str:
+        if self.streaming:
+            stream = self.create_stream()
+            stream.accept_waveform(audio)
+            return stream.finish()
+
         stream = self.recognizer.create_stream()
         stream.accept_waveform(self.SAMPLE_RATE, audio)
         self.recognizer.decode_streams([stream])
@@ -7,7 +7,7 @@ and utility functions for loading/saving configurations.
 
 # Import main configuration classes
 from .main import Config
-from .system import SystemConfig
+from .system import SystemConfig, AudioCodecConfig, EngineRegistryConfig
 from .character import CharacterConfig
 from .stateless_llm import (
     OpenAICompatibleConfig,
@@ -23,6 +23,7 @@ from .asr import (
     FunASRConfig,
     SherpaOnnxASRConfig,
     GroqWhisperASRConfig,
+    ASRWorkerPoolConfig,
 )
 from .tts import (
     TTSConfig,
@@ -37,6 +38,9 @@ from .tts import (
     FishAPITTSConfig,
     SherpaOnnxTTSConfig,
     AllTalkTTSConfig,
+    TTSCacheConfig,
+    TTSSchedulerConfig,
+    TTSHTTPConfig,
 )
 from .vad import (
     VADConfig,
@@ -69,6 +73,8 @@ __all__ = [
     # Main configuration classes
     "Config",
     "SystemConfig",
+    "AudioCodecConfig",
+    "EngineRegistryConfig",
     "CharacterConfig",
     # LLM related classes
     "OpenAICompatibleConfig",
@@ -92,6 +98,7 @@ __all__ = [
     "FunASRConfig",
     "SherpaOnnxASRConfig",
     "GroqWhisperASRConfig",
+    "ASRWorkerPoolConfig",
     # TTS related classes
     "TTSConfig",
     "AzureTTSConfig",
@@ -105,6 +112,9 @@ __all__ = [
     "FishAPITTSConfig",
     "SherpaOnnxTTSConfig",
     "AllTalkTTSConfig",
+    "TTSCacheConfig",
+    "TTSSchedulerConfig",
+    "TTSHTTPConfig",
     # VAD related classes
     "VADConfig",
     "SileroVADConfig",
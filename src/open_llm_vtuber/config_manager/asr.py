@@ -190,6 +190,7 @@ class SherpaOnnxASRConfig(I18nMixin):
     num_threads: int = Field(4, alias="num_threads")
     use_itn: bool = Field(True, alias="use_itn")
     provider: Literal["cpu", "cuda"] = Field("cpu", alias="provider")
+    streaming: bool = Field(False, alias="streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "model_type": Description(
@@ -231,13 +232,26 @@ class SherpaOnnxASRConfig(I18nMixin):
             en="Provider for inference (cpu or cuda) (cuda option needs additional settings. Please check our docs)",
             zh="推理平台（cpu 或 cuda）(cuda 需要额外配置，请参考文档)",
         ),
+        "streaming": Description(
+            en="Transcribe while the user is speaking with a streaming (online) model. Only for transducer and paraformer models; streaming paraformer uses encoder and decoder",
+            zh="使用流式（在线）模型在用户说话时进行识别。仅支持 transducer 和 paraformer 模型；流式 paraformer 使用 encoder 和 decoder",
+        ),
     }
 
     @model_validator(mode="after")
     def check_model_paths(cls, values: "SherpaOnnxASRConfig", info: ValidationInfo):
         model_type = values.model_type
 
-        if model_type == "transducer":
+        if values.streaming and model_type == "paraformer":
+            if not all([values.encoder, values.decoder, values.tokens]):
+                raise ValueError(
+                    "encoder, decoder, and tokens must be provided for streaming paraformer models"
+                )
+        elif values.streaming and model_type != "transducer":
+            raise ValueError(
+                "streaming is only supported for transducer and paraformer models"
+            )
+        elif model_type == "transducer":
             if not all([values.encoder, values.decoder, values.joiner, values.tokens]):
                 raise ValueError(
                     "encoder, decoder, joiner, and tokens must be provided for transducer model type"
@@ -276,6 +290,34 @@ class SherpaOnnxASRConfig(I18nMixin):
         return values
 
 
+class ASRWorkerPoolConfig(I18nMixin):
+    """Configuration for the ASR worker pool."""
+
+    concurrency: int = Field(1, alias="concurrency")
+    replicas: int = Field(1, alias="replicas")
+    batch_window_ms: float = Field(0.0, alias="batch_window_ms")
+    max_batch_size: int = Field(1, alias="max_batch_size")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "concurrency": Description(
+            en="Maximum number of utterances transcribed at the same time",
+            zh="同时进行识别的最大语音段数",
+        ),
+        "replicas": Description(
+            en="Number of ASR model instances loaded. Use one per concurrent transcription for local models that are not thread-safe (faster_whisper, sherpa_onnx_asr)",
+            zh="加载的 ASR 模型实例数。对于非线程安全的本地模型（faster_whisper、sherpa_onnx_asr），每个并发识别使用一个实例",
+        ),
+        "batch_window_ms": Description(
+            en="How long (in milliseconds) a worker waits for more utterances to transcribe in the same batch",
+            zh="工作线程等待更多语音段以合并为同一批识别的时间（毫秒）",
+        ),
+        "max_batch_size": Description(
+            en="Maximum number of utterances transcribed in one batch. Only engines with batched inference (faster_whisper) use batches",
+            zh="单批识别的最大语音段数。仅支持批量推理的引擎（faster_whisper）会使用",
+        ),
+    }
+
+
 class ASRConfig(I18nMixin):
     """Configuration for Automatic Speech Recognition."""
 
@@ -299,6 +341,8 @@ class ASRConfig(I18nMixin):
     sherpa_onnx_asr: Optional[SherpaOnnxASRConfig] = Field(
         None, alias="sherpa_onnx_asr"
     )
+    worker_pool: Optional[ASRWorkerPoolConfig] = Field(None, alias="worker_pool")
+    speculative: bool = Field(False, alias="speculative")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "asr_model": Description(
@@ -319,6 +363,14 @@ class ASRConfig(I18nMixin):
         "sherpa_onnx_asr": Description(
             en="Configuration for Sherpa Onnx ASR", zh="Sherpa Onnx ASR 配置"
         ),
+        "worker_pool": Description(
+            en="Dedicated ASR worker threads shared fairly by all clients",
+            zh="所有客户端公平共享的专用 ASR 工作线程",
+        ),
+        "speculative": Description(
+            en="Start transcribing when the user pauses (server-side VAD), before the pause is long enough to end the utterance. The result is discarded if the user keeps speaking",
+            zh="在用户停顿时（服务端 VAD）即开始识别，而不必等停顿长到足以结束语音段。如果用户继续说话，则丢弃识别结果",
+        ),
     }
 
     @model_validator(mode="after")
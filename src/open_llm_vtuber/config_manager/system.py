@@ -1,9 +1,52 @@
 # config_manager/system.py
 from pydantic import Field, model_validator
-from typing import Dict, ClassVar
+from typing import Dict, ClassVar, List, Literal, Optional
 from .i18n import I18nMixin, Description
 
 
+class AudioCodecConfig(I18nMixin):
+    """Configuration for the compression of outbound speech."""
+
+    codec: Literal["wav", "opus", "mp3"] = Field("wav", alias="codec")
+    bitrate_kbps: int = Field(32, alias="bitrate_kbps")
+    min_bitrate_kbps: int = Field(12, alias="min_bitrate_kbps")
+    max_bitrate_kbps: int = Field(128, alias="max_bitrate_kbps")
+    workers: int = Field(2, alias="workers")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "codec": Description(
+            en="Codec of the speech sent to clients that can play it (wav = uncompressed)",
+            zh="发送给支持该编码的客户端的语音编码（wav 为不压缩）",
+        ),
+        "bitrate_kbps": Description(
+            en="Default bitrate in kbps, used unless the client asks for another one",
+            zh="默认码率（kbps），客户端未指定时使用",
+        ),
+        "min_bitrate_kbps": Description(
+            en="Lowest bitrate a client may ask for", zh="客户端可请求的最低码率"
+        ),
+        "max_bitrate_kbps": Description(
+            en="Highest bitrate a client may ask for", zh="客户端可请求的最高码率"
+        ),
+        "workers": Description(
+            en="Number of threads encoding audio", zh="用于音频编码的线程数"
+        ),
+    }
+
+
+class EngineRegistryConfig(I18nMixin):
+    """Configuration for the engines shared between sessions."""
+
+    memory_budget_mb: float = Field(4096, alias="memory_budget_mb")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "memory_budget_mb": Description(
+            en="ASR/TTS/VAD engines no session uses are unloaded (least recently used first) while loaded engines use more memory than this (0 = unload as soon as unused)",
+            zh="当已加载引擎占用的内存超过此值时，卸载没有会话使用的 ASR/TTS/VAD 引擎（最久未使用的优先；0 = 不再使用时立即卸载）",
+        ),
+    }
+
+
 class SystemConfig(I18nMixin):
     """System configuration settings."""
 
@@ -12,6 +55,11 @@ class SystemConfig(I18nMixin):
     port: int = Field(..., alias="port")
     config_alts_dir: str = Field(..., alias="config_alts_dir")
     tool_prompts: Dict[str, str] = Field(..., alias="tool_prompts")
+    audio_codec: Optional[AudioCodecConfig] = Field(None, alias="audio_codec")
+    engine_registry: Optional[EngineRegistryConfig] = Field(
+        None, alias="engine_registry"
+    )
+    warm_configs: Optional[List[str]] = Field(None, alias="warm_configs")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_version": Description(en="Configuration version", zh="配置文件版本"),
@@ -24,6 +72,18 @@ class SystemConfig(I18nMixin):
             en="Tool prompts to be inserted into persona prompt",
             zh="要插入到角色提示词中的工具提示词",
         ),
+        "audio_codec": Description(
+            en="Compression of the speech sent to clients",
+            zh="发送给客户端的语音的压缩设置",
+        ),
+        "engine_registry": Description(
+            en="Sharing of loaded ASR/TTS/VAD engines between sessions",
+            zh="会话之间共享已加载的 ASR/TTS/VAD 引擎的设置",
+        ),
+        "warm_configs": Description(
+            en="Character configs (file names in config_alts_dir) whose engines are preloaded in the background, so switching to them is instant",
+            zh="在后台预加载其引擎的角色配置（config_alts_dir 中的文件名），切换到这些角色时无需等待",
+        ),
     }
 
     @model_validator(mode="after")
@@ -44,12 +44,17 @@ class EdgeTTSConfig(I18nMixin):
     """Configuration for Edge TTS."""
 
     voice: str = Field(..., alias="voice")
+    streaming: bool = Field(True, alias="streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "voice": Description(
             en="Voice name to use for Edge TTS (use 'edge-tts --list-voices' to list available voices)",
             zh="Edge TTS 使用的语音名称（使用 'edge-tts --list-voices' 列出可用语音）",
         ),
+        "streaming": Description(
+            en="Send audio to the frontend in chunks while the sentence is still being synthesized (requires ffmpeg)",
+            zh="在句子合成过程中将音频分块发送给前端（需要 ffmpeg）",
+        ),
     }
 
 
@@ -155,6 +160,7 @@ class XTTSConfig(I18nMixin):
     api_url: str = Field(..., alias="api_url")
     speaker_wav: str = Field(..., alias="speaker_wav")
     language: str = Field(..., alias="language")
+    streaming: bool = Field(False, alias="streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "api_url": Description(
@@ -166,6 +172,10 @@ class XTTSConfig(I18nMixin):
         "language": Description(
             en="Language code (e.g., en, zh)", zh="语言代码（如 en、zh）"
         ),
+        "streaming": Description(
+            en="Send audio to the frontend in chunks while the sentence is still being synthesized (uses /tts_stream, requires the server's streaming mode)",
+            zh="在句子合成过程中将音频分块发送给前端（使用 /tts_stream，需要服务端开启 streaming mode）",
+        ),
     }
 
 
@@ -208,6 +218,7 @@ class FishAPITTSConfig(I18nMixin):
     reference_id: str = Field(..., alias="reference_id")
     latency: Literal["normal", "balanced"] = Field(..., alias="latency")
     base_url: str = Field(..., alias="base_url")
+    streaming: bool = Field(False, alias="streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "api_key": Description(
@@ -223,6 +234,10 @@ class FishAPITTSConfig(I18nMixin):
         "base_url": Description(
             en="Base URL for Fish TTS API", zh="Fish TTS API 的基础 URL"
         ),
+        "streaming": Description(
+            en="Send audio to the frontend in chunks while the sentence is still being synthesized",
+            zh="在句子合成过程中将音频分块发送给前端",
+        ),
     }
 
 
@@ -311,6 +326,7 @@ class AllTalkTTSConfig(I18nMixin):
     rvc_model: str = Field("Disabled", alias="rvc_model")
     rvc_pitch: int = Field(0, alias="rvc_pitch")
     output_format: str = Field("wav", alias="output_format")
+    streaming: bool = Field(False, alias="streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "api_url": Description(
@@ -334,6 +350,92 @@ class AllTalkTTSConfig(I18nMixin):
         "output_format": Description(
             en="Output audio format (wav, mp3, etc.)", zh="输出音频格式（wav、mp3 等）"
         ),
+        "streaming": Description(
+            en="Send audio to the frontend in chunks while the sentence is still being synthesized (uses /api/tts-generate-streaming, without RVC)",
+            zh="在句子合成过程中将音频分块发送给前端（使用 /api/tts-generate-streaming，不支持 RVC）",
+        ),
+    }
+
+
+class TTSCacheConfig(I18nMixin):
+    """Configuration for the TTS result cache."""
+
+    enabled: bool = Field(False, alias="enabled")
+    memory_max_mb: float = Field(32, alias="memory_max_mb")
+    disk_max_mb: float = Field(256, alias="disk_max_mb")
+    cache_dir: str = Field("tts_cache", alias="cache_dir")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "enabled": Description(
+            en="Reuse synthesized audio for text that was spoken before with the same voice",
+            zh="对使用相同声音朗读过的文本复用已合成的音频",
+        ),
+        "memory_max_mb": Description(
+            en="Size of the in-memory cache in MB (0 to disable)",
+            zh="内存缓存大小（MB，0 为禁用）",
+        ),
+        "disk_max_mb": Description(
+            en="Size of the on-disk cache in MB (0 to disable)",
+            zh="磁盘缓存大小（MB，0 为禁用）",
+        ),
+        "cache_dir": Description(
+            en="Directory of the on-disk cache, with a subdirectory per engine configuration (not inside cache/, which is cleared on shutdown)",
+            zh="磁盘缓存目录，每种引擎配置使用一个子目录（不要放在关闭时会被清空的 cache/ 中）",
+        ),
+    }
+
+
+class TTSSchedulerConfig(I18nMixin):
+    """Configuration for scheduling sentence synthesis on the TTS engine."""
+
+    max_concurrency: int = Field(2, alias="max_concurrency")
+    max_pending_sentences: int = Field(8, alias="max_pending_sentences")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "max_concurrency": Description(
+            en="Maximum number of sentences synthesized at the same time, across all conversations",
+            zh="所有对话中同时合成的最大句子数",
+        ),
+        "max_pending_sentences": Description(
+            en="Maximum number of unfinished sentences per conversation before the LLM output waits",
+            zh="每个对话中未完成句子的最大数量，超过后 LLM 输出将等待",
+        ),
+    }
+
+
+class TTSHTTPConfig(I18nMixin):
+    """
+    Configuration for the HTTP client of server-based TTS engines. The client
+    is shared by all sessions and configured from conf.yaml at startup.
+    """
+
+    max_connections: int = Field(16, alias="max_connections")
+    max_keepalive_connections: int = Field(8, alias="max_keepalive_connections")
+    keepalive_expiry: float = Field(30.0, alias="keepalive_expiry")
+    connect_timeout: float = Field(5.0, alias="connect_timeout")
+    read_timeout: float = Field(120.0, alias="read_timeout")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "max_connections": Description(
+            en="Maximum number of connections to TTS servers",
+            zh="与 TTS 服务器的最大连接数",
+        ),
+        "max_keepalive_connections": Description(
+            en="Maximum number of idle connections kept open for reuse",
+            zh="保持打开以便复用的最大空闲连接数",
+        ),
+        "keepalive_expiry": Description(
+            en="Seconds an idle connection is kept open",
+            zh="空闲连接保持打开的秒数",
+        ),
+        "connect_timeout": Description(
+            en="Timeout in seconds for connecting to the TTS server",
+            zh="连接 TTS 服务器的超时时间（秒）",
+        ),
+        "read_timeout": Description(
+            en="Timeout in seconds for the TTS server to send audio",
+            zh="等待 TTS 服务器返回音频的超时时间（秒）",
+        ),
     }
 
 
@@ -369,6 +471,9 @@ class TTSConfig(I18nMixin):
         None, alias="sherpa_onnx_tts"
     )
     alltalk_tts: Optional[AllTalkTTSConfig] = Field(None, alias="alltalk_tts")
+    cache: Optional[TTSCacheConfig] = Field(None, alias="cache")
+    scheduler: Optional[TTSSchedulerConfig] = Field(None, alias="scheduler")
+    http: Optional[TTSHTTPConfig] = Field(None, alias="http")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "tts_model": Description(
@@ -395,6 +500,18 @@ class TTSConfig(I18nMixin):
         "sherpa_onnx_tts": Description(
             en="Configuration for Sherpa Onnx TTS", zh="Sherpa Onnx TTS 配置"
         ),
+        "cache": Description(
+            en="Cache of synthesized audio, keyed by text and voice configuration",
+            zh="按文本和声音配置索引的合成音频缓存",
+        ),
+        "scheduler": Description(
+            en="Concurrency and backpressure limits of sentence synthesis",
+            zh="句子合成的并发与背压限制",
+        ),
+        "http": Description(
+            en="Connection pool and timeouts of XTTS, GPT-SoVITS and AllTalk",
+            zh="XTTS、GPT-SoVITS 和 AllTalk 的连接池与超时设置",
+        ),
     }
 
     @model_validator(mode="after")
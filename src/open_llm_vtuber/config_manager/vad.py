@@ -14,10 +14,21 @@ class SileroVADConfig(I18nMixin):
     required_hits: int = Field(..., alias="required_hits")  # 3 * (0.032) = 0.1s
     required_misses: int = Field(..., alias="required_misses")  # 24 * (0.032) = 0.8s
     smoothing_window: int = Field(..., alias="smoothing_window")  # 5
+    batched_inference: bool = Field(True, alias="batched_inference")
+    max_batch_size: int = Field(64, alias="max_batch_size")
+    adaptive_endpointing: bool = Field(False, alias="adaptive_endpointing")
+    min_required_misses: int = Field(8, alias="min_required_misses")
+    max_required_misses: int = Field(32, alias="max_required_misses")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
-        "orig_sr": Description(en="Original Audio Sample Rate", zh="原始音频采样率"),
-        "target_sr": Description(en="Target Audio Sample Rate", zh="目标音频采样率"),
+        "orig_sr": Description(
+            en="Sample rate of client audio that does not specify one",
+            zh="未指定采样率的客户端音频的采样率",
+        ),
+        "target_sr": Description(
+            en="Sample rate client audio is resampled to for VAD and ASR",
+            zh="客户端音频在语音活动检测和语音识别前重采样到的采样率",
+        ),
         "prob_threshold": Description(
             en="Probability Threshold for VAD", zh="语音活动检测的概率阈值"
         ),
@@ -35,6 +46,26 @@ class SileroVADConfig(I18nMixin):
         "smoothing_window": Description(
             en="Smoothing window size for VAD", zh="语音活动检测的平滑窗口大小"
         ),
+        "batched_inference": Description(
+            en="Batch VAD inference of all connected clients in a worker thread",
+            zh="在工作线程中批量运行所有已连接客户端的语音活动检测推理",
+        ),
+        "max_batch_size": Description(
+            en="Maximum number of audio windows per batched VAD inference",
+            zh="每次批量语音活动检测推理的最大音频窗口数",
+        ),
+        "adaptive_endpointing": Description(
+            en="Adapt the number of misses that end an utterance to its length, how the speech faded out and the user's usual pauses",
+            zh="根据语音段长度、语音结束时的变化趋势以及用户平时的停顿，自适应调整结束语音段所需的未命中次数",
+        ),
+        "min_required_misses": Description(
+            en="Fewest misses adaptive endpointing may require to consider silence",
+            zh="自适应端点检测确认静音所需的最少未命中次数",
+        ),
+        "max_required_misses": Description(
+            en="Most misses adaptive endpointing may require to consider silence",
+            zh="自适应端点检测确认静音所需的最多未命中次数",
+        ),
     }
 
 
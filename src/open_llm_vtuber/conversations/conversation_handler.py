@@ -9,6 +9,8 @@ from loguru import logger
 from ..chat_group import ChatGroupManager
 from ..chat_history_manager import store_message
 from ..service_context import ServiceContext
+from ..utils.audio_buffer import AudioBuffer
+from ..utils.audio_codec import AudioEncoding
 from .group_conversation import process_group_conversation
 from .single_conversation import process_single_conversation
 from .conversation_utils import EMOJI_LIST
@@ -24,9 +26,12 @@ async def handle_conversation_trigger(
     client_contexts: Dict[str, ServiceContext],
     client_connections: Dict[str, WebSocket],
     chat_group_manager: ChatGroupManager,
-    received_data_buffers: Dict[str, np.ndarray],
+    received_data_buffers: Dict[str, AudioBuffer],
     current_conversation_tasks: Dict[str, Optional[asyncio.Task]],
     broadcast_to_group: Callable,
+    transcripts: Optional[Dict[str, str]] = None,
+    binary_audio: bool = False,
+    audio_encoding: Optional[AudioEncoding] = None,
 ) -> None:
     """Handle triggers that start a conversation"""
     if msg_type == "ai-speak-signal":
@@ -42,8 +47,11 @@ async def handle_conversation_trigger(
     elif msg_type == "text-input":
         user_input = data.get("text", "")
     else:  # mic-audio-end
-        user_input = received_data_buffers[client_uid]
-        received_data_buffers[client_uid] = np.array([])
+        # An owned copy; the buffer is reset for the next utterance
+        user_input = received_data_buffers[client_uid].take()
+        if transcripts and client_uid in transcripts:
+            # Already transcribed by streaming ASR while the user was speaking
+            user_input = transcripts.pop(client_uid)
 
     images = data.get("images")
     session_emoji = np.random.choice(EMOJI_LIST)
@@ -80,6 +88,8 @@ async def handle_conversation_trigger(
                 user_input=user_input,
                 images=images,
                 session_emoji=session_emoji,
+                websocket_send_bytes=websocket.send_bytes if binary_audio else None,
+                audio_encoding=audio_encoding,
             )
         )
 
@@ -65,7 +65,9 @@ async def process_agent_output(
                 translate_engine,
             )
         elif isinstance(output, AudioOutput):
-            full_response = await handle_audio_output(output, websocket_send)
+            full_response = await handle_audio_output(
+                output, websocket_send, tts_manager
+            )
         else:
             logger.warning(f"Unknown output type: {type(output)}")
     except Exception as e:
@@ -114,17 +116,24 @@ async def handle_sentence_output(
 async def handle_audio_output(
     output: AudioOutput,
     websocket_send: WebSocketSend,
+    tts_manager: Optional[TTSTaskManager] = None,
 ) -> str:
     """Process and send AudioOutput directly to the client"""
     full_response = ""
     async for audio_path, display_text, transcript, actions in output:
         full_response += transcript
-        audio_payload = prepare_audio_payload(
+        audio_payload = await asyncio.to_thread(
+            prepare_audio_payload,
             audio_path=audio_path,
             display_text=display_text,
             actions=actions.to_dict() if actions else None,
+            raw_audio=tts_manager is not None,
         )
-        await websocket_send(json.dumps(audio_payload))
+        if tts_manager is not None:
+            audio_payload = await tts_manager.encode_payload(audio_payload)
+            await tts_manager.send_payload(audio_payload, websocket_send)
+        else:
+            await websocket_send(json.dumps(audio_payload))
     return full_response
 
 
@@ -145,11 +154,14 @@ async def process_user_input(
     user_input: Union[str, np.ndarray],
     asr_engine: ASRInterface,
     websocket_send: WebSocketSend,
+    client_uid: Optional[str] = None,
 ) -> str:
     """Process user input, converting audio to text if needed"""
     if isinstance(user_input, np.ndarray):
         logger.info("Transcribing audio input...")
-        input_text = await asr_engine.async_transcribe_np(user_input)
+        input_text = await asr_engine.async_transcribe_np(
+            user_input, client_uid=client_uid
+        )
         await websocket_send(
             json.dumps({"type": "user-input-transcription", "text": input_text})
         )
@@ -13,8 +13,9 @@ from .conversation_utils import (
     cleanup_conversation,
     EMOJI_LIST,
 )
-from .types import WebSocketSend
+from .types import WebSocketSend, WebSocketSendBytes
 from .tts_manager import TTSTaskManager
+from ..utils.audio_codec import AudioEncoding
 from ..chat_history_manager import store_message
 from ..service_context import ServiceContext
 
@@ -26,6 +27,8 @@ async def process_single_conversation(
     user_input: Union[str, np.ndarray],
     images: Optional[List[Dict[str, Any]]] = None,
     session_emoji: str = np.random.choice(EMOJI_LIST),
+    websocket_send_bytes: Optional[WebSocketSendBytes] = None,
+    audio_encoding: Optional[AudioEncoding] = None,
 ) -> str:
     """Process a single-user conversation turn
 
@@ -36,12 +39,15 @@ async def process_single_conversation(
         user_input: Text or audio input from user
         images: Optional list of image data
         session_emoji: Emoji identifier for the conversation
+        websocket_send_bytes: Binary WebSocket send function, if the client
+            accepts audio as binary frames
+        audio_encoding: Codec and bitrate of the audio sent to the client
 
     Returns:
         str: Complete response text
     """
     # Create TTSTaskManager for this conversation
-    tts_manager = TTSTaskManager()
+    tts_manager = TTSTaskManager(websocket_send_bytes, audio_encoding)
 
     try:
         # Send initial signals
@@ -50,7 +56,7 @@ async def process_single_conversation(
 
         # Process user input
         input_text = await process_user_input(
-            user_input, context.asr_engine, websocket_send
+            user_input, context.asr_engine, websocket_send, client_uid
         )
 
         # Create batch input
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import time
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+from ..asr.asr_interface import ASRInterface
+from .types import WebSocketSend
+
+
+class SpeculativeTranscription:
+    """
+    Transcribes an utterance during the VAD hangover, before it is confirmed.
+
+    The VAD only yields an utterance after `required_misses` windows of
+    silence, and ASR would normally start after that. This starts ASR in the
+    background as soon as the silence begins. If the user resumes speaking
+    the result is discarded with `cancel()`; otherwise `result()` returns it
+    (usually already finished) when the conversation is triggered, and sends
+    the `user-input-transcription` message `process_user_input` would have.
+    """
+
+    def __init__(
+        self,
+        asr_engine: ASRInterface,
+        websocket_send: WebSocketSend,
+        audio: np.ndarray,
+        client_uid: Optional[str] = None,
+    ) -> None:
+        self.websocket_send = websocket_send
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self.task = asyncio.create_task(
+            asr_engine.async_transcribe_np(audio, client_uid=client_uid)
+        )
+        self.task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self.finished_at = time.perf_counter()
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Speculative transcription failed: {task.exception()}")
+
+    def cancel(self) -> None:
+        """Discard the transcription, the user kept speaking."""
+        self.task.cancel()
+
+    async def result(self) -> str:
+        """Wait for (and send) the transcript of the confirmed utterance."""
+        confirmed_at = time.perf_counter()
+        text = await self.task
+        if self.finished_at is not None and self.finished_at <= confirmed_at:
+            logger.debug(
+                "Speculative transcription was ready "
+                f"{(confirmed_at - self.finished_at) * 1000:.0f} ms before it was needed"
+            )
+        logger.info(f"Speculative transcription: {text}")
+        await self.websocket_send(
+            json.dumps({"type": "user-input-transcription", "text": text})
+        )
+        return text
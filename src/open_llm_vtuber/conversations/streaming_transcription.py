@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+from loguru import logger
+
+from ..asr.asr_interface import ASRInterface, ASRStream, StreamingASRInterface
+from .types import WebSocketSend
+
+
+def supports_streaming(asr_engine: ASRInterface | None) -> bool:
+    """Check whether an ASR engine can transcribe while the user speaks"""
+    return (
+        isinstance(asr_engine, StreamingASRInterface) and asr_engine.supports_streaming
+    )
+
+
+class StreamingTranscription:
+    """
+    Transcribes one utterance while it is being spoken.
+
+    Audio is fed as it arrives; every change of the partial transcript is sent
+    to the client as a `user-input-transcription` message with
+    `"partial": true`. `finish()` sends the final transcript without the flag,
+    the same message `process_user_input` sends for a finished utterance.
+    Decoding runs on the ASR engine's threads (`run_stream`) to keep the
+    event loop free.
+    """
+
+    def __init__(
+        self, asr_engine: StreamingASRInterface, websocket_send: WebSocketSend
+    ) -> None:
+        self.asr_engine = asr_engine
+        self.stream: ASRStream = asr_engine.create_stream()
+        self.websocket_send = websocket_send
+        self.samples_fed = 0
+        self.text = ""
+
+    async def feed(self, audio: np.ndarray) -> None:
+        """Feed the next float32 samples of the utterance."""
+        if not len(audio):
+            return
+        self.samples_fed += len(audio)
+        text = await self.asr_engine.run_stream(
+            self.stream, self.stream.accept_waveform, audio
+        )
+        if text != self.text:
+            self.text = text
+            await self.websocket_send(
+                json.dumps(
+                    {"type": "user-input-transcription", "text": text, "partial": True}
+                )
+            )
+
+    async def finish(self) -> str:
+        """End the utterance and return (and send) the final transcript."""
+        self.text = await self.asr_engine.run_stream(self.stream, self.stream.finish)
+        logger.info(f"Streaming transcription: {self.text}")
+        await self.websocket_send(
+            json.dumps({"type": "user-input-transcription", "text": self.text})
+        )
+        return self.text
@@ -1,31 +1,70 @@
 import asyncio
-import json
+import contextlib
+import itertools
 import re
-import uuid
-from datetime import datetime
+import time
 from typing import List, Optional, Dict
+import numpy as np
 from loguru import logger
 
 from ..agent.output_types import DisplayText, Actions
 from ..live2d_model import Live2dModel
-from ..tts.tts_interface import TTSInterface
-from ..utils.stream_audio import prepare_audio_payload
-from .types import WebSocketSend
+from ..tts.tts_cache import CachedTTS
+from ..tts.tts_interface import TTSAudio, TTSInterface
+from ..tts.tts_scheduler import get_scheduler
+from ..utils.stream_audio import (
+    VolumeEnvelope,
+    encode_audio_payload,
+    prepare_audio_chunk_payload,
+    prepare_audio_payload,
+)
+from ..utils.audio_codec import AudioEncoding, audio_encoder
+from .types import WebSocketSend, WebSocketSendBytes
 
 
 class TTSTaskManager:
     """Manages TTS tasks and ensures ordered delivery to frontend while allowing parallel TTS generation"""
 
-    def __init__(self) -> None:
+    # Audio of streaming engines is sent in chunks of at least this length.
+    # The first chunk of a sentence is kept short to start playback early.
+    STREAM_FIRST_CHUNK_MS = 300
+    STREAM_CHUNK_MS = 1000
+    VOLUME_SLICE_MS = 20
+
+    # Links JSON audio messages to their binary frames; unique across
+    # conversations so a late frame of an interrupted one cannot be mistaken
+    _audio_ids = itertools.count()
+
+    def __init__(
+        self,
+        websocket_send_bytes: Optional[WebSocketSendBytes] = None,
+        audio_encoding: Optional[AudioEncoding] = None,
+    ) -> None:
+        """
+        Args:
+            websocket_send_bytes: Sends a binary WebSocket frame. If given, the
+                client negotiated binary audio and gets the audio of each
+                payload as a binary frame instead of base64 inside the JSON.
+            audio_encoding: Codec and bitrate negotiated with the client. WAV
+                if not given.
+        """
+        self.websocket_send_bytes = websocket_send_bytes
+        self.audio_encoding = audio_encoding or AudioEncoding()
         self.task_list: List[asyncio.Task] = []
         self._lock = asyncio.Lock()
-        # Queue to store ordered payloads
-        self._payload_queue: asyncio.Queue[Dict] = asyncio.Queue()
+        # Queue to store ordered payloads: (payload, sequence_number, final).
+        # A sentence may be sent as several payloads (streaming TTS); the
+        # next sentence is sent after the one marked final.
+        self._payload_queue: asyncio.Queue[tuple] = asyncio.Queue()
         # Task to handle sending payloads in order
         self._sender_task: Optional[asyncio.Task] = None
         # Counter for maintaining order
         self._sequence_counter = 0
         self._next_sequence_to_send = 0
+        # Backpressure: sentences queued or in synthesis, bounded by the
+        # engine's scheduler (created on the first sentence)
+        self._pending_sentences: Optional[asyncio.Semaphore] = None
+        self.backpressure_wait = 0.0
 
     async def speak(
         self,
@@ -39,6 +78,11 @@ class TTSTaskManager:
         """
         Queue a TTS task while maintaining order of delivery.
 
+        Sentences are synthesized in parallel, up to the engine scheduler's
+        concurrency limit and lowest sequence number first. Once
+        `max_pending_sentences` sentences of this conversation are waiting or
+        in synthesis, this blocks until one finishes.
+
         Args:
             tts_text: Text to synthesize
             display_text: Text to display in UI
@@ -66,6 +110,20 @@ class TTSTaskManager:
             f"🏃Queuing TTS task for: '''{tts_text}''' (by {display_text.name})"
         )
 
+        if self._pending_sentences is None:
+            self._pending_sentences = asyncio.Semaphore(
+                get_scheduler(tts_engine).max_pending_sentences
+            )
+        pending_sentences = self._pending_sentences
+        if pending_sentences.locked():
+            start = time.perf_counter()
+            await pending_sentences.acquire()
+            waited = time.perf_counter() - start
+            self.backpressure_wait += waited
+            logger.debug(f"TTS backpressure: waited {waited * 1000:.0f} ms")
+        else:
+            await pending_sentences.acquire()
+
         # Get current sequence number
         current_sequence = self._sequence_counter
         self._sequence_counter += 1
@@ -87,6 +145,8 @@ class TTSTaskManager:
                 sequence_number=current_sequence,
             )
         )
+        # Also runs if the task is cancelled before it starts
+        task.add_done_callback(lambda _: pending_sentences.release())
         self.task_list.append(task)
 
     async def _process_payload_queue(self, websocket_send: WebSocketSend) -> None:
@@ -94,18 +154,27 @@ class TTSTaskManager:
         Process and send payloads in correct order.
         Runs continuously until all payloads are processed.
         """
-        buffered_payloads: Dict[int, Dict] = {}
+        buffered_payloads: Dict[int, List[tuple]] = {}
 
         while True:
             try:
                 # Get payload from queue
-                payload, sequence_number = await self._payload_queue.get()
-                buffered_payloads[sequence_number] = payload
+                payload, sequence_number, final = await self._payload_queue.get()
+                buffered_payloads.setdefault(sequence_number, []).append(
+                    (payload, final)
+                )
 
                 # Send payloads in order
                 while self._next_sequence_to_send in buffered_payloads:
-                    next_payload = buffered_payloads.pop(self._next_sequence_to_send)
-                    await websocket_send(json.dumps(next_payload))
+                    finished = False
+                    for next_payload, finished in buffered_payloads.pop(
+                        self._next_sequence_to_send
+                    ):
+                        if next_payload is not None:
+                            await self.send_payload(next_payload, websocket_send)
+                    if not finished:
+                        # More chunks of this sentence are on the way
+                        break
                     self._next_sequence_to_send += 1
 
                 self._payload_queue.task_done()
@@ -113,6 +182,25 @@ class TTSTaskManager:
             except asyncio.CancelledError:
                 break
 
+    async def encode_payload(self, payload: dict) -> dict:
+        """Compress the audio of a payload with the client's codec, if any"""
+        if not self.audio_encoding.compressed or not payload.get("audio"):
+            return payload
+        data, encoding = await audio_encoder.encode(
+            payload["audio"], self.audio_encoding
+        )
+        return {**payload, "audio": data, "mime_type": encoding.mime_type}
+
+    async def send_payload(self, payload: dict, websocket_send: WebSocketSend) -> None:
+        """Send an audio payload, as a binary frame if the client supports it"""
+        audio_id = None
+        if self.websocket_send_bytes is not None:
+            audio_id = next(self._audio_ids) % 2**32
+        message, frame = encode_audio_payload(payload, audio_id)
+        await websocket_send(message)
+        if frame is not None:
+            await self.websocket_send_bytes(frame)
+
     async def _send_silent_payload(
         self,
         display_text: DisplayText,
@@ -125,7 +213,7 @@ class TTSTaskManager:
             display_text=display_text,
             actions=actions,
         )
-        await self._payload_queue.put((audio_payload, sequence_number))
+        await self._payload_queue.put((audio_payload, sequence_number, True))
 
     async def _process_tts(
         self,
@@ -137,16 +225,48 @@ class TTSTaskManager:
         sequence_number: int,
     ) -> None:
         """Process TTS generation and queue the result for ordered delivery"""
-        audio_file_path = None
+        if tts_engine.supports_streaming:
+            async with self._synthesis_slot(tts_engine, tts_text, sequence_number):
+                await self._process_tts_stream(
+                    tts_text, display_text, actions, tts_engine, sequence_number
+                )
+        else:
+            await self._process_tts_whole(
+                tts_text, display_text, actions, tts_engine, sequence_number
+            )
+
+    def _synthesis_slot(
+        self, tts_engine: TTSInterface, text: str, sequence_number: int
+    ) -> contextlib.AbstractAsyncContextManager:
+        """A slot of the engine's scheduler; cache hits do not need one"""
+        if isinstance(tts_engine, CachedTTS) and tts_engine.contains(text):
+            return contextlib.nullcontext()
+        return get_scheduler(tts_engine).slot(sequence_number)
+
+    async def _process_tts_whole(
+        self,
+        tts_text: str,
+        display_text: DisplayText,
+        actions: Optional[Actions],
+        tts_engine: TTSInterface,
+        sequence_number: int,
+    ) -> None:
+        """Synthesize a whole sentence and queue it as one payload"""
         try:
-            audio_file_path = await self._generate_audio(tts_engine, tts_text)
-            payload = prepare_audio_payload(
-                audio_path=audio_file_path,
+            async with self._synthesis_slot(tts_engine, tts_text, sequence_number):
+                audio = await self._generate_audio(tts_engine, tts_text)
+            # Decoding and the volume envelope stay off the event loop
+            payload = await asyncio.to_thread(
+                prepare_audio_payload,
+                audio_path=None,
+                audio=audio,
                 display_text=display_text,
                 actions=actions,
+                raw_audio=True,
             )
+            payload = await self.encode_payload(payload)
             # Queue the payload with its sequence number
-            await self._payload_queue.put((payload, sequence_number))
+            await self._payload_queue.put((payload, sequence_number, True))
 
         except Exception as e:
             logger.error(f"Error preparing audio payload: {e}")
@@ -156,24 +276,111 @@ class TTSTaskManager:
                 display_text=display_text,
                 actions=actions,
             )
-            await self._payload_queue.put((payload, sequence_number))
+            await self._payload_queue.put((payload, sequence_number, True))
 
-        finally:
-            if audio_file_path:
-                tts_engine.remove_file(audio_file_path)
-                logger.debug("Audio cache file cleaned.")
+    async def _process_tts_stream(
+        self,
+        tts_text: str,
+        display_text: DisplayText,
+        actions: Optional[Actions],
+        tts_engine: TTSInterface,
+        sequence_number: int,
+    ) -> None:
+        """
+        Forward the audio of a streaming TTS engine in chunks as it is
+        synthesized, instead of waiting for the whole sentence
+        """
+        logger.debug(f"🏃Streaming audio for '''{tts_text}'''...")
+        start = time.perf_counter()
+        pending = bytearray()
+        pending_volumes = []
+        envelope: Optional[VolumeEnvelope] = None
+        min_chunk_ms = self.STREAM_FIRST_CHUNK_MS
+        chunks_sent = 0
 
-    async def _generate_audio(self, tts_engine: TTSInterface, text: str) -> str:
-        """Generate audio file from text"""
+        def add(pcm: bytes, volumes) -> None:
+            pending.extend(pcm)
+            pending_volumes.append(volumes)
+
+        async def queue_pending() -> None:
+            nonlocal chunks_sent, min_chunk_ms
+            # Normalized by the loudest slice so far: later chunks of the
+            # sentence are not known yet
+            volumes = envelope.normalize(np.concatenate(pending_volumes))
+            first = chunks_sent == 0
+            payload = prepare_audio_chunk_payload(
+                bytes(pending),
+                envelope.sample_rate,
+                volumes,
+                chunk_length_ms=self.VOLUME_SLICE_MS,
+                display_text=display_text if first else None,
+                actions=actions if first else None,
+                raw_audio=True,
+            )
+            payload = await self.encode_payload(payload)
+            await self._payload_queue.put((payload, sequence_number, False))
+            if first:
+                logger.debug(
+                    f"First audio chunk after {(time.perf_counter() - start) * 1000:.0f} ms"
+                )
+            chunks_sent += 1
+            min_chunk_ms = self.STREAM_CHUNK_MS
+            pending.clear()
+            pending_volumes.clear()
+
+        try:
+            async for chunk in tts_engine.async_stream_audio(tts_text):
+                if envelope is None or chunk.sample_rate != envelope.sample_rate:
+                    if envelope is not None:
+                        add(*envelope.flush())
+                        if pending:
+                            await queue_pending()
+                    envelope = VolumeEnvelope(chunk.sample_rate, self.VOLUME_SLICE_MS)
+                # Chunks are cut at slice boundaries, so each chunk's volumes
+                # line up with its audio
+                add(*envelope.feed(chunk.pcm))
+                if len(pending) >= envelope.sample_rate * 2 * min_chunk_ms // 1000:
+                    await queue_pending()
+            if envelope is not None:
+                add(*envelope.flush())
+            if pending:
+                await queue_pending()
+        except Exception as e:
+            logger.error(f"Error streaming TTS audio: {e}")
+
+        if chunks_sent:
+            # End of the sentence
+            await self._payload_queue.put((None, sequence_number, True))
+        else:
+            payload = prepare_audio_payload(
+                audio_path=None,
+                display_text=display_text,
+                actions=actions,
+            )
+            await self._payload_queue.put((payload, sequence_number, True))
+
+    async def _generate_audio(
+        self, tts_engine: TTSInterface, text: str
+    ) -> Optional[TTSAudio]:
+        """Generate audio from text, in memory"""
         logger.debug(f"🏃Generating audio for '''{text}'''...")
-        return await tts_engine.async_generate_audio(
-            text=text,
-            file_name_no_ext=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}",
-        )
+        return await tts_engine.async_generate_audio_data(text)
+
+    def stats(self) -> dict:
+        """Sentences of this conversation and time the producer was blocked"""
+        return {
+            "sentences": self._sequence_counter,
+            "unsent": self._sequence_counter - self._next_sequence_to_send,
+            "backpressure_wait_ms": self.backpressure_wait * 1000,
+        }
 
     def clear(self) -> None:
         """Clear all pending tasks and reset state"""
+        # Unfinished sentences would otherwise keep their scheduler slots
+        for task in self.task_list:
+            task.cancel()
         self.task_list.clear()
+        self._pending_sentences = None
         if self._sender_task:
             self._sender_task.cancel()
         self._sequence_counter = 0
@@ -0,0 +1,269 @@
+"""
+Process-wide registry of the ASR, TTS and VAD engines.
+
+Engines are keyed by a hash of their kind and canonical configuration, so
+every session using the same configuration shares one instance: ten clients
+switching to the same character load its Whisper and TTS models once, and
+switching to a character whose engines are already loaded takes no time.
+Sessions hold counted references; engines no session uses stay loaded until
+the loaded engines exceed the memory budget, then the least recently used
+idle ones are dropped.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+
+def engine_key(kind: str, config: dict) -> str:
+    """Canonical hash of an engine kind and its configuration."""
+    canonical = json.dumps(
+        {"kind": kind, "config": config},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return f"{kind}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]}"
+
+
+def resident_memory() -> Optional[int]:
+    """Resident memory of the process in bytes, or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+
+@dataclass
+class _Entry:
+    kind: str
+    engine: Any
+    # Approximate, see EngineRegistry._measured
+    size: int
+    refs: int = 0
+
+
+class EngineRegistry:
+    """Refcounted engines shared across sessions, keyed by configuration."""
+
+    def __init__(self, memory_budget_mb: float = 4096) -> None:
+        """
+        Args:
+            memory_budget_mb: Idle engines are evicted while the loaded
+                engines use more memory than this. 0 evicts them as soon as
+                no session uses them.
+        """
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        # Least recently used first
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Held while an engine is created, so concurrent sessions asking
+        # for the same configuration wait for it instead of loading it twice
+        self._creating: dict[str, threading.Lock] = {}
+        # Engines created at overlapping times (the ASR, TTS and VAD of a
+        # config load in parallel): resident memory when the first of them
+        # started, and the memory growth each one saw while it was created
+        self._group_start: Optional[int] = None
+        self._group_loading = 0
+        self._group_growth: dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, memory_budget_mb: float) -> None:
+        """Set the memory budget, evicting idle engines above it."""
+        with self._lock:
+            self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+            evicted = self._evict()
+        self._close(evicted)
+
+    def memory_usage(self) -> int:
+        """Approximate memory of the loaded engines in bytes"""
+        with self._lock:
+            return self._memory()
+
+    def stats(self) -> dict:
+        """Loaded engines, their references and memory, and hit counters"""
+        with self._lock:
+            return {
+                "engines": {
+                    key: {"refs": entry.refs, "size_mb": entry.size / 1024 / 1024}
+                    for key, entry in self._entries.items()
+                },
+                "memory_mb": self._memory() / 1024 / 1024,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def acquire(
+        self, kind: str, config: dict, create: Callable[[], Any]
+    ) -> tuple[str, Any]:
+        """
+        Take a reference to the engine of `config`, creating it if needed.
+
+        Args:
+            kind: Kind of engine, e.g. "asr".
+            config: The engine's configuration (JSON-serializable).
+            create: Creates the engine if none is loaded for `config`.
+
+        Returns:
+            tuple: (key to `release` the reference with, the engine)
+        """
+        key = engine_key(kind, config)
+        with self._lock:
+            creating = self._creating.setdefault(key, threading.Lock())
+
+        with creating:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refs += 1
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    logger.info(
+                        f"Engine registry: reusing {key} ({entry.refs} sessions)"
+                    )
+                    return key, entry.engine
+
+            with self._lock:
+                if self._group_loading == 0:
+                    self._group_start = resident_memory()
+                    self._group_growth = {}
+                self._group_loading += 1
+            memory_before = resident_memory()
+            start = time.perf_counter()
+            try:
+                engine = create()
+            except BaseException:
+                with self._lock:
+                    self._group_loading -= 1
+                    self._creating.pop(key, None)
+                raise
+            memory_after = resident_memory()
+            growth = (
+                max(0, memory_after - memory_before)
+                if memory_before is not None and memory_after is not None
+                else 0
+            )
+
+            with self._lock:
+                self._entries[key] = _Entry(kind, engine, growth, refs=1)
+                self._creating.pop(key, None)
+                self.misses += 1
+                self._group_growth[key] = growth
+                self._group_loading -= 1
+                if self._group_loading == 0:
+                    self._measured(memory_after)
+                size = self._entries[key].size
+                evicted = self._evict()
+            logger.info(
+                f"Engine registry: loaded {key} ({type(engine).__name__}) in "
+                f"{time.perf_counter() - start:.1f} s, ~{size / 1024 / 1024:.0f} MB"
+            )
+        self._close(evicted)
+        return key, engine
+
+    def retain(self, key: Optional[str]) -> None:
+        """Take another reference to a loaded engine."""
+        if key is None:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                self._entries.move_to_end(key)
+
+    def release(self, key: Optional[str]) -> None:
+        """Drop a reference; an unused engine may then be evicted."""
+        if key is None:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refs == 0:
+                return
+            entry.refs -= 1
+            self._entries.move_to_end(key)
+            evicted = self._evict() if entry.refs == 0 else []
+        self._close(evicted)
+
+    def _measured(self, memory_now: Optional[int]) -> None:
+        """
+        Size the engines of the creation group that just finished (called
+        with the lock held).
+
+        An engine's size is the growth of the process's resident memory
+        while it was created, so it is approximate: it includes whatever
+        else the process allocated meanwhile and misses memory the engine
+        allocates later. Engines created at the same time each see the
+        others' allocations too; their sizes are scaled so that together
+        they add up to the growth of the whole group instead of counting
+        the shared growth once per engine. Until the group finishes, an
+        engine is counted with its own, possibly inflated, growth.
+        """
+        growths, self._group_growth = self._group_growth, {}
+        total_growth = sum(growths.values())
+        if (
+            len(growths) < 2
+            or total_growth == 0
+            or memory_now is None
+            or self._group_start is None
+        ):
+            return
+        group = max(0, memory_now - self._group_start)
+        scale = min(1.0, group / total_growth)
+        for key, growth in growths.items():
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.size = int(growth * scale)
+
+    def _memory(self) -> int:
+        return sum(entry.size for entry in self._entries.values())
+
+    def _evict(self) -> list:
+        # Called with the lock held; returns the entries to close
+        evicted = []
+        memory = self._memory()
+        for key in list(self._entries):
+            if self.memory_budget > 0 and memory <= self.memory_budget:
+                break
+            entry = self._entries[key]
+            if entry.refs > 0:
+                continue
+            del self._entries[key]
+            memory -= entry.size
+            self.evictions += 1
+            evicted.append((key, entry))
+        return evicted
+
+    @staticmethod
+    def _close(evicted: list) -> None:
+        for key, entry in evicted:
+            logger.info(
+                f"Engine registry: evicted idle {key} "
+                f"(~{entry.size / 1024 / 1024:.0f} MB)"
+            )
+            close = getattr(entry.engine, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Engine registry: failed to close {key}: {e}")
+
+
+engine_registry = EngineRegistry()
@@ -12,7 +12,14 @@ from starlette.responses import Response
 
 from .routes import init_client_ws_route, init_webtool_routes
 from .service_context import ServiceContext
+from .config_manager import TTSHTTPConfig
 from .config_manager.utils import Config
+from .tts.http_client import (
+    HTTPClientSettings,
+    close_http_client,
+    configure_http_client,
+)
+from .warm_pool import warm_pool
 
 
 class CustomStaticFiles(StaticFiles):
@@ -34,6 +41,7 @@ class AvatarStaticFiles(StaticFiles):
 class WebSocketServer:
     def __init__(self, config: Config):
         self.app = FastAPI()
+        self.app.add_event_handler("shutdown", close_http_client)
 
         # Add CORS
         self.app.add_middleware(
@@ -44,10 +52,21 @@ class WebSocketServer:
             allow_headers=["*"],
         )
 
+        # The TTS HTTP client is shared by every session, so it is configured
+        # once from conf.yaml; character switches don't change it
+        http_config = config.character_config.tts_config.http or TTSHTTPConfig()
+        configure_http_client(HTTPClientSettings(**http_config.model_dump()))
+
         # Load configurations and initialize the default context cache
         default_context_cache = ServiceContext()
         default_context_cache.load_from_config(config)
 
+        # Preload the engines of warm_configs once the server is running
+        self.app.add_event_handler(
+            "startup", lambda: warm_pool.start(default_context_cache)
+        )
+        self.app.add_event_handler("shutdown", warm_pool.close)
+
         # Include routes
         self.app.include_router(
             init_client_ws_route(default_context_cache=default_context_cache),
@@ -1,5 +1,9 @@
 import os
 import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 
 from loguru import logger
 from fastapi import WebSocket
@@ -13,18 +17,27 @@ from .agent.agents.agent_interface import AgentInterface
 from .translate.translate_interface import TranslateInterface
 
 from .asr.asr_factory import ASRFactory
+from .asr.asr_pool import ASRWorkerPool
 from .tts.tts_factory import TTSFactory
+from .tts.tts_cache import CachedTTS
+from .tts.tts_scheduler import TTSScheduler, set_scheduler
 from .vad.vad_factory import VADFactory
 from .agent.agent_factory import AgentFactory
 from .translate.translate_factory import TranslateFactory
+from .engine_registry import engine_registry
+from .warm_pool import warm_pool
+from .utils.startup_timeline import StartupTimeline
 
 from .config_manager import (
     Config,
+    EngineRegistryConfig,
     AgentConfig,
     CharacterConfig,
     SystemConfig,
     ASRConfig,
+    ASRWorkerPoolConfig,
     TTSConfig,
+    TTSSchedulerConfig,
     VADConfig,
     TranslatorConfig,
     read_yaml,
@@ -55,6 +68,9 @@ class ServiceContext:
 
         self.history_uid: str = ""  # Add history_uid field
 
+        # Registry keys of the shared engines this context holds a reference to
+        self.engine_keys: Dict[str, str] = {}
+
     def __str__(self):
         return (
             f"ServiceContext:\n"
@@ -85,10 +101,14 @@ class ServiceContext:
         vad_engine: VADInterface,
         agent_engine: AgentInterface,
         translate_engine: TranslateInterface | None,
+        engine_keys: Dict[str, str] | None = None,
     ) -> None:
         """
         Load the ServiceContext with the reference of the provided instances.
         Pass by reference so no reinitialization will be done.
+
+        `engine_keys` are the registry keys of the shared engines among them;
+        this context takes a reference to each until `close`.
         """
         if not character_config:
             raise ValueError("character_config cannot be None")
@@ -104,9 +124,36 @@ class ServiceContext:
         self.vad_engine = vad_engine
         self.agent_engine = agent_engine
         self.translate_engine = translate_engine
+        self.engine_keys = dict(engine_keys or {})
+        for key in self.engine_keys.values():
+            engine_registry.retain(key)
 
         logger.debug(f"Loaded service context with cache: {character_config}")
 
+    def close(self) -> None:
+        """Release the shared engines of this context (when the session ends)."""
+        for key in self.engine_keys.values():
+            engine_registry.release(key)
+        self.engine_keys.clear()
+
+    @staticmethod
+    def _engine_config(config, model_field: str, *sections: str) -> dict:
+        """
+        The part of an ASR/TTS/VAD config that determines its engine: the
+        selected model, that model's settings and the given `sections`. The
+        settings of other models are left out, so the same engine is shared
+        by configs that were merged onto different characters (a switch
+        merges onto the session's current character, the warm pool onto the
+        default one).
+        """
+        model = getattr(config, model_field)
+        data = config.model_dump()
+        return {
+            model_field: model,
+            model: data.get(model.lower()),
+            **{section: data.get(section) for section in sections},
+        }
+
     def load_from_config(self, config: Config) -> None:
         """
         Load the ServiceContext with the config.
@@ -124,82 +171,238 @@ class ServiceContext:
         if not self.character_config:
             self.character_config = config.character_config
 
-        # update all sub-configs
-
-        # init live2d from character config
-        self.init_live2d(config.character_config.live2d_model_name)
-
-        # init asr from character config
-        self.init_asr(config.character_config.asr_config)
-
-        # init tts from character config
-        self.init_tts(config.character_config.tts_config)
+        self.apply_engines(config, self.load_engines(config))
 
-        # init vad from character config
-        self.init_vad(config.character_config.vad_config)
+    def load_engines(self, config: Config) -> Dict[str, tuple | None]:
+        """
+        Load the engines of `config` that differ from this context's without
+        changing the context, so it can run off the event loop while the
+        context is in use. Pass the result to `apply_engines`.
 
-        # init agent from character config
-        self.init_agent(
-            config.character_config.agent_config,
-            config.character_config.persona_prompt,
-        )
+        Parameters:
+        - config (Config): The configuration to load.
 
-        self.init_translate(
-            config.character_config.tts_preprocessor_config.translator_config
-        )
+        Returns:
+        - Dict[str, tuple | None]: The result of each `init_*` method by
+          engine, None where the current engine is kept.
+        """
+        registry_config = self.system_config.engine_registry or EngineRegistryConfig()
+        engine_registry.configure(memory_budget_mb=registry_config.memory_budget_mb)
+
+        # The engines load concurrently, so a cold start takes as long as the
+        # slowest one rather than their sum.
+        character_config = config.character_config
+        timeline = StartupTimeline()
+
+        def init_character() -> tuple:
+            # The agent's system prompt needs the Live2D model's emotions
+            live2d_model = timeline.run(
+                "live2d", self.init_live2d, character_config.live2d_model_name
+            )
+            agent = timeline.run(
+                "agent",
+                self.init_agent,
+                character_config.agent_config,
+                character_config.persona_prompt,
+                live2d_model or self.live2d_model,
+            )
+            translate_engine = timeline.run(
+                "translate",
+                self.init_translate,
+                character_config.tts_preprocessor_config.translator_config,
+            )
+            return live2d_model, agent, translate_engine
+
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="init") as executor:
+            futures = {
+                "character": executor.submit(init_character),
+                "asr": executor.submit(
+                    timeline.run, "asr", self.init_asr, character_config.asr_config
+                ),
+                "tts": executor.submit(
+                    timeline.run, "tts", self.init_tts, character_config.tts_config
+                ),
+                "vad": executor.submit(
+                    timeline.run, "vad", self.init_vad, character_config.vad_config
+                ),
+            }
+        engines = {}
+        errors = []
+        for name, future in futures.items():
+            try:
+                engines[name] = future.result()
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            # Drop the shared engines the other loaders got, then raise the
+            # first failure
+            for kind in ("asr", "tts", "vad"):
+                if engines.get(kind):
+                    engine_registry.release(engines[kind][1])
+            raise errors[0]
+        logger.info(timeline.report())
+        return engines
+
+    def apply_engines(self, config: Config, engines: Dict[str, tuple | None]) -> None:
+        """
+        Switch this context to `config` and the engines `load_engines` loaded
+        for it, all at once. The shared engines that were replaced are
+        released only after the switch.
+        """
+        live2d_model, agent, translate_engine = engines["character"]
+        if live2d_model is not None:
+            self.live2d_model = live2d_model
+        if agent is not None:
+            self.agent_engine, self.system_prompt, persona_prompt = agent
+        else:
+            persona_prompt = self.character_config.persona_prompt
+        if translate_engine is not None:
+            self.translate_engine = translate_engine
+
+        replaced_keys = []
+        if engines["asr"] is not None:
+            self.asr_engine, key = engines["asr"]
+            replaced_keys.append(self.engine_keys.get("asr"))
+            self.engine_keys["asr"] = key
+        if engines["tts"] is not None:
+            self.tts_engine, key = engines["tts"]
+            replaced_keys.append(self.engine_keys.get("tts"))
+            self.engine_keys["tts"] = key
+        if engines["vad"] is not None:
+            self.vad_engine, key = engines["vad"]
+            replaced_keys.append(self.engine_keys.get("vad"))
+            self.engine_keys["vad"] = key
 
         # store typed config references
+        config.character_config.persona_prompt = persona_prompt
         self.config = config
         self.system_config = config.system_config or self.system_config
         self.character_config = config.character_config
 
-    def init_live2d(self, live2d_model_name: str) -> None:
+        for key in replaced_keys:
+            engine_registry.release(key)
+
+    def init_live2d(self, live2d_model_name: str) -> Live2dModel | None:
         logger.info(f"Initializing Live2D: {live2d_model_name}")
         try:
-            self.live2d_model = Live2dModel(live2d_model_name)
-            self.character_config.live2d_model_name = live2d_model_name
+            return Live2dModel(live2d_model_name)
         except Exception as e:
             logger.critical(f"Error initializing Live2D: {e}")
             logger.critical("Try to proceed without Live2D...")
+            return None
 
-    def init_asr(self, asr_config: ASRConfig) -> None:
+    def init_asr(self, asr_config: ASRConfig) -> tuple[ASRInterface, str] | None:
+        """
+        Get the shared ASR engine of `asr_config` and its registry key, None
+        if this context's engine already matches.
+        """
         if not self.asr_engine or (self.character_config.asr_config != asr_config):
             logger.info(f"Initializing ASR: {asr_config.asr_model}")
-            self.asr_engine = ASRFactory.get_asr_system(
-                asr_config.asr_model,
-                **getattr(asr_config, asr_config.asr_model).model_dump(),
+
+            def create_asr_engine() -> ASRInterface:
+                return ASRFactory.get_asr_system(
+                    asr_config.asr_model,
+                    **getattr(asr_config, asr_config.asr_model).model_dump(),
+                )
+
+            def create_asr_pool() -> ASRWorkerPool:
+                pool_config = asr_config.worker_pool or ASRWorkerPoolConfig()
+                return ASRWorkerPool(
+                    create_asr_engine(),
+                    create_replica=create_asr_engine,
+                    concurrency=pool_config.concurrency,
+                    replicas=pool_config.replicas,
+                    batch_window_ms=pool_config.batch_window_ms,
+                    max_batch_size=pool_config.max_batch_size,
+                )
+
+            # Sessions with the same ASR config share one worker pool
+            key, asr_engine = engine_registry.acquire(
+                "asr",
+                self._engine_config(asr_config, "asr_model", "worker_pool"),
+                create_asr_pool,
             )
-            # saving config should be done after successful initialization
-            self.character_config.asr_config = asr_config
-        else:
-            logger.info("ASR already initialized with the same config.")
+            return asr_engine, key
+        logger.info("ASR already initialized with the same config.")
+        return None
 
-    def init_tts(self, tts_config: TTSConfig) -> None:
+    def init_tts(self, tts_config: TTSConfig) -> tuple[TTSInterface, str] | None:
+        """
+        Get the shared TTS engine of `tts_config` and its registry key, None
+        if this context's engine already matches.
+        """
         if not self.tts_engine or (self.character_config.tts_config != tts_config):
             logger.info(f"Initializing TTS: {tts_config.tts_model}")
-            self.tts_engine = TTSFactory.get_tts_engine(
-                tts_config.tts_model,
-                **getattr(tts_config, tts_config.tts_model.lower()).model_dump(),
+            engine_config = getattr(
+                tts_config, tts_config.tts_model.lower()
+            ).model_dump()
+
+            def create_tts_engine() -> TTSInterface:
+                tts_engine = TTSFactory.get_tts_engine(
+                    tts_config.tts_model,
+                    **engine_config,
+                )
+                if tts_config.cache and tts_config.cache.enabled:
+                    tts_engine = CachedTTS(
+                        tts_engine,
+                        engine_name=tts_config.tts_model,
+                        engine_config=engine_config,
+                        memory_max_mb=tts_config.cache.memory_max_mb,
+                        disk_max_mb=tts_config.cache.disk_max_mb,
+                        cache_dir=tts_config.cache.cache_dir,
+                    )
+                scheduler_config = tts_config.scheduler or TTSSchedulerConfig()
+                set_scheduler(
+                    tts_engine,
+                    TTSScheduler(
+                        max_concurrency=scheduler_config.max_concurrency,
+                        max_pending_sentences=scheduler_config.max_pending_sentences,
+                    ),
+                )
+                return tts_engine
+
+            # Sessions with the same TTS config share one engine (and its
+            # cache and scheduler)
+            key, tts_engine = engine_registry.acquire(
+                "tts",
+                self._engine_config(tts_config, "tts_model", "cache", "scheduler"),
+                create_tts_engine,
             )
-            # saving config should be done after successful initialization
-            self.character_config.tts_config = tts_config
-        else:
-            logger.info("TTS already initialized with the same config.")
+            return tts_engine, key
+        logger.info("TTS already initialized with the same config.")
+        return None
 
-    def init_vad(self, vad_config: VADConfig) -> None:
+    def init_vad(self, vad_config: VADConfig) -> tuple[VADInterface, str] | None:
+        """
+        Get a session of the shared VAD engine of `vad_config` and the
+        engine's registry key, None if this context's engine already matches.
+        """
         if not self.vad_engine or (self.character_config.vad_config != vad_config):
             logger.info(f"Initializing VAD: {vad_config.vad_model}")
-            self.vad_engine = VADFactory.get_vad_engine(
-                vad_config.vad_model,
-                **getattr(vad_config, vad_config.vad_model.lower()).model_dump(),
+            key, vad_engine = engine_registry.acquire(
+                "vad",
+                self._engine_config(vad_config, "vad_model"),
+                lambda: VADFactory.get_vad_engine(
+                    vad_config.vad_model,
+                    **getattr(vad_config, vad_config.vad_model.lower()).model_dump(),
+                ),
             )
-            # saving config should be done after successful initialization
-            self.character_config.vad_config = vad_config
-        else:
-            logger.info("VAD already initialized with the same config.")
+            # share the loaded model, but keep this context's own VAD state
+            return vad_engine.create_session(), key
+        logger.info("VAD already initialized with the same config.")
+        return None
 
-    def init_agent(self, agent_config: AgentConfig, persona_prompt: str) -> None:
-        """Initialize or update the LLM engine based on agent configuration."""
+    def init_agent(
+        self,
+        agent_config: AgentConfig,
+        persona_prompt: str,
+        live2d_model: Live2dModel,
+    ) -> tuple[AgentInterface, str, str] | None:
+        """
+        Create the LLM agent of the agent configuration. Returns the agent,
+        its system prompt and the persona prompt it was built from, None if
+        this context's agent already matches.
+        """
         logger.info(f"Initializing Agent: {agent_config.conversation_agent_choice}")
 
         # Load persona prompt from DAOKO.MD if it exists, otherwise use the one from config
@@ -207,8 +410,6 @@ class ServiceContext:
             # Try to load from DAOKO.MD
             yaml_persona_prompt = load_persona()
             logger.info("Successfully loaded persona prompt from DAOKO.MD")
-            # Update the persona_prompt in the character config for consistency
-            self.character_config.persona_prompt = yaml_persona_prompt
             # Use the loaded prompt
             persona_prompt = yaml_persona_prompt
         except FileNotFoundError:
@@ -231,42 +432,43 @@ class ServiceContext:
             and persona_prompt == self.character_config.persona_prompt
         ):
             logger.debug("Agent already initialized with the same config.")
-            return
+            return None
 
-        system_prompt = self.construct_system_prompt(persona_prompt)
+        system_prompt = self.construct_system_prompt(persona_prompt, live2d_model)
 
         # Pass avatar to agent factory
         avatar = self.character_config.avatar or ""  # Get avatar from config
 
         try:
-            self.agent_engine = AgentFactory.create_agent(
+            agent_engine = AgentFactory.create_agent(
                 conversation_agent_choice=agent_config.conversation_agent_choice,
                 agent_settings=agent_config.agent_settings.model_dump(),
                 llm_configs=agent_config.llm_configs.model_dump(),
                 system_prompt=system_prompt,
-                live2d_model=self.live2d_model,
+                live2d_model=live2d_model,
                 tts_preprocessor_config=self.character_config.tts_preprocessor_config,
                 character_avatar=avatar,  # Add avatar parameter
             )
 
             logger.debug(f"Agent choice: {agent_config.conversation_agent_choice}")
             logger.debug(f"System prompt: {system_prompt}")
-
-            # Save the current configuration
-            self.character_config.agent_config = agent_config
-            self.character_config.persona_prompt = persona_prompt  # Update the persona_prompt in the config
-            self.system_prompt = system_prompt
+            return agent_engine, system_prompt, persona_prompt
 
         except Exception as e:
             logger.error(f"Failed to initialize agent: {e}")
             raise
 
-    def init_translate(self, translator_config: TranslatorConfig) -> None:
-        """Initialize or update the translation engine based on the configuration."""
+    def init_translate(
+        self, translator_config: TranslatorConfig
+    ) -> TranslateInterface | None:
+        """
+        Create the translation engine of the configuration, None if
+        translation is disabled or this context's engine already matches.
+        """
 
         if not translator_config.translate_audio:
             logger.debug("Translation is disabled.")
-            return
+            return None
 
         if (
             not self.translate_engine
@@ -276,26 +478,26 @@ class ServiceContext:
             logger.info(
                 f"Initializing Translator: {translator_config.translate_provider}"
             )
-            self.translate_engine = TranslateFactory.get_translator(
+            return TranslateFactory.get_translator(
                 translator_config.translate_provider,
                 getattr(
                     translator_config, translator_config.translate_provider
                 ).model_dump(),
             )
-            self.character_config.tts_preprocessor_config.translator_config = (
-                translator_config
-            )
-        else:
-            logger.info("Translation already initialized with the same config.")
+        logger.info("Translation already initialized with the same config.")
+        return None
 
     # ==== utils
 
-    def construct_system_prompt(self, persona_prompt: str) -> str:
+    def construct_system_prompt(
+        self, persona_prompt: str, live2d_model: Live2dModel
+    ) -> str:
         """
         Append tool prompts to persona prompt.
 
         Parameters:
         - persona_prompt (str): The persona prompt.
+        - live2d_model (Live2dModel): The model whose emotions to list.
 
         Returns:
         - str: The system prompt with all tool prompts appended.
@@ -310,7 +512,7 @@ class ServiceContext:
 
             if prompt_name == "live2d_expression_prompt":
                 prompt_content = prompt_content.replace(
-                    "[<insert_emomap_keys>]", self.live2d_model.emo_str
+                    "[<insert_emomap_keys>]", live2d_model.emo_str
                 )
 
             persona_prompt += prompt_content
@@ -320,6 +522,46 @@ class ServiceContext:
 
         return persona_prompt
 
+    def load_switch_config(self, config_file_name: str) -> Config | None:
+        """
+        Read the config a switch to `config_file_name` loads: conf.yaml, or
+        an alternative config merged onto this context's character config.
+
+        Parameters:
+        - config_file_name (str): The name of the configuration file.
+
+        Returns:
+        - Config | None: The validated config, None if the file has no
+          character config.
+        """
+        new_character_config_data = None
+
+        if config_file_name == "conf.yaml":
+            # Load base config
+            new_character_config_data = read_yaml("conf.yaml").get("character_config")
+        else:
+            # Load alternative config and merge with base config
+            characters_dir = self.system_config.config_alts_dir
+            file_path = os.path.normpath(os.path.join(characters_dir, config_file_name))
+            if not file_path.startswith(characters_dir):
+                raise ValueError("Invalid configuration file path")
+
+            alt_config_data = read_yaml(file_path).get("character_config")
+
+            # Start with original config data and perform a deep merge
+            new_character_config_data = deep_merge(
+                self.config.character_config.model_dump(), alt_config_data
+            )
+
+        if not new_character_config_data:
+            return None
+        return validate_config(
+            {
+                "system_config": self.system_config.model_dump(),
+                "character_config": new_character_config_data,
+            }
+        )
+
     async def handle_config_switch(
         self,
         websocket: WebSocket,
@@ -334,36 +576,22 @@ class ServiceContext:
         - config_file_name (str): The name of the configuration file.
         """
         try:
-            new_character_config_data = None
-
-            if config_file_name == "conf.yaml":
-                # Load base config
-                new_character_config_data = read_yaml("conf.yaml").get(
-                    "character_config"
-                )
-            else:
-                # Load alternative config and merge with base config
-                characters_dir = self.system_config.config_alts_dir
-                file_path = os.path.normpath(
-                    os.path.join(characters_dir, config_file_name)
+            new_config = self.load_switch_config(config_file_name)
+
+            if new_config:
+                warm = warm_pool.is_ready(config_file_name)
+                start = time.perf_counter()
+                # Load the engines off the event loop, so it (and the other
+                # sessions) stays responsive, then switch this context to them
+                # at once on the loop: a conversation in progress never sees
+                # a half-switched context or a released engine
+                engines = await asyncio.to_thread(self.load_engines, new_config)
+                self.apply_engines(new_config, engines)
+                logger.info(
+                    f"Loaded {config_file_name} in "
+                    f"{(time.perf_counter() - start) * 1000:.0f} ms"
+                    + (" (pre-warmed)" if warm else "")
                 )
-                if not file_path.startswith(characters_dir):
-                    raise ValueError("Invalid configuration file path")
-
-                alt_config_data = read_yaml(file_path).get("character_config")
-
-                # Start with original config data and perform a deep merge
-                new_character_config_data = deep_merge(
-                    self.config.character_config.model_dump(), alt_config_data
-                )
-
-            if new_character_config_data:
-                new_config = {
-                    "system_config": self.system_config.model_dump(),
-                    "character_config": new_character_config_data,
-                }
-                new_config = validate_config(new_config)
-                self.load_from_config(new_config)
                 logger.debug(f"New config: {self}")
                 logger.debug(
                     f"New character config: {self.character_config.model_dump()}"
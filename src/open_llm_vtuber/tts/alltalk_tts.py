@@ -7,10 +7,14 @@ that supports voice cloning and RVC voice conversion.
 
 import os
 import json
+import asyncio
+import httpx
 import requests
 from pathlib import Path
 from loguru import logger
-from .tts_interface import TTSInterface
+from .http_client import fetch_audio, get_http_client
+from .tts_interface import AudioChunk, TTSAudio, TTSInterface
+from ..utils.audio_stream import parse_wav_stream
 
 
 class TTSEngine(TTSInterface):
@@ -30,6 +34,7 @@ class TTSEngine(TTSInterface):
         rvc_model: str = "Disabled",
         rvc_pitch: int = 0,
         output_format: str = "wav",
+        streaming: bool = False,
     ):
         """
         Initialize the AllTalk TTS engine.
@@ -42,6 +47,8 @@ class TTSEngine(TTSInterface):
             rvc_model: The RVC model to use for voice conversion
             rvc_pitch: The pitch adjustment for RVC voice conversion
             output_format: The output audio format (wav, mp3, etc.)
+            streaming: Forward audio while it is being synthesized (the
+                streaming endpoint does not apply RVC)
         """
         self.api_url = api_url
         self.voice = voice
@@ -50,6 +57,7 @@ class TTSEngine(TTSInterface):
         self.rvc_model = rvc_model
         self.rvc_pitch = rvc_pitch
         self.file_extension = output_format
+        self.streaming = streaming
         self.new_audio_dir = "cache"
 
         # Create cache directory if it doesn't exist
@@ -172,3 +180,94 @@ class TTSEngine(TTSInterface):
         except Exception as e:
             logger.error(f"Error generating audio: {e}")
             return None
+
+    def _request_data(self, text, output_file_name):
+        """Form data of a /api/tts-generate request"""
+        data = {
+            "text_input": text,
+            "character_voice_gen": self.voice,
+            "language": self.language,
+            "output_file_name": output_file_name,
+            "output_file_timestamp": True,
+            "autoplay": False,
+        }
+        if self.rvc_enabled and self.rvc_model != "Disabled":
+            data["rvccharacter_voice_gen"] = self.rvc_model
+            data["rvccharacter_pitch"] = self.rvc_pitch
+        return data
+
+    async def _async_generate(self, text, output_file_name):
+        """
+        Generate speech with the shared HTTP client.
+
+        Args:
+            text: The text to speak
+            output_file_name: Name of the file on the AllTalk server
+
+        Returns:
+            bytes: The generated audio, or None if generation failed
+        """
+        data = self._request_data(text, output_file_name)
+        logger.debug(f"Sending TTS request with data: {data}")
+        try:
+            response = await get_http_client().post(
+                f"{self.api_url}/api/tts-generate", data=data
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"Request error: {e!r}")
+            return None
+        if response.status_code != 200:
+            logger.error(
+                f"Error: Failed to generate audio. Status code: {response.status_code}"
+            )
+            logger.error(f"Response: {response.text}")
+            return None
+
+        response_data = response.json()
+        if "output_file_url" not in response_data:
+            logger.error(f"Unexpected response format: {response_data}")
+            return None
+        return await fetch_audio(
+            "GET", f"{self.api_url}{response_data['output_file_url']}"
+        )
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        content = await self._async_generate(text, Path(file_name).stem)
+        if content is None:
+            return None
+        await asyncio.to_thread(Path(file_name).write_bytes, content)
+        return file_name
+
+    async def async_generate_audio_data(self, text):
+        content = await self._async_generate(text, self._unique_file_name())
+        if content is None:
+            return None
+        return TTSAudio.from_bytes(content, self.file_extension)
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.streaming
+
+    async def async_stream_audio(self, text):
+        """
+        Stream speech from AllTalk's /api/tts-generate-streaming endpoint.
+
+        Args:
+            text: The text to speak
+
+        Yields:
+            AudioChunk: The next chunk of the generated speech
+        """
+        params = {
+            "text": text,
+            "voice": self.voice,
+            "language": self.language,
+            "output_file": "stream_output.wav",
+        }
+        async with get_http_client().stream(
+            "GET", f"{self.api_url}/api/tts-generate-streaming", params=params
+        ) as response:
+            response.raise_for_status()
+            async for pcm, sample_rate in parse_wav_stream(response.aiter_bytes()):
+                yield AudioChunk(pcm=pcm, sample_rate=sample_rate)
@@ -5,7 +5,7 @@ import platform
 from bark import SAMPLE_RATE, generate_audio, preload_models
 from loguru import logger
 from scipy.io.wavfile import write as write_wav
-from .tts_interface import TTSInterface
+from .tts_interface import TTSAudio, TTSInterface
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -66,3 +66,15 @@ class TTSEngine(TTSInterface):
         )
 
         return file_name
+
+    def generate_audio_data(self, text):
+        """
+        Generate speech with Bark and return the samples in memory.
+        text: str
+            the text to speak
+
+        Returns:
+        TTSAudio: the generated samples
+        """
+        audio_array = generate_audio(text, history_prompt=self.voice)
+        return TTSAudio.from_samples(audio_array, SAMPLE_RATE)
@@ -3,7 +3,7 @@ from typing import Optional
 from TTS.api import TTS
 from loguru import logger
 import torch
-from .tts_interface import TTSInterface
+from .tts_interface import TTSAudio, TTSInterface
 
 
 class TTSEngine(TTSInterface):
@@ -93,6 +93,33 @@ class TTSEngine(TTSInterface):
         except Exception as e:
             raise RuntimeError(f"Failed to generate audio: {str(e)}")
 
+    def generate_audio_data(self, text: str) -> TTSAudio:
+        """
+        Generate speech with CoquiTTS and return the samples in memory.
+
+        Args:
+            text: Text to synthesize
+
+        Returns:
+            The generated samples
+        """
+        try:
+            if self.is_multi_speaker and self.speaker_wav:
+                samples = self.tts.tts(
+                    text=text,
+                    speaker_wav=self.speaker_wav,
+                    language=self.language,
+                )
+            else:
+                samples = self.tts.tts(text=text)
+
+            return TTSAudio.from_samples(
+                samples, self.tts.synthesizer.output_sample_rate
+            )
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate audio: {str(e)}")
+
     @staticmethod
     def list_available_models() -> list:
         """
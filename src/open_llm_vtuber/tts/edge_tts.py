@@ -3,7 +3,8 @@ import os
 
 import edge_tts
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import AudioChunk, TTSAudio, TTSInterface
+from ..utils.audio_stream import decode_with_ffmpeg
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -14,8 +15,12 @@ sys.path.append(current_dir)
 
 
 class TTSEngine(TTSInterface):
-    def __init__(self, voice="en-US-AvaMultilingualNeural"):
+    # edge-tts sends 24 kHz mono mp3
+    STREAM_SAMPLE_RATE = 24000
+
+    def __init__(self, voice="en-US-AvaMultilingualNeural", streaming=True):
         self.voice = voice
+        self.streaming = streaming
 
         self.temp_audio_file = "temp"
         self.file_extension = "mp3"
@@ -43,12 +48,61 @@ class TTSEngine(TTSInterface):
             communicate = edge_tts.Communicate(text, self.voice)
             communicate.save_sync(file_name)
         except Exception as e:
-            logger.critical(f"\nError: edge-tts unable to generate audio: {e}")
-            logger.critical("It's possible that edge-tts is blocked in your region.")
+            self._log_error(e)
             return None
 
         return file_name
 
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+
+        try:
+            await edge_tts.Communicate(text, self.voice).save(file_name)
+        except Exception as e:
+            self._log_error(e)
+            return None
+
+        return file_name
+
+    async def async_generate_audio_data(self, text):
+        """
+        Collect the mp3 of the sentence from the edge-tts websocket in memory,
+        on the event loop (no worker thread, nested loop or temp file).
+        """
+        try:
+            mp3 = b"".join([chunk async for chunk in self._mp3_chunks(text)])
+        except Exception as e:
+            self._log_error(e)
+            return None
+
+        return TTSAudio.from_bytes(mp3, self.file_extension)
+
+    async def _mp3_chunks(self, text):
+        """The mp3 frames of the sentence, as edge-tts sends them"""
+        communicate = edge_tts.Communicate(text, self.voice)
+        async for message in communicate.stream():
+            if message["type"] == "audio":
+                yield message["data"]
+
+    @staticmethod
+    def _log_error(e: Exception) -> None:
+        logger.critical(f"\nError: edge-tts unable to generate audio: {e}")
+        logger.critical("It's possible that edge-tts is blocked in your region.")
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.streaming
+
+    async def async_stream_audio(self, text):
+        """
+        Stream speech as it arrives from the edge-tts websocket, decoding the
+        mp3 to PCM with ffmpeg on the fly.
+        """
+        async for pcm in decode_with_ffmpeg(
+            self._mp3_chunks(text), "mp3", self.STREAM_SAMPLE_RATE
+        ):
+            yield AudioChunk(pcm=pcm, sample_rate=self.STREAM_SAMPLE_RATE)
+
 
 # en-US-AvaMultilingualNeural
 # en-US-EmmaMultilingualNeural
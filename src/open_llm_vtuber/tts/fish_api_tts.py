@@ -1,7 +1,8 @@
 from typing import Literal
 from fish_audio_sdk import Session, TTSRequest
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import AudioChunk, TTSAudio, TTSInterface
+from ..utils.audio_stream import iterate_in_thread
 
 
 class TTSEngine(TTSInterface):
@@ -10,6 +11,8 @@ class TTSEngine(TTSInterface):
     """
 
     file_extension: str = "wav"
+    # Sample rate of the API's raw "pcm" output format
+    PCM_SAMPLE_RATE = 44100
 
     def __init__(
         self,
@@ -17,6 +20,7 @@ class TTSEngine(TTSInterface):
         reference_id="7f92f8afb8ec43bf81429cc1c9199cb1",
         latency: Literal["normal", "balanced"] = "balanced",
         base_url="https://api.fish.audio",
+        streaming: bool = False,
     ):
         """
         Initialize the Fish TTS API.
@@ -31,6 +35,8 @@ class TTSEngine(TTSInterface):
 
             base_url (str): The base URL for the Fish TTS API.
 
+            streaming (bool): Forward audio while it is being synthesized.
+
         """
 
         logger.info(
@@ -40,6 +46,7 @@ class TTSEngine(TTSInterface):
         self.reference_id = reference_id
         self.latency = latency
         self.session = Session(apikey=api_key, base_url=base_url)
+        self.streaming = streaming
 
     def generate_audio(self, text, file_name_no_ext=None):
         file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
@@ -58,3 +65,41 @@ class TTSEngine(TTSInterface):
             return None
 
         return file_name
+
+    def generate_audio_data(self, text):
+        try:
+            data = b"".join(
+                self.session.tts(
+                    TTSRequest(
+                        text=text, reference_id=self.reference_id, latency=self.latency
+                    )
+                )
+            )
+        except Exception as e:
+            logger.critical(f"\nError: Fish TTS API fail to generate audio: {e}")
+            return None
+
+        # The API returns the format of the request (mp3 by default), let the
+        # decoder probe it
+        return TTSAudio.from_bytes(data)
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.streaming
+
+    async def async_stream_audio(self, text):
+        """Stream raw PCM from the API as it is synthesized."""
+        request = TTSRequest(
+            text=text,
+            reference_id=self.reference_id,
+            latency=self.latency,
+            format="pcm",
+        )
+        remainder = b""
+        async for data in iterate_in_thread(self.session.tts(request)):
+            data = remainder + data
+            # Keep whole int16 samples only
+            cut = len(data) - len(data) % 2
+            remainder = data[cut:]
+            if cut:
+                yield AudioChunk(pcm=data[:cut], sample_rate=self.PCM_SAMPLE_RATE)
@@ -2,10 +2,13 @@
 # change from xTTS.py
 ####
 
+import asyncio
+from pathlib import Path
 import re
 import requests
 from loguru import logger
-from .tts_interface import TTSInterface
+from .http_client import fetch_audio
+from .tts_interface import TTSAudio, TTSInterface
 
 
 class TTSEngine(TTSInterface):
@@ -62,3 +65,58 @@ class TTSEngine(TTSInterface):
                 f"Error: Failed to generate audio. Status code: {response.status_code}"
             )
             return None
+
+    def generate_audio_data(self, text):
+        cleaned_text = re.sub(r"\[.*?\]", "", text)
+        data = {
+            "text": cleaned_text,
+            "text_lang": self.text_lang,
+            "ref_audio_path": self.ref_audio_path,
+            "prompt_lang": self.prompt_lang,
+            "prompt_text": self.prompt_text,
+            "text_split_method": self.text_split_method,
+            "batch_size": self.batch_size,
+            "media_type": self.media_type,
+            "streaming_mode": self.streaming_mode,
+        }
+
+        response = requests.get(self.api_url, params=data, timeout=120)
+
+        if response.status_code == 200:
+            return TTSAudio.from_bytes(response.content, self.media_type)
+        else:
+            logger.critical(
+                f"Error: Failed to generate audio. Status code: {response.status_code}"
+            )
+            return None
+
+    def _request_params(self, text):
+        return {
+            "text": re.sub(r"\[.*?\]", "", text),
+            "text_lang": self.text_lang,
+            "ref_audio_path": self.ref_audio_path,
+            "prompt_lang": self.prompt_lang,
+            "prompt_text": self.prompt_text,
+            "text_split_method": self.text_split_method,
+            "batch_size": self.batch_size,
+            "media_type": self.media_type,
+            "streaming_mode": self.streaming_mode,
+        }
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+        content = await fetch_audio(
+            "GET", self.api_url, params=self._request_params(text)
+        )
+        if content is None:
+            return None
+        await asyncio.to_thread(Path(file_name).write_bytes, content)
+        return file_name
+
+    async def async_generate_audio_data(self, text):
+        content = await fetch_audio(
+            "GET", self.api_url, params=self._request_params(text)
+        )
+        if content is None:
+            return None
+        return TTSAudio.from_bytes(content, self.media_type)
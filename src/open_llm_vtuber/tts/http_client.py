@@ -0,0 +1,109 @@
+"""
+Shared async HTTP client of the HTTP-based TTS engines.
+
+Engines that talk to a TTS server (XTTS, GPT-SoVITS, AllTalk) send every
+sentence through one keep-alive, connection-pooled `httpx.AsyncClient`
+instead of a blocking request per sentence on a worker thread, so a reply
+reuses warm connections and waiting on the server costs no thread.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class HTTPClientSettings:
+    """Connection pool and timeouts of the shared client."""
+
+    max_connections: int = 16
+    max_keepalive_connections: int = 8
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 120.0
+
+
+_settings = HTTPClientSettings()
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def configure_http_client(settings: HTTPClientSettings) -> None:
+    """Set the pool size and timeouts; the next request uses a new client."""
+    global _settings, _client, _client_loop
+    if settings == _settings:
+        return
+    _settings = settings
+    if _client is not None:
+        old_client, _client, _client_loop = _client, None, None
+        try:
+            asyncio.get_running_loop().create_task(old_client.aclose())
+        except RuntimeError:
+            # No running loop; its connections are closed when collected
+            pass
+    logger.info(
+        f"TTS HTTP client: {settings.max_connections} connections "
+        f"({settings.max_keepalive_connections} kept alive), "
+        f"{settings.read_timeout:g} s read timeout"
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared client (created on first use in the running event loop)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    # Pooled connections belong to the loop they were opened in
+    if _client is None or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=_settings.max_connections,
+                max_keepalive_connections=_settings.max_keepalive_connections,
+                keepalive_expiry=_settings.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                _settings.read_timeout, connect=_settings.connect_timeout
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections (on shutdown)."""
+    global _client, _client_loop
+    if _client is not None:
+        client, _client, _client_loop = _client, None, None
+        await client.aclose()
+
+
+async def fetch_audio(method: str, url: str, **kwargs) -> Optional[bytes]:
+    """
+    Request audio with the shared client, reading the body as it streams in.
+
+    Args:
+        method: HTTP method.
+        url: URL of the endpoint.
+        **kwargs: Passed to `httpx.AsyncClient.stream` (params, json, data).
+
+    Returns:
+        bytes | None: The response body, or None if the request failed.
+    """
+    try:
+        async with get_http_client().stream(method, url, **kwargs) as response:
+            if response.status_code != 200:
+                await response.aread()
+                logger.critical(
+                    f"Error: Failed to generate audio. Status code: "
+                    f"{response.status_code} ({response.text[:200]})"
+                )
+                return None
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+            return bytes(body)
+    except httpx.HTTPError as e:
+        logger.critical(f"Error: Failed to generate audio: {e!r}")
+        return None
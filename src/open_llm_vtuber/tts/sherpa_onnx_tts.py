@@ -4,7 +4,7 @@ import os
 import sherpa_onnx
 import soundfile as sf
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSAudio, TTSInterface
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -110,3 +110,28 @@ class TTSEngine(TTSInterface):
         except Exception as e:
             logger.critical(f"\nError: sherpa-onnx unable to generate audio: {e}")
             return None
+
+    def generate_audio_data(self, text):
+        """
+        Generate speech with sherpa-onnx and return the samples in memory.
+
+        Parameters:
+            text (str): The text to speak.
+
+        Returns:
+            TTSAudio: The generated samples, or None on failure.
+        """
+        try:
+            audio = self.tts.generate(text, sid=self.sid, speed=self.speed)
+
+            if len(audio.samples) == 0:
+                logger.error(
+                    "Error in generating audios. Please read previous error messages."
+                )
+                return None
+
+            return TTSAudio.from_samples(audio.samples, audio.sample_rate)
+
+        except Exception as e:
+            logger.critical(f"\nError: sherpa-onnx unable to generate audio: {e}")
+            return None
@@ -0,0 +1,300 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+from ..utils.stream_audio import decode_tts_audio, pcm_to_wav
+from .tts_interface import AudioChunk, TTSAudio, TTSInterface
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache lookups (unicode form and whitespace)."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def audio_size(audio: TTSAudio) -> int:
+    """Approximate memory footprint of the audio in bytes."""
+    if audio.samples is not None:
+        return audio.samples.nbytes
+    return len(audio.data or b"")
+
+
+class CachedTTS(TTSInterface):
+    """
+    Content-addressed cache in front of a TTS engine.
+
+    Audio is keyed by a hash of the normalized text and of the engine's name
+    and configuration, so a config change that alters the voice (speaker,
+    speed, model, ...) misses instead of returning the old voice. Results are
+    kept in a memory tier and an on-disk tier, each bounded in size and
+    evicted least-recently-used first. Disk entries are named by their key and
+    survive restarts. Each engine configuration keeps them in its own
+    subdirectory of `cache_dir` with its own size bound, so engines cached at
+    the same time never index or evict each other's files. Subdirectories of
+    configurations that are no longer used are left in place.
+
+    Only the in-memory paths (`generate_audio_data`, `async_stream_audio`)
+    are cached; `generate_audio` still returns a fresh file from the engine.
+    """
+
+    def __init__(
+        self,
+        engine: TTSInterface,
+        engine_name: str,
+        engine_config: dict,
+        memory_max_mb: float = 32,
+        disk_max_mb: float = 256,
+        cache_dir: str = "tts_cache",
+    ):
+        """
+        Args:
+            engine: The TTS engine to cache.
+            engine_name: Name of the engine, part of the cache key.
+            engine_config: The engine's configuration, part of the cache key.
+            memory_max_mb: Size of the memory tier. 0 disables it.
+            disk_max_mb: Size of the disk tier. 0 disables it.
+            cache_dir: Parent directory of the disk tier. Must not be inside
+                cache/, which is cleared on shutdown.
+        """
+        self.engine = engine
+        self.memory_max_bytes = int(memory_max_mb * 1024 * 1024)
+        self.disk_max_bytes = int(disk_max_mb * 1024 * 1024)
+        self._engine_key = hashlib.sha256(
+            json.dumps(
+                {"engine": engine_name, "config": engine_config},
+                sort_keys=True,
+                default=str,
+            ).encode("utf-8")
+        ).hexdigest()
+        self.cache_dir = os.path.join(cache_dir, self._engine_key[:16])
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, TTSAudio] = OrderedDict()
+        self._memory_bytes = 0
+        # key -> (path, size), least recently used first
+        self._disk: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_max_bytes > 0:
+            self._load_disk_index()
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.engine.supports_streaming
+
+    def stats(self) -> dict:
+        """Hit/miss counters and tier sizes"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (
+                (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+            ),
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def cache_key(self, text: str) -> str:
+        """The key of the audio of `text` with this engine and configuration."""
+        return hashlib.sha256(
+            f"{self._engine_key}\0{normalize_text(text)}".encode()
+        ).hexdigest()
+
+    def contains(self, text: str) -> bool:
+        """Whether the audio of `text` is cached (without counting a lookup)."""
+        key = self.cache_key(text)
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def get(self, text: str) -> Optional[TTSAudio]:
+        """Look `text` up in the memory tier, then the disk tier."""
+        key = self.cache_key(text)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                logger.debug(f"TTS cache hit (memory): {text!r}")
+                return audio
+            entry = self._disk.get(key)
+
+        if entry is not None:
+            audio = self._read_disk_entry(key, entry[0])
+            if audio is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._put_memory(key, audio)
+                logger.debug(f"TTS cache hit (disk): {text!r}")
+                return audio
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, text: str, audio: TTSAudio) -> None:
+        """Store the audio of `text` in both tiers."""
+        key = self.cache_key(text)
+        with self._lock:
+            self._put_memory(key, audio)
+        if self.disk_max_bytes > 0:
+            self._write_disk_entry(key, audio)
+
+    def generate_audio(self, text, file_name_no_ext=None):
+        return self.engine.generate_audio(text, file_name_no_ext)
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        return await self.engine.async_generate_audio(text, file_name_no_ext)
+
+    def generate_audio_data(self, text):
+        audio = self.get(text)
+        if audio is None:
+            audio = self.engine.generate_audio_data(text)
+            if audio is not None:
+                self.put(text, audio)
+        return audio
+
+    async def async_generate_audio_data(self, text):
+        audio = await asyncio.to_thread(self.get, text)
+        if audio is None:
+            audio = await self.engine.async_generate_audio_data(text)
+            if audio is not None:
+                await asyncio.to_thread(self.put, text, audio)
+        return audio
+
+    async def async_stream_audio(self, text):
+        """
+        Replay cached audio as a single chunk, or stream from the engine and
+        cache the sentence once it has been streamed completely.
+        """
+        audio = await asyncio.to_thread(self.get, text)
+        if audio is not None:
+            _, pcm, sample_rate = await asyncio.to_thread(decode_tts_audio, audio)
+            yield AudioChunk(pcm=pcm, sample_rate=sample_rate)
+            return
+
+        pieces = []
+        sample_rates = set()
+        async for chunk in self.engine.async_stream_audio(text):
+            pieces.append(chunk.pcm)
+            sample_rates.add(chunk.sample_rate)
+            yield chunk
+
+        # Only reached if the consumer took the whole stream
+        if pieces and len(sample_rates) == 1:
+            samples = np.frombuffer(b"".join(pieces), dtype="<i2")
+            await asyncio.to_thread(
+                self.put, text, TTSAudio.from_samples(samples, sample_rates.pop())
+            )
+
+    def _put_memory(self, key: str, audio: TTSAudio) -> None:
+        # Called with the lock held
+        size = audio_size(audio)
+        if size > self.memory_max_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= audio_size(self._memory.pop(key))
+        self._memory[key] = audio
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= audio_size(evicted)
+            self.evictions += 1
+
+    def _load_disk_index(self) -> None:
+        """Index the disk tier, oldest (least recently used) first."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file() or entry.name.endswith(".tmp"):
+                continue
+            key = entry.name.split(".", 1)[0]
+            stat = entry.stat()
+            entries.append((stat.st_mtime, key, entry.path, stat.st_size))
+        for _, key, path, size in sorted(entries):
+            self._disk[key] = (path, size)
+            self._disk_bytes += size
+        self._evict_disk()
+        if self._disk:
+            logger.info(
+                f"TTS cache: {len(self._disk)} entries "
+                f"({self._disk_bytes / 1024 / 1024:.1f} MB) in {self.cache_dir}"
+            )
+
+    def _read_disk_entry(self, key: str, path: str) -> Optional[TTSAudio]:
+        try:
+            audio = TTSAudio.from_file(path)
+            # Keep the LRU order across restarts
+            os.utime(path)
+        except OSError as e:
+            logger.warning(f"TTS cache: dropping unreadable entry {path}: {e}")
+            with self._lock:
+                self._drop_disk_entry(key)
+            return None
+        if audio.format == "bin":
+            audio.format = None
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+        return audio
+
+    def _write_disk_entry(self, key: str, audio: TTSAudio) -> None:
+        if audio.samples is not None:
+            samples = audio.samples
+            if samples.dtype != np.int16:
+                samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+            data, extension = pcm_to_wav(samples.tobytes(), audio.sample_rate), "wav"
+        else:
+            data, extension = audio.data, audio.format or "bin"
+        if len(data) > self.disk_max_bytes:
+            return
+
+        path = os.path.join(self.cache_dir, f"{key}.{extension}")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            logger.warning(f"TTS cache: failed to write {path}: {e}")
+            return
+
+        with self._lock:
+            if key in self._disk:
+                self._disk_bytes -= self._disk.pop(key)[1]
+            self._disk[key] = (path, len(data))
+            self._disk_bytes += len(data)
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        # Called with the lock held (or during __init__)
+        while self._disk_bytes > self.disk_max_bytes and self._disk:
+            key = next(iter(self._disk))
+            self._drop_disk_entry(key)
+            self.evictions += 1
+
+    def _drop_disk_entry(self, key: str) -> None:
+        path, size = self._disk.pop(key, (None, 0))
+        self._disk_bytes -= size
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
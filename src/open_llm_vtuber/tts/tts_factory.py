@@ -22,7 +22,7 @@ class TTSFactory:
         elif engine_type == "edge_tts":
             from .edge_tts import TTSEngine as EdgeTTSEngine
 
-            return EdgeTTSEngine(kwargs.get("voice"))
+            return EdgeTTSEngine(kwargs.get("voice"), kwargs.get("streaming", True))
         elif engine_type == "pyttsx3_tts":
             from .pyttsx3_tts import TTSEngine as Pyttsx3TTSEngine
 
@@ -73,6 +73,7 @@ class TTSFactory:
                 api_url=kwargs.get("api_url"),
                 speaker_wav=kwargs.get("speaker_wav"),
                 language=kwargs.get("language"),
+                streaming=kwargs.get("streaming", False),
             )
         elif engine_type == "gpt_sovits_tts":
             from .gpt_sovits_tts import TTSEngine as GSVEngine
@@ -107,6 +108,7 @@ class TTSFactory:
                 reference_id=kwargs.get("reference_id"),
                 latency=kwargs.get("latency"),
                 base_url=kwargs.get("base_url"),
+                streaming=kwargs.get("streaming", False),
             )
         elif engine_type == "sherpa_onnx_tts":
             from .sherpa_onnx_tts import TTSEngine as SherpaOnnxTTSEngine
@@ -123,6 +125,7 @@ class TTSFactory:
                 rvc_model=kwargs.get("rvc_model"),
                 rvc_pitch=kwargs.get("rvc_pitch"),
                 output_format=kwargs.get("output_format"),
+                streaming=kwargs.get("streaming", False),
             )
         else:
             raise ValueError(f"Unknown TTS engine type: {engine_type}")
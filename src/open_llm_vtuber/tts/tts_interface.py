@@ -1,11 +1,139 @@
 import abc
 import os
 import asyncio
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Optional
 
+import numpy as np
 from loguru import logger
 
 
+@dataclass
+class AudioChunk:
+    """A piece of synthesized speech as int16 mono PCM."""
+
+    pcm: bytes
+    sample_rate: int
+
+
+@dataclass
+class TTSAudio:
+    """
+    Synthesized speech kept in memory.
+
+    Holds either decoded `samples` (mono, int16 or float in [-1, 1]) with
+    their `sample_rate`, or the `data` of an encoded file (wav, mp3, ...) with
+    its `format`. A `format` of None means "let the decoder probe it".
+    """
+
+    samples: Optional[np.ndarray] = None
+    sample_rate: Optional[int] = None
+    data: Optional[bytes] = None
+    format: Optional[str] = None
+
+    @classmethod
+    def from_samples(cls, samples, sample_rate: int) -> "TTSAudio":
+        return cls(samples=np.asarray(samples).reshape(-1), sample_rate=sample_rate)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, format: Optional[str] = None) -> "TTSAudio":
+        return cls(data=data, format=format)
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "TTSAudio":
+        """Read a generated audio file into memory."""
+        with open(file_path, "rb") as f:
+            data = f.read()
+        extension = os.path.splitext(file_path)[1].lstrip(".").lower()
+        return cls(data=data, format=extension or None)
+
+
 class TTSInterface(metaclass=abc.ABCMeta):
+    @property
+    def supports_streaming(self) -> bool:
+        """
+        Whether `async_stream_audio` yields audio while the sentence is still
+        being synthesized. Engines that implement streaming usually make it
+        configurable and return their setting here.
+        """
+        return False
+
+    async def async_stream_audio(self, text: str) -> AsyncIterator[AudioChunk]:
+        """
+        Synthesize speech and yield it in PCM chunks, in order, as soon as
+        each one is available.
+
+        By default, this generates the whole sentence with
+        `async_generate_audio_data` and yields it as a single chunk. Engines
+        that receive audio incrementally override this (and
+        `supports_streaming`).
+
+        text: str
+            the text to speak
+
+        Yields:
+        AudioChunk: the next int16 mono PCM chunk of the sentence
+        """
+        from ..utils.stream_audio import decode_tts_audio
+
+        audio = await self.async_generate_audio_data(text)
+        if audio is None:
+            raise RuntimeError("TTS engine did not generate audio")
+        _, pcm, sample_rate = await asyncio.to_thread(decode_tts_audio, audio)
+        yield AudioChunk(pcm=pcm, sample_rate=sample_rate)
+
+    def generate_audio_data(self, text: str) -> Optional[TTSAudio]:
+        """
+        Generate speech and return it in memory instead of as a file.
+
+        By default, this falls back to `generate_audio`, reads the file into
+        memory and removes it. Engines that get the audio as samples or bytes
+        override this to skip the cache/ directory.
+
+        text: str
+            the text to speak
+
+        Returns:
+        TTSAudio | None: the generated speech, or None if generation failed
+        """
+        return self._read_generated_file(
+            self.generate_audio(text, self._unique_file_name())
+        )
+
+    async def async_generate_audio_data(self, text: str) -> Optional[TTSAudio]:
+        """
+        Asynchronously generate speech and return it in memory.
+
+        Runs `generate_audio_data` in a thread if the engine overrides it.
+        Otherwise it falls back to `async_generate_audio` (which may be
+        natively async) and reads the file.
+
+        text: str
+            the text to speak
+
+        Returns:
+        TTSAudio | None: the generated speech, or None if generation failed
+        """
+        if type(self).generate_audio_data is not TTSInterface.generate_audio_data:
+            return await asyncio.to_thread(self.generate_audio_data, text)
+        file_path = await self.async_generate_audio(text, self._unique_file_name())
+        return await asyncio.to_thread(self._read_generated_file, file_path)
+
+    @staticmethod
+    def _unique_file_name() -> str:
+        # Sentences are synthesized concurrently, so each needs its own file
+        return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
+
+    def _read_generated_file(self, file_path: Optional[str]) -> Optional[TTSAudio]:
+        if not file_path:
+            return None
+        try:
+            return TTSAudio.from_file(file_path)
+        finally:
+            self.remove_file(file_path, verbose=False)
+
     async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
         """
         Asynchronously generate speech audio file using TTS.
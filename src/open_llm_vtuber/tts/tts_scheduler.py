@@ -0,0 +1,125 @@
+import asyncio
+import heapq
+import itertools
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from loguru import logger
+
+from .tts_interface import TTSInterface
+
+
+class TTSScheduler:
+    """
+    Limits how many sentences one TTS engine synthesizes at the same time.
+
+    Sentences waiting for a slot are served by priority, lowest first. The
+    TTS task manager uses the sentence's sequence number within its reply as
+    the priority, so the first sentence of every reply is synthesized before
+    the twentieth sentence of a long one, and time-to-first-audio does not
+    grow with the length of the reply. Ties go to the sentence that has
+    waited longest.
+
+    The scheduler also carries the backpressure limit of each conversation
+    (`max_pending_sentences`): how many sentences a reply may have queued or
+    in synthesis before the sentence producer has to wait.
+    """
+
+    def __init__(self, max_concurrency: int = 2, max_pending_sentences: int = 8):
+        """
+        Args:
+            max_concurrency: Maximum number of sentences synthesized at once.
+            max_pending_sentences: Maximum number of unfinished sentences per
+                conversation before `TTSTaskManager.speak` blocks.
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_pending_sentences = max(1, max_pending_sentences)
+        self.active = 0
+        # (priority, arrival order, future) of the sentences waiting for a slot
+        self._waiting: list[tuple[int, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+
+        self.completed = 0
+        self.max_queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiting if not future.done())
+
+    def stats(self) -> dict:
+        """Queue depth, active syntheses and wait-time metrics"""
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "avg_wait_ms": (
+                self.total_wait / self.completed * 1000 if self.completed else 0.0
+            ),
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold a synthesis slot, waiting for one by `priority` if needed."""
+        start = time.perf_counter()
+        await self._acquire(priority)
+        waited = time.perf_counter() - start
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        try:
+            yield
+        finally:
+            self.completed += 1
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        if self.active < self.max_concurrency and not self.queued:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._arrivals), future))
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            # The slot is handed over by _release, already counted as active
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Cancelled right after being granted a slot: pass it on
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        while self._waiting:
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+_schedulers: "weakref.WeakKeyDictionary[TTSInterface, TTSScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_scheduler(engine: TTSInterface) -> TTSScheduler:
+    """The scheduler of a TTS engine, shared by every conversation using it."""
+    scheduler = _schedulers.get(engine)
+    if scheduler is None:
+        scheduler = _schedulers[engine] = TTSScheduler()
+    return scheduler
+
+
+def set_scheduler(engine: TTSInterface, scheduler: TTSScheduler) -> None:
+    """Set the scheduler of a TTS engine (when the engine is created)."""
+    _schedulers[engine] = scheduler
+    logger.info(
+        f"TTS scheduler: {scheduler.max_concurrency} concurrent sentences, "
+        f"{scheduler.max_pending_sentences} pending per conversation"
+    )
@@ -1,6 +1,11 @@
+import asyncio
+from pathlib import Path
+
 import requests
 from loguru import logger
-from .tts_interface import TTSInterface
+from .http_client import fetch_audio, get_http_client
+from .tts_interface import AudioChunk, TTSAudio, TTSInterface
+from ..utils.audio_stream import parse_wav_stream
 
 
 class TTSEngine(TTSInterface):
@@ -9,8 +14,12 @@ class TTSEngine(TTSInterface):
         api_url: str = "http://127.0.0.1:8020/tts_to_audio",
         speaker_wav: str = "female",
         language: str = "en",
+        streaming: bool = False,
     ):
         self.api_url = api_url
+        # The streaming endpoint sits next to /tts_to_audio
+        self.stream_url = api_url.rsplit("/", 1)[0] + "/tts_stream"
+        self.streaming = streaming
         self.speaker_wav = speaker_wav
         self.language = language
         self.new_audio_dir = "cache"
@@ -41,3 +50,58 @@ class TTSEngine(TTSInterface):
                 f"Error: Failed to generate audio. Status code: {response.status_code}"
             )
             return None
+
+    def generate_audio_data(self, text):
+        data = {
+            "text": text,
+            "speaker_wav": self.speaker_wav,
+            "language": self.language,
+        }
+
+        response = requests.post(self.api_url, json=data, timeout=120)
+
+        if response.status_code == 200:
+            return TTSAudio.from_bytes(response.content, self.file_extension)
+        else:
+            logger.critical(
+                f"Error: Failed to generate audio. Status code: {response.status_code}"
+            )
+            return None
+
+    def _request_data(self, text):
+        return {
+            "text": text,
+            "speaker_wav": self.speaker_wav,
+            "language": self.language,
+        }
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        content = await fetch_audio("POST", self.api_url, json=self._request_data(text))
+        if content is None:
+            return None
+        await asyncio.to_thread(Path(file_name).write_bytes, content)
+        return file_name
+
+    async def async_generate_audio_data(self, text):
+        content = await fetch_audio("POST", self.api_url, json=self._request_data(text))
+        if content is None:
+            return None
+        return TTSAudio.from_bytes(content, self.file_extension)
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.streaming
+
+    async def async_stream_audio(self, text):
+        """
+        Stream speech from the server's /tts_stream endpoint (xtts-api-server
+        started with --streaming-mode).
+        """
+        params = self._request_data(text)
+        async with get_http_client().stream(
+            "GET", self.stream_url, params=params
+        ) as response:
+            response.raise_for_status()
+            async for pcm, sample_rate in parse_wav_stream(response.aiter_bytes()):
+                yield AudioChunk(pcm=pcm, sample_rate=sample_rate)
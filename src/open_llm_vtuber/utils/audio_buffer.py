@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class AudioBuffer:
+    """
+    Growable float32 buffer for the audio of one utterance.
+
+    Appends are amortized O(1): the backing array doubles its capacity when
+    full instead of being copied on every chunk like `np.append`.
+
+    `take()` returns an owned copy of the buffered samples and starts a new
+    utterance in the same backing array. The copy is made once per
+    utterance, and the ASR engine may still hold it after the next
+    utterance has started recording (queued in the ASR pool, inside a batch
+    window, or in a cancelled speculation that is still running).
+    """
+
+    def __init__(self, initial_capacity: int = 16000 * 4) -> None:
+        """
+        Args:
+            initial_capacity: Initial number of samples of the backing array.
+        """
+        self._data = np.empty(initial_capacity, dtype=np.float32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Number of samples the backing array can hold without growing"""
+        return len(self._data)
+
+    def append(self, samples: np.ndarray) -> None:
+        """
+        Append samples to the buffer.
+
+        Args:
+            samples: Mono audio samples. Converted to float32 if needed.
+        """
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        count = len(samples)
+        if not count:
+            return
+
+        end = self._size + count
+        if end > len(self._data):
+            grown = np.empty(max(end, 2 * len(self._data)), dtype=np.float32)
+            grown[: self._size] = self._data[: self._size]
+            self._data = grown
+
+        self._data[self._size : end] = samples
+        self._size = end
+
+    def view(self) -> np.ndarray:
+        """
+        Return a zero-copy view of the buffered samples. It is overwritten by
+        appends after the next `take()` or `clear()`.
+        """
+        return self._data[: self._size]
+
+    def take(self) -> np.ndarray:
+        """
+        Return a copy of the buffered samples and start a new, empty
+        utterance.
+        """
+        samples = self.view().copy()
+        self._size = 0
+        return samples
+
+    def clear(self) -> None:
+        """Drop the buffered samples without releasing memory."""
+        self._size = 0
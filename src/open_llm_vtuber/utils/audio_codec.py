@@ -0,0 +1,154 @@
+"""
+Compressed encoding of outbound speech.
+
+Audio payloads carry WAV files by default. For remote viewers on limited
+bandwidth the WAV can be re-encoded (e.g. to Opus) before it is sent; the
+encoding runs on a small dedicated thread pool so it never blocks the event
+loop or competes with TTS for the default executor.
+"""
+
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from loguru import logger
+
+# codec name -> (ffmpeg container, ffmpeg encoder, MIME type for the frontend)
+CODECS = {
+    "wav": ("wav", None, "audio/wav"),
+    "opus": ("ogg", "libopus", "audio/ogg; codecs=opus"),
+    "mp3": ("mp3", "libmp3lame", "audio/mpeg"),
+}
+
+
+@dataclass(frozen=True)
+class AudioEncoding:
+    """The codec and bitrate audio is sent to one client with."""
+
+    codec: str = "wav"
+    bitrate_kbps: int = 32
+
+    @property
+    def mime_type(self) -> str:
+        return CODECS[self.codec][2]
+
+    @property
+    def compressed(self) -> bool:
+        return self.codec != "wav"
+
+
+def encode_wav(wav: bytes, encoding: AudioEncoding) -> bytes:
+    """Encode a WAV file with the codec and bitrate of `encoding` (blocking)."""
+    # Imported here: only clients with compressed audio need pydub
+    from pydub import AudioSegment
+
+    container, encoder, _ = CODECS[encoding.codec]
+    segment = AudioSegment.from_wav(io.BytesIO(wav))
+    parameters = []
+    if encoding.codec == "opus":
+        # Tuned for speech, keeps quality at low bitrates
+        parameters = ["-application", "voip"]
+    return segment.export(
+        format=container,
+        codec=encoder,
+        bitrate=f"{encoding.bitrate_kbps}k",
+        parameters=parameters,
+    ).read()
+
+
+class AudioEncoder:
+    """
+    Encodes outbound WAV audio on a dedicated, bounded thread pool and keeps
+    track of encode latency and the bytes saved.
+
+    If encoding fails (e.g. ffmpeg or the encoder is missing) the WAV is sent
+    as-is, so a misconfigured codec degrades to the uncompressed path.
+    """
+
+    def __init__(self, workers: int = 2) -> None:
+        self.workers = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.encoded = 0
+        self.failed = 0
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.total_encode_time = 0.0
+
+    def configure(self, workers: int) -> None:
+        """Set the number of encoder threads (before the first encode)."""
+        if self._executor is not None and workers != self.workers:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.workers = max(1, workers)
+
+    def stats(self) -> dict:
+        """Encode counts, latency and bytes saved"""
+        return {
+            "encoded": self.encoded,
+            "failed": self.failed,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "saved_bytes": self.input_bytes - self.output_bytes,
+            "compression_ratio": (
+                self.input_bytes / self.output_bytes if self.output_bytes else 0.0
+            ),
+            "avg_encode_ms": (
+                self.total_encode_time / self.encoded * 1000 if self.encoded else 0.0
+            ),
+        }
+
+    async def encode(
+        self, wav: bytes, encoding: AudioEncoding
+    ) -> tuple[bytes, AudioEncoding]:
+        """
+        Encode a WAV file for a client.
+
+        Returns:
+            tuple: (the audio, the encoding it actually has), which is WAV if
+                no compression was requested or encoding failed
+        """
+        if not encoding.compressed:
+            return wav, encoding
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="audio-encode"
+            )
+        start = time.perf_counter()
+        try:
+            data = await asyncio.get_running_loop().run_in_executor(
+                self._executor, encode_wav, wav, encoding
+            )
+        except Exception as e:
+            self.failed += 1
+            if self.failed == 1:
+                logger.warning(
+                    f"Failed to encode audio as {encoding.codec}, sending WAV: {e}"
+                )
+            return wav, AudioEncoding()
+
+        elapsed = time.perf_counter() - start
+        self.encoded += 1
+        self.input_bytes += len(wav)
+        self.output_bytes += len(data)
+        self.total_encode_time += elapsed
+        logger.debug(
+            f"Encoded {len(wav) / 1024:.0f} KB WAV to {len(data) / 1024:.1f} KB "
+            f"{encoding.codec} at {encoding.bitrate_kbps} kbps in "
+            f"{elapsed * 1000:.0f} ms (saved {(len(wav) - len(data)) / 1024:.0f} KB)"
+        )
+        if self.encoded % 100 == 0:
+            stats = self.stats()
+            logger.info(
+                f"Audio encoder: {stats['encoded']} payloads, "
+                f"{stats['compression_ratio']:.1f}x smaller "
+                f"({stats['saved_bytes'] / 1024 / 1024:.1f} MB saved), "
+                f"{stats['avg_encode_ms']:.0f} ms average encode"
+            )
+        return data, encoding
+
+
+audio_encoder = AudioEncoder()
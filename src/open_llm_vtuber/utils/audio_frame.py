@@ -0,0 +1,118 @@
+"""
+Binary WebSocket frames for microphone audio on `/client-ws`.
+
+Instead of sending `{"type": "raw-audio-data", "audio": [0.01, ...]}` as JSON,
+a client can send a binary frame made of a 12-byte little-endian header
+followed by mono int16 PCM samples:
+
+    offset  size  field
+    0       1     kind         1 = mic-audio-data, 2 = raw-audio-data
+    1       1     version      currently 1
+    2       2     reserved     must be 0
+    4       4     sample_rate  sample rate of the payload in Hz
+    8       4     sequence     per-connection frame counter (wraps at 2**32)
+    12      ...   payload      int16 little-endian PCM samples
+
+The payload is decoded with `np.frombuffer`, so no per-sample parsing or
+copying happens before the audio reaches the VAD.
+"""
+
+import struct
+from dataclasses import dataclass
+from enum import IntEnum
+
+import numpy as np
+
+AUDIO_FRAME_VERSION = 1
+_HEADER = struct.Struct("<BBHII")
+AUDIO_FRAME_HEADER_SIZE = _HEADER.size
+SEQUENCE_MODULO = 1 << 32
+
+
+class AudioFrameKind(IntEnum):
+    """What the server should do with the samples of a frame"""
+
+    MIC_AUDIO_DATA = 1  # append to the utterance buffer (client-side VAD)
+    RAW_AUDIO_DATA = 2  # run through the server-side VAD
+
+
+@dataclass
+class AudioFrame:
+    """A decoded binary audio frame"""
+
+    kind: AudioFrameKind
+    sample_rate: int
+    sequence: int
+    samples: np.ndarray  # read-only int16 view into the received frame
+
+    def to_float32(self) -> np.ndarray:
+        """Convert the int16 samples to float32 in the range [-1, 1)."""
+        return self.samples.astype(np.float32) / 32768.0
+
+
+def decode_audio_frame(data: bytes) -> AudioFrame:
+    """
+    Decode a binary audio frame without copying the payload.
+
+    Args:
+        data: The raw bytes of the WebSocket frame.
+
+    Returns:
+        AudioFrame: The decoded frame.
+
+    Raises:
+        ValueError: If the frame is malformed or uses an unknown kind/version.
+    """
+    if len(data) < AUDIO_FRAME_HEADER_SIZE:
+        raise ValueError(
+            f"Audio frame too short: {len(data)} bytes "
+            f"(header is {AUDIO_FRAME_HEADER_SIZE} bytes)"
+        )
+
+    kind, version, _, sample_rate, sequence = _HEADER.unpack_from(data)
+    if version != AUDIO_FRAME_VERSION:
+        raise ValueError(f"Unsupported audio frame version: {version}")
+    if sample_rate == 0:
+        raise ValueError("Audio frame sample rate must be positive")
+    if (len(data) - AUDIO_FRAME_HEADER_SIZE) % 2 != 0:
+        raise ValueError("Audio frame payload must contain whole int16 samples")
+
+    try:
+        frame_kind = AudioFrameKind(kind)
+    except ValueError:
+        raise ValueError(f"Unknown audio frame kind: {kind}")
+
+    samples = np.frombuffer(data, dtype="<i2", offset=AUDIO_FRAME_HEADER_SIZE)
+    return AudioFrame(
+        kind=frame_kind,
+        sample_rate=sample_rate,
+        sequence=sequence,
+        samples=samples,
+    )
+
+
+def encode_audio_frame(
+    samples: np.ndarray,
+    sample_rate: int,
+    sequence: int,
+    kind: AudioFrameKind = AudioFrameKind.RAW_AUDIO_DATA,
+) -> bytes:
+    """
+    Encode samples into a binary audio frame. Float input in [-1, 1] is
+    converted to int16; int16 input is sent as is.
+
+    Args:
+        samples: Mono audio samples.
+        sample_rate: Sample rate of the samples in Hz.
+        sequence: Frame sequence number.
+        kind: What the server should do with the samples.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    if samples.dtype != np.int16:
+        samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    header = _HEADER.pack(
+        int(kind), AUDIO_FRAME_VERSION, 0, sample_rate, sequence % SEQUENCE_MODULO
+    )
+    return header + samples.astype("<i2", copy=False).tobytes()
@@ -0,0 +1,185 @@
+"""
+Helpers to turn encoded audio arriving in pieces into int16 mono PCM.
+
+Streaming TTS engines receive their audio over HTTP (or a websocket) in
+chunks, as WAV, MP3 or raw PCM. These helpers decode those chunks as they
+arrive instead of waiting for the whole file.
+"""
+
+import asyncio
+import struct
+from typing import AsyncIterator, Iterable, Optional, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+class WavStreamParser:
+    """
+    Incremental WAV parser.
+
+    Feed it the bytes of a WAV stream in chunks of any size; it skips the
+    RIFF header and returns the PCM of the `data` chunk as it arrives,
+    converted to int16 mono. Streamed WAVs often have an unknown (0 or
+    0xFFFFFFFF) data size, so the data chunk is read until the stream ends.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._in_data = False
+        self.sample_rate: Optional[int] = None
+        self.channels = 1
+        self.sample_width = 2
+
+    def feed(self, data: bytes) -> bytes:
+        """
+        Parse the next chunk of the stream.
+
+        Returns:
+            bytes: The int16 mono PCM the chunk completes (may be empty).
+        """
+        self._buffer.extend(data)
+        if not self._in_data and not self._parse_header():
+            return b""
+
+        frame_size = self.channels * self.sample_width
+        usable = len(self._buffer) - len(self._buffer) % frame_size
+        pcm = bytes(self._buffer[:usable])
+        del self._buffer[:usable]
+        return self._to_int16_mono(pcm)
+
+    def _parse_header(self) -> bool:
+        """Consume RIFF chunks up to the start of the PCM data."""
+        if len(self._buffer) < 12:
+            return False
+        if self._buffer[:4] != b"RIFF" or self._buffer[8:12] != b"WAVE":
+            raise ValueError("Not a WAV stream")
+
+        offset = 12
+        while len(self._buffer) >= offset + 8:
+            chunk_id = bytes(self._buffer[offset : offset + 4])
+            (chunk_size,) = struct.unpack_from("<I", self._buffer, offset + 4)
+            if chunk_id == b"data":
+                if self.sample_rate is None:
+                    raise ValueError("WAV stream has no fmt chunk")
+                del self._buffer[: offset + 8]
+                self._in_data = True
+                return True
+            if len(self._buffer) < offset + 8 + chunk_size:
+                return False
+            if chunk_id == b"fmt ":
+                audio_format, channels, sample_rate, _, _, bits = struct.unpack_from(
+                    "<HHIIHH", self._buffer, offset + 8
+                )
+                # 0xFFFE is WAVE_FORMAT_EXTENSIBLE, used by some servers for PCM
+                if audio_format not in (1, 0xFFFE) or bits != 16:
+                    raise ValueError(
+                        f"Only 16-bit PCM WAV streams are supported "
+                        f"(format {audio_format}, {bits} bits)"
+                    )
+                self.channels = channels
+                self.sample_rate = sample_rate
+            offset += 8 + chunk_size + chunk_size % 2
+        return False
+
+    def _to_int16_mono(self, pcm: bytes) -> bytes:
+        if self.channels == 1 or not pcm:
+            return pcm
+        samples = np.frombuffer(pcm, dtype="<i2").reshape(-1, self.channels)
+        return samples.mean(axis=1).astype("<i2").tobytes()
+
+
+async def decode_with_ffmpeg(
+    chunks: AsyncIterator[bytes],
+    input_format: str,
+    sample_rate: int,
+    read_size: int = 4096,
+) -> AsyncIterator[bytes]:
+    """
+    Decode an encoded audio stream (e.g. mp3) to int16 mono PCM with an
+    ffmpeg subprocess, yielding PCM as soon as ffmpeg produces it.
+
+    Args:
+        chunks: The encoded audio, in pieces.
+        input_format: ffmpeg demuxer name of the input, e.g. "mp3".
+        sample_rate: Sample rate of the PCM to produce.
+        read_size: Maximum bytes of PCM per yielded chunk.
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-f",
+        input_format,
+        "-i",
+        "pipe:0",
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def pump() -> None:
+        try:
+            async for chunk in chunks:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        finally:
+            process.stdin.close()
+
+    writer = asyncio.create_task(pump())
+    try:
+        remainder = b""
+        while data := await process.stdout.read(read_size):
+            data = remainder + data
+            # Keep whole samples only
+            remainder = data[len(data) - len(data) % 2 :]
+            if len(data) > len(remainder):
+                yield data[: len(data) - len(remainder)]
+        await writer
+        if await process.wait() != 0:
+            error = (await process.stderr.read()).decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg failed to decode {input_format}: {error}")
+    finally:
+        if not writer.done():
+            writer.cancel()
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+
+async def iterate_in_thread(iterable: Iterable[T]) -> AsyncIterator[T]:
+    """
+    Iterate a blocking iterable (e.g. a streaming HTTP response of a sync
+    client) in a worker thread, yielding its items on the event loop.
+    """
+    iterator = iter(iterable)
+    sentinel = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, sentinel)
+        if item is sentinel:
+            return
+        yield item
+
+
+async def parse_wav_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """
+    Parse a WAV stream arriving in pieces.
+
+    Yields:
+        tuple[bytes, int]: int16 mono PCM and its sample rate, as soon as the
+            pieces complete any samples.
+    """
+    parser = WavStreamParser()
+    async for data in chunks:
+        pcm = parser.feed(data)
+        if pcm:
+            yield pcm, parser.sample_rate
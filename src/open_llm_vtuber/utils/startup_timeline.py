@@ -0,0 +1,58 @@
+"""
+Per-stage timing of engine initialization.
+
+Stages may run concurrently in different threads; the report shows when
+each one started and finished relative to the first, so it is visible which
+engine a cold start is waiting for.
+"""
+
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class StartupTimeline:
+    """Records the start and end of named initialization stages."""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+        # name -> (start, end) in seconds since the timeline was created
+        self.stages: dict[str, tuple[float, Optional[float]]] = {}
+
+    def run(self, name: str, func: Callable[..., T], *args) -> T:
+        """Run `func(*args)` as the stage `name`."""
+        started = time.perf_counter() - self.start
+        with self._lock:
+            self.stages[name] = (started, None)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.stages[name] = (started, time.perf_counter() - self.start)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds from the first stage start to the last stage end"""
+        with self._lock:
+            ends = [end for _, end in self.stages.values() if end is not None]
+        return max(ends, default=0.0)
+
+    def report(self, title: str = "Startup timeline") -> str:
+        """The stages in start order, with a bar over the total time."""
+        with self._lock:
+            stages = sorted(self.stages.items(), key=lambda item: item[1][0])
+        total = self.elapsed or 1e-9
+        width = 30
+        busy = sum(end - start for _, (start, end) in stages if end is not None)
+        lines = [f"{title}: {self.elapsed:.2f} s ({busy:.2f} s of work)"]
+        for name, (start, end) in stages:
+            end_or_now = end if end is not None else total
+            first = int(start / total * width)
+            last = max(first + 1, int(round(end_or_now / total * width)))
+            bar = " " * first + "#" * (last - first)
+            duration = f"{end - start:6.2f} s" if end is not None else "running"
+            lines.append(f"  {name:<10} {bar:<{width}} {duration}")
+        return "\n".join(lines)
@@ -1,11 +1,122 @@
 import base64
-from pydub import AudioSegment
-from pydub.utils import make_chunks
+import io
+import json
+import struct
+import wave
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
 from ..agent.output_types import Actions
 from ..agent.output_types import DisplayText
+from ..tts.tts_interface import TTSAudio
+
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 
-def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
+def frame_rms(samples: np.ndarray, frame_size: int) -> np.ndarray:
+    """
+    RMS of each `frame_size` frame of the samples, in one vectorized pass.
+
+    Parameters:
+        samples (np.ndarray): Interleaved samples (any integer or float dtype).
+        frame_size (int): Number of samples per frame.
+
+    Returns:
+        np.ndarray: The RMS of each frame; the last frame may be shorter.
+    """
+    count = -(-len(samples) // frame_size)
+    if count == 0:
+        return np.zeros(0)
+    full = len(samples) // frame_size
+    frames = samples[: full * frame_size].reshape(full, frame_size)
+    frames = frames.astype(np.float32)
+    # Sum of squares per frame without a temporary array of squares
+    sums = np.einsum("ij,ij->i", frames, frames, dtype=np.float64)
+    if count > full:
+        tail = samples[full * frame_size :].astype(np.float64)
+        sums = np.append(sums, np.dot(tail, tail) / len(tail) * frame_size)
+    return np.sqrt(sums / frame_size)
+
+
+def pcm_volumes(
+    pcm: bytes, sample_rate: int, chunk_length_ms: int, channels: int = 1
+) -> np.ndarray:
+    """
+    RMS of each `chunk_length_ms` slice of int16 PCM (not normalized).
+
+    Parameters:
+        pcm (bytes): int16 PCM, interleaved if `channels` > 1.
+        sample_rate (int): Sample rate of the PCM.
+        chunk_length_ms (int): The length of each slice in milliseconds.
+        channels (int): Number of interleaved channels.
+
+    Returns:
+        np.ndarray: The RMS of each slice; the last slice may be shorter.
+    """
+    samples = np.frombuffer(pcm, dtype="<i2")
+    return frame_rms(samples, slice_size(sample_rate, chunk_length_ms) * channels)
+
+
+def slice_size(sample_rate: int, chunk_length_ms: int) -> int:
+    """Number of frames in a `chunk_length_ms` slice."""
+    return max(1, sample_rate * chunk_length_ms // 1000)
+
+
+def normalize_volumes(volumes: np.ndarray) -> list:
+    """Scale volumes to the loudest slice, raising ValueError on silence."""
+    max_volume = float(volumes.max(initial=0.0))
+    if max_volume == 0:
+        raise ValueError("Audio is empty or all zero.")
+    return (volumes / max_volume).tolist()
+
+
+class VolumeEnvelope:
+    """
+    Incremental volume envelope of int16 mono PCM arriving in chunks.
+
+    `feed` returns the PCM of the slices the chunk completes together with
+    their RMS, and keeps the incomplete slice for the next call, so the
+    volumes of every returned piece line up with its audio. Volumes are
+    normalized by the loudest slice seen so far, since the rest of the
+    stream is not known yet.
+    """
+
+    def __init__(self, sample_rate: int, chunk_length_ms: int = 20) -> None:
+        self.sample_rate = sample_rate
+        self.slice_bytes = slice_size(sample_rate, chunk_length_ms) * 2
+        self.peak = 0.0
+        self._remainder = b""
+
+    def feed(self, pcm: bytes) -> tuple[bytes, np.ndarray]:
+        """
+        Add the next chunk of PCM.
+
+        Returns:
+            tuple: (PCM of the completed slices, their RMS)
+        """
+        data = self._remainder + pcm
+        usable = len(data) - len(data) % self.slice_bytes
+        self._remainder = data[usable:]
+        return data[:usable], self._rms(data[:usable])
+
+    def flush(self) -> tuple[bytes, np.ndarray]:
+        """Return the last, incomplete slice and its RMS."""
+        data, self._remainder = self._remainder, b""
+        return data, self._rms(data)
+
+    def normalize(self, volumes: np.ndarray) -> list:
+        """Scale volumes by the running peak (0 until anything is audible)."""
+        self.peak = max(self.peak, float(volumes.max(initial=0.0)))
+        if self.peak == 0:
+            return volumes.tolist()
+        return (volumes / self.peak).tolist()
+
+    def _rms(self, pcm: bytes) -> np.ndarray:
+        return frame_rms(np.frombuffer(pcm, dtype="<i2"), self.slice_bytes // 2)
+
+
+def _get_volume_by_chunks(audio: "AudioSegment", chunk_length_ms: int) -> list:
     """
     Calculate the normalized volume (RMS) for each chunk of the audio.
 
@@ -16,12 +127,55 @@ def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
     Returns:
         list: Normalized volumes for each chunk.
     """
-    chunks = make_chunks(audio, chunk_length_ms)
-    volumes = [chunk.rms for chunk in chunks]
-    max_volume = max(volumes)
-    if max_volume == 0:
-        raise ValueError("Audio is empty or all zero.")
-    return [volume / max_volume for volume in volumes]
+    samples = np.asarray(audio.get_array_of_samples())
+    volumes = frame_rms(
+        samples, slice_size(audio.frame_rate, chunk_length_ms) * audio.channels
+    )
+    return normalize_volumes(volumes)
+
+
+def decode_tts_audio(audio: TTSAudio) -> tuple[bytes, bytes, int]:
+    """
+    Turn in-memory TTS audio into a WAV file for the frontend and int16 mono
+    PCM for the volume envelope.
+
+    Samples and 16-bit PCM WAV data are handled without a transcode (the WAV
+    is sent as-is); other formats are decoded with pydub.
+
+    Parameters:
+        audio (TTSAudio): The synthesized audio.
+
+    Returns:
+        tuple: (WAV bytes, int16 mono PCM bytes, sample rate)
+    """
+    if audio.samples is not None:
+        samples = audio.samples
+        if samples.dtype != np.int16:
+            samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        pcm = samples.astype("<i2").tobytes()
+        return pcm_to_wav(pcm, audio.sample_rate), pcm, audio.sample_rate
+
+    data = audio.data
+    if audio.format in (None, "wav") and data[:4] == b"RIFF":
+        try:
+            with wave.open(io.BytesIO(data), "rb") as wf:
+                if wf.getsampwidth() == 2:
+                    channels = wf.getnchannels()
+                    samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+                    if channels > 1:
+                        samples = samples.reshape(-1, channels).mean(axis=1)
+                        samples = samples.astype("<i2")
+                    return data, samples.tobytes(), wf.getframerate()
+        except (wave.Error, EOFError):
+            pass  # e.g. float or extensible WAV, let pydub handle it
+
+    # Imported here: pydub is only needed for compressed TTS output
+    from pydub import AudioSegment
+
+    segment = AudioSegment.from_file(io.BytesIO(data), format=audio.format)
+    wav_bytes = segment.export(format="wav").read()
+    mono = segment.set_channels(1).set_sample_width(2)
+    return wav_bytes, mono.raw_data, mono.frame_rate
 
 
 def prepare_audio_payload(
@@ -30,16 +184,22 @@ def prepare_audio_payload(
     display_text: DisplayText = None,
     actions: Actions = None,
     forwarded: bool = False,
+    audio: TTSAudio | None = None,
+    raw_audio: bool = False,
 ) -> dict[str, any]:
     """
     Prepares the audio payload for sending to a broadcast endpoint.
-    If audio_path is None, returns a payload with audio=None for silent display.
+    If neither audio_path nor audio is given, returns a payload with
+    audio=None for silent display.
 
     Parameters:
         audio_path (str | None): The path to the audio file to be processed, or None for silent display
         chunk_length_ms (int): The length of each audio chunk in milliseconds
         display_text (DisplayText, optional): Text to be displayed with the audio
         actions (Actions, optional): Actions associated with the audio
+        audio (TTSAudio, optional): In-memory audio, used instead of audio_path
+        raw_audio (bool): Keep the WAV bytes in the payload instead of base64,
+            to be serialized by `encode_audio_payload`
 
     Returns:
         dict: The audio payload to be sent
@@ -47,6 +207,22 @@ def prepare_audio_payload(
     if isinstance(display_text, DisplayText):
         display_text = display_text.to_dict()
 
+    if audio is not None:
+        try:
+            audio_bytes, pcm, sample_rate = decode_tts_audio(audio)
+        except Exception as e:
+            raise ValueError(f"Error converting generated audio to wav: {e}")
+        volumes = normalize_volumes(pcm_volumes(pcm, sample_rate, chunk_length_ms))
+        return {
+            "type": "audio",
+            "audio": audio_bytes if raw_audio else _to_base64(audio_bytes),
+            "volumes": volumes,
+            "slice_length": chunk_length_ms,
+            "display_text": display_text,
+            "actions": actions.to_dict() if actions else None,
+            "forwarded": forwarded,
+        }
+
     if not audio_path:
         # Return payload for silent display
         return {
@@ -59,6 +235,8 @@ def prepare_audio_payload(
             "forwarded": forwarded,
         }
 
+    from pydub import AudioSegment
+
     try:
         audio = AudioSegment.from_file(audio_path)
         audio_bytes = audio.export(format="wav").read()
@@ -66,12 +244,11 @@ def prepare_audio_payload(
         raise ValueError(
             f"Error loading or converting generated audio file to wav file '{audio_path}': {e}"
         )
-    audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
     volumes = _get_volume_by_chunks(audio, chunk_length_ms)
 
     payload = {
         "type": "audio",
-        "audio": audio_base64,
+        "audio": audio_bytes if raw_audio else _to_base64(audio_bytes),
         "volumes": volumes,
         "slice_length": chunk_length_ms,
         "display_text": display_text,
@@ -82,5 +259,93 @@ def prepare_audio_payload(
     return payload
 
 
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap int16 mono PCM in a WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def prepare_audio_chunk_payload(
+    pcm: bytes,
+    sample_rate: int,
+    volumes: list,
+    chunk_length_ms: int = 20,
+    display_text: DisplayText = None,
+    actions: Actions = None,
+    forwarded: bool = False,
+    raw_audio: bool = False,
+) -> dict[str, any]:
+    """
+    Prepares the payload for one chunk of a streamed sentence.
+
+    The payload has the same shape as `prepare_audio_payload`, so the
+    frontend plays the chunks of a sentence one after another. Only the first
+    chunk of a sentence carries its display text and actions.
+
+    Parameters:
+        pcm (bytes): int16 mono PCM of the chunk
+        sample_rate (int): Sample rate of the PCM
+        volumes (list): Normalized volume of each `chunk_length_ms` slice
+        chunk_length_ms (int): The length of each volume slice in milliseconds
+        display_text (DisplayText, optional): Text to be displayed with the audio
+        actions (Actions, optional): Actions associated with the audio
+        raw_audio (bool): Keep the WAV bytes in the payload instead of base64
+
+    Returns:
+        dict: The audio payload to be sent
+    """
+    if isinstance(display_text, DisplayText):
+        display_text = display_text.to_dict()
+
+    audio_bytes = pcm_to_wav(pcm, sample_rate)
+    return {
+        "type": "audio",
+        "audio": audio_bytes if raw_audio else _to_base64(audio_bytes),
+        "volumes": volumes,
+        "slice_length": chunk_length_ms,
+        "display_text": display_text,
+        "actions": actions.to_dict() if actions else None,
+        "forwarded": forwarded,
+    }
+
+
+def encode_audio_payload(
+    payload: dict, audio_id: Optional[int] = None
+) -> tuple[str, Optional[bytes]]:
+    """
+    Serialize an audio payload built with `raw_audio=True`.
+
+    Without an `audio_id` the audio is base64-encoded into the JSON message,
+    which every frontend understands. With one, the JSON message only carries
+    the metadata and `audio_id`, and the WAV file goes into a separate binary
+    WebSocket frame: a 4-byte big-endian `audio_id` followed by the WAV bytes.
+    This avoids the base64 overhead and building a JSON string of the whole
+    file, but only frontends that announced `binary_audio` can read it.
+
+    Parameters:
+        payload (dict): The audio payload
+        audio_id (int, optional): Identifier linking the message to its frame
+
+    Returns:
+        tuple: (JSON message, binary frame or None)
+    """
+    audio = payload.get("audio")
+    if not isinstance(audio, (bytes, bytearray)):
+        return json.dumps(payload), None
+    if audio_id is None:
+        return json.dumps({**payload, "audio": _to_base64(audio)}), None
+    message = json.dumps({**payload, "audio": None, "audio_id": audio_id})
+    return message, struct.pack(">I", audio_id) + audio
+
+
+def _to_base64(data: bytes) -> str:
+    return base64.b64encode(data).decode("utf-8")
+
+
 # Example usage:
 # payload, duration = prepare_audio_payload("path/to/audio.mp3", display_text="Hello", expression_list=[0,1,2])
@@ -1,14 +1,16 @@
 import asyncio
+import math
 from collections import deque
 from enum import Enum
+from typing import Iterator
 
 import numpy as np
-import torch
 from loguru import logger
 from pydantic import BaseModel
-from silero_vad import load_silero_vad
 
+from ..utils.audio_buffer import AudioBuffer
 from .vad_interface import VADInterface
+from .vad_scheduler import VADBatchScheduler
 
 
 class SileroVADConfig(BaseModel):
@@ -19,9 +21,28 @@ class SileroVADConfig(BaseModel):
     required_hits: int = 3  # 3 * (0.032) = 0.1s
     required_misses: int = 24  # 24 * (0.032) = 0.8s
     smoothing_window: int = 5
+    batched_inference: bool = True
+    max_batch_size: int = 64
+    adaptive_endpointing: bool = False
+    min_required_misses: int = 8  # 8 * (0.032) = 0.26s
+    max_required_misses: int = 32  # 32 * (0.032) = 1.02s
 
 
 class VADEngine(VADInterface):
+    """
+    Silero VAD model shared by all clients.
+
+    The engine only holds the model weights. Everything that depends on the
+    audio stream (the model's recurrent state and context samples, and the
+    speech state machine) lives in a `VADSession`, so one loaded model can
+    serve many concurrent microphone streams. Use `create_session()` to get a
+    detector for a new client.
+
+    With `batched_inference`, sessions awaiting `async_detect_speech` share a
+    `VADBatchScheduler` that runs one window of every talking client per
+    model call in a worker thread.
+    """
+
     def __init__(
         self,
         orig_sr: int = 16000,
@@ -31,6 +52,11 @@ class VADEngine(VADInterface):
         required_hits: int = 3,
         required_misses: int = 24,
         smoothing_window: int = 5,
+        batched_inference: bool = True,
+        max_batch_size: int = 64,
+        adaptive_endpointing: bool = False,
+        min_required_misses: int = 8,
+        max_required_misses: int = 32,
     ):
         self.config = SileroVADConfig(
             orig_sr=orig_sr,
@@ -40,48 +66,300 @@ class VADEngine(VADInterface):
             required_hits=required_hits,
             required_misses=required_misses,
             smoothing_window=smoothing_window,
+            batched_inference=batched_inference,
+            max_batch_size=max_batch_size,
+            adaptive_endpointing=adaptive_endpointing,
+            min_required_misses=min_required_misses,
+            max_required_misses=max_required_misses,
         )
         self.model = self.load_vad_model()
-        self.state = StateMachine(self.config)
         self.window_size_samples = 512 if self.config.target_sr == 16000 else 256
         # 512 / 16000 = 0.032s
+        # samples of the previous window the model sees in front of each window
+        self.context_size = 64 if self.config.target_sr == 16000 else 32
+        self._sample_rate = np.array(self.config.target_sr, dtype=np.int64)
+        self._default_session: VADSession | None = None
+        self.scheduler = (
+            VADBatchScheduler(self, self.config.max_batch_size)
+            if self.config.batched_inference
+            else None
+        )
 
     def load_vad_model(self):
-        logger.info("Loading Silero-VAD model...")
-        return load_silero_vad()
+        # Imported here: silero_vad pulls in torch
+        from silero_vad import load_silero_vad
 
-    def detect_speech(self, audio_data: list[float]):
-        audio_np = np.array(audio_data, dtype=np.float32)
-        for i in range(0, len(audio_np), self.window_size_samples):
-            chunk_np = audio_np[i : i + self.window_size_samples]
-            if len(chunk_np) < self.window_size_samples:
-                break
-            chunk = torch.Tensor(chunk_np)
+        logger.info("Loading Silero-VAD model...")
+        # The ONNX model takes its recurrent state as an explicit input, which
+        # lets every session keep its own state while sharing the weights.
+        return load_silero_vad(onnx=True)
+
+    def create_session(self) -> "VADSession":
+        return VADSession(self)
+
+    def close(self) -> None:
+        """Stop the batch scheduler (when the engine is unloaded)."""
+        if self.scheduler is not None:
+            self.scheduler.close()
+
+    def infer(
+        self, windows: np.ndarray, states: np.ndarray, contexts: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Run the model on one window per stream.
+
+        Args:
+            windows: (batch, window_size_samples) float32 audio windows.
+            states: (2, batch, 128) recurrent states of the streams.
+            contexts: (batch, context_size) trailing samples of each stream's
+                previous window.
+
+        Returns:
+            Speech probabilities (batch,), the new states and the new contexts.
+        """
+        x = np.concatenate([contexts, windows], axis=1)
+        probs, states = self.model.session.run(
+            None, {"input": x, "state": states, "sr": self._sample_rate}
+        )
+        return probs[:, 0], states, x[:, -self.context_size :]
+
+    @property
+    def default_session(self) -> "VADSession":
+        # Used by callers that treat the engine itself as a single stream
+        if self._default_session is None:
+            self._default_session = self.create_session()
+        return self._default_session
+
+    def detect_speech(self, audio_data: list[float] | np.ndarray):
+        yield from self.default_session.detect_speech(audio_data)
+
+    async def async_detect_speech(
+        self, audio_data: list[float] | np.ndarray
+    ) -> list[bytes]:
+        return await self.default_session.async_detect_speech(audio_data)
+
+
+class VADSession(VADInterface):
+    """Per-client Silero VAD state on top of a shared `VADEngine`."""
+
+    def __init__(self, engine: VADEngine):
+        self.engine = engine
+        self.config = engine.config
+        self.window_size_samples = engine.window_size_samples
+        self.state = StateMachine(engine.config)
+        # Samples at the end of the last chunk that did not fill a window
+        self.leftover = np.empty(0, dtype=np.float32)
+        # The utterance in progress as float samples, converted incrementally
+        self.pending = AudioBuffer()
+        self.pending_segment = -1
+        self.pending_bytes = 0
+        self.reset_states()
+
+    def reset_states(self) -> None:
+        """Reset the model's recurrent state and context for this stream."""
+        self.model_state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.model_context = np.zeros((1, self.engine.context_size), dtype=np.float32)
+
+    def create_session(self) -> "VADSession":
+        return self.engine.create_session()
+
+    def get_speech_prob(self, chunk_np: np.ndarray) -> float:
+        probs, self.model_state, self.model_context = self.engine.infer(
+            chunk_np[np.newaxis, :], self.model_state, self.model_context
+        )
+        return float(probs[0])
+
+    def split_windows(self, audio_data: list[float] | np.ndarray) -> np.ndarray:
+        """
+        Split audio into (n, window_size_samples) windows. Samples that do not
+        fill a whole window are dropped.
+        """
+        audio_np = np.asarray(audio_data, dtype=np.float32).reshape(-1)
+        count = len(audio_np) // self.window_size_samples
+        return audio_np[: count * self.window_size_samples].reshape(
+            count, self.window_size_samples
+        )
 
-            with torch.no_grad():
-                speech_prob = self.model(chunk, self.config.target_sr).item()
+    @property
+    def endpointing(self) -> "AdaptiveEndpointing | None":
+        """This client's adaptive endpointing statistics, if enabled"""
+        return self.state.endpointing
+
+    def pending_speech(self) -> np.ndarray:
+        state = self.state
+        if state.state == State.IDLE:
+            return np.empty(0, dtype=np.float32)
+        if self.pending_segment != state.segments:
+            # New utterance: start from the audio buffered before it
+            self.pending_segment = state.segments
+            self.pending.clear()
+            self.pending.append(_int16_to_float(b"".join(state.pre_buffer)))
+            self.pending_bytes = 0
+        # Only convert what the state machine recorded since the last call
+        self.pending.append(_int16_to_float(state.bytes[self.pending_bytes :]))
+        self.pending_bytes = len(state.bytes)
+        return self.pending.view()
+
+    def take_windows(self, audio_data: list[float] | np.ndarray) -> np.ndarray:
+        """
+        Split the next chunk of the stream into windows. Samples that do not
+        fill a whole window are kept and prepended to the next chunk, since
+        resampled chunks rarely line up with the window size.
+        """
+        audio_np = np.asarray(audio_data, dtype=np.float32).reshape(-1)
+        if len(self.leftover):
+            audio_np = np.concatenate([self.leftover, audio_np])
+        windows = self.split_windows(audio_np)
+        self.leftover = audio_np[windows.size :].copy()
+        return windows
+
+    def feed_state_machine(self, speech_probs: np.ndarray, windows: np.ndarray):
+        """Run the windows of a chunk and their probabilities through the
+        state machine."""
+        # Windows with a probability of exactly 0 never reach the state machine
+        speech_probs = np.asarray(speech_probs, dtype=np.float64)
+        voiced = speech_probs != 0
+        if not voiced.all():
+            speech_probs, windows = speech_probs[voiced], windows[voiced]
+
+        iter = self.state.process_chunk(speech_probs, windows)
+
+        for probs, dbs, chunk in iter:  # detected a sequence of voice bytes
+            # rounded_probs = [round(x, 2) for x in probs]
+            # rounded_dbs = [round(y, 2) for y in dbs]
+
+            audio_chunk = bytes(chunk)
+            yield audio_chunk
+
+    def detect_speech(self, audio_data: list[float] | np.ndarray):
+        windows = self.take_windows(audio_data)
+        speech_probs = np.array(
+            [self.get_speech_prob(chunk_np) for chunk_np in windows],
+            dtype=np.float64,
+        )
+        yield from self.feed_state_machine(speech_probs, windows)
 
-            if speech_prob:
-                # print(speech_prob)
-                iter = self.state.get_result(speech_prob, chunk_np)
+    async def async_detect_speech(
+        self, audio_data: list[float] | np.ndarray
+    ) -> list[bytes]:
+        if self.engine.scheduler is None:
+            return await super().async_detect_speech(audio_data)
 
-                for probs, dbs, chunk in iter:  # detected a sequence of voice bytes
-                    # rounded_probs = [round(x, 2) for x in probs]
-                    # rounded_dbs = [round(y, 2) for y in dbs]
+        windows = self.take_windows(audio_data)
+        probs = await self.engine.scheduler.infer(self, windows)
+        return list(self.feed_state_machine(probs, windows))
 
-                    audio_chunk = bytes(chunk)
-                    yield audio_chunk
 
-        del audio_np
+# Define state enumeration
+def _int16_to_float(data: bytes | bytearray) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
 
 
-# Define state enumeration
 class State(Enum):
     IDLE = 1  # Idle state, waiting for speech
     ACTIVE = 2  # Speech detection state
     INACTIVE = 3  # Speech end state (silence state)
 
 
+class AdaptiveEndpointing:
+    """
+    Chooses how many silent windows end an utterance, per pause.
+
+    With a fixed `required_misses`, every turn waits the same hangover after
+    the user stops talking. This shortens the hangover when the utterance
+    sounds finished and lengthens it when it does not, based on:
+
+    - utterance length: short utterances (commands, short answers) are
+      usually complete at their first pause;
+    - speech-prob and energy trajectory before the pause: a gradual fall-off
+      sounds like the end of a sentence, while speech that stops abruptly at
+      full probability is more likely a breath or a stop consonant;
+    - the user's own pauses: the hangover never drops below the pauses this
+      user has recently resumed speaking after.
+
+    One instance lives in each session's `StateMachine`, so pause statistics
+    are kept per client.
+    """
+
+    # Utterances shorter than these (in windows) count as short / medium
+    SHORT_UTTERANCE = 31  # ~1s
+    MEDIUM_UTTERANCE = 94  # ~3s
+    # Windows before the pause used for the prob/energy trajectory
+    TRAJECTORY_WINDOWS = 8
+    # dB the energy has to fall by at the end to count as a fall-off
+    DB_FALL = 6.0
+    # Silences shorter than this (in windows) are not counted as pauses
+    MIN_PAUSE = 3
+    # Number of pauses needed before the user's statistics are used
+    MIN_PAUSE_SAMPLES = 5
+
+    def __init__(self, config: SileroVADConfig, window_ms: float):
+        self.base_misses = config.required_misses
+        self.min_misses = min(config.min_required_misses, config.required_misses)
+        self.max_misses = max(config.max_required_misses, config.required_misses)
+        self.prob_threshold = config.prob_threshold
+        self.window_ms = window_ms
+
+        # Lengths (in windows) of the pauses the user resumed speaking after
+        self.pauses = deque(maxlen=50)
+        self.turns = 0
+        self.last_saved_ms = 0.0
+        self.total_saved_ms = 0.0
+
+    def required_misses(self, speech_windows: int, probs: list, dbs: list) -> int:
+        """
+        Silent windows needed to end the current pause.
+
+        Args:
+            speech_windows: Length of the utterance so far in windows.
+            probs: Smoothed speech probabilities of the utterance before the
+                pause.
+            dbs: Smoothed energies of the utterance before the pause.
+        """
+        factor = 1.0
+        if speech_windows < self.SHORT_UTTERANCE:
+            factor *= 0.6
+        elif speech_windows < self.MEDIUM_UTTERANCE:
+            factor *= 0.8
+
+        n = self.TRAJECTORY_WINDOWS
+        if len(probs) >= n:
+            recent_dbs = np.asarray(dbs[-n:], dtype=np.float64)
+            # Energy lost between the loudest recent window and the last two
+            db_fall = recent_dbs.max() - recent_dbs[-2:].mean()
+            if db_fall >= self.DB_FALL or probs[-1] < probs[-n]:
+                factor *= 0.75
+            elif probs[-1] >= max(0.8, self.prob_threshold):
+                # Cut off at full loudness and confidence
+                factor *= 1.25
+
+        misses = round(self.base_misses * factor)
+        if len(self.pauses) >= self.MIN_PAUSE_SAMPLES:
+            # Outlast nine out of ten of this user's pauses
+            misses = max(misses, math.ceil(np.percentile(self.pauses, 90)) + 1)
+        return int(min(max(misses, self.min_misses), self.max_misses))
+
+    def record_pause(self, windows: int) -> None:
+        """Record a pause the user resumed speaking after."""
+        if windows >= self.MIN_PAUSE:
+            self.pauses.append(windows)
+
+    def record_turn(self, misses: int) -> None:
+        """Record the hangover that ended an utterance and log the saving."""
+        # An utterance ends after the hangover in ACTIVE plus the one in
+        # INACTIVE
+        self.last_saved_ms = 2 * (self.base_misses - misses) * self.window_ms
+        self.total_saved_ms += self.last_saved_ms
+        self.turns += 1
+        logger.info(
+            f"Adaptive endpointing: utterance ended after "
+            f"{2 * misses * self.window_ms:.0f} ms of silence, "
+            f"{self.last_saved_ms:.0f} ms sooner than the fixed hangover "
+            f"(average {self.total_saved_ms / self.turns:.0f} ms over "
+            f"{self.turns} turns)"
+        )
+
+
 class StateMachine:
     def __init__(self, config: SileroVADConfig):
         self.state = State.IDLE
@@ -101,12 +379,34 @@ class StateMachine:
         self.db_window = deque(maxlen=self.smoothing_window)
 
         self.pre_buffer = deque(maxlen=20)
+        # Number of times speech has started, so readers can tell utterances apart
+        self.segments = 0
+
+        # Silent windows that end the current pause
+        self.hangover = self.required_misses
+        window_size = 512 if config.target_sr == 16000 else 256
+        self.endpointing = (
+            AdaptiveEndpointing(config, window_size / config.target_sr * 1000)
+            if config.adaptive_endpointing
+            else None
+        )
 
     @classmethod
     def calculate_db(cls, audio_data: np.ndarray) -> float:
         rms = np.sqrt(np.mean(np.square(audio_data)))
         return 20 * np.log10(rms + 1e-7) if rms > 0 else -np.inf
 
+    @classmethod
+    def calculate_dbs(cls, audio_windows: np.ndarray) -> np.ndarray:
+        """`calculate_db` of every row of a (n, window) array."""
+        rms = np.sqrt(np.mean(np.square(audio_windows), axis=1))
+        # `calculate_db` adds 1e-7 to a float32 scalar, which NumPy promotes to
+        # float64
+        with np.errstate(divide="ignore"):
+            dbs = 20 * np.log10(rms.astype(np.float64) + 1e-7)
+        dbs[~(rms > 0)] = -np.inf
+        return dbs
+
     def update(self, chunk_bytes, prob, db):
         self.probs.append(prob)
         self.dbs.append(db)
@@ -124,6 +424,31 @@ class StateMachine:
         smoothed_db = np.mean(self.db_window)
         return smoothed_prob, smoothed_db
 
+    @staticmethod
+    def _moving_average(history: deque, values: np.ndarray) -> np.ndarray:
+        """
+        Moving average of `values` over a window of `history.maxlen`, continuing
+        from the values already in `history`.
+
+        Uses `np.mean` on the same windows `get_smoothed_values` sees, so the
+        result is bit-identical to calling it once per value.
+        """
+        width = history.maxlen
+        combined = np.concatenate([np.asarray(history, dtype=values.dtype), values])
+        start = len(history)
+        means = np.empty(len(values), dtype=values.dtype)
+
+        # At the start of a stream the window is still filling up
+        partial = min(max(width - 1 - start, 0), len(values))
+        for i in range(partial):
+            means[i] = np.mean(combined[: start + i + 1])
+
+        if partial < len(values):
+            windows = np.lib.stride_tricks.sliding_window_view(combined, width)
+            first = start + partial - width + 1
+            means[partial:] = np.mean(windows[first:], axis=1)
+        return means
+
     def process(self, prob, float_chunk_np: np.ndarray):
         int_chunk_np = float_chunk_np * 32767
         chunk_bytes = int_chunk_np.astype(np.int16).tobytes()
@@ -131,7 +456,45 @@ class StateMachine:
 
         # 获取平滑后的 prob 和 db
         smoothed_prob, smoothed_db = self.get_smoothed_values(prob, db)
-
+        yield from self._step(chunk_bytes, smoothed_prob, smoothed_db)
+
+    def process_chunk(
+        self, probs: np.ndarray, float_windows: np.ndarray
+    ) -> Iterator[tuple[list, list, bytes]]:
+        """
+        Vectorized `process` for all windows of a chunk.
+
+        The int16 conversion, dB and smoothed prob/dB of every window are
+        computed in one NumPy pass; only the state transitions run per window.
+        The results are identical to calling `process` for each window.
+
+        Args:
+            probs: (n,) speech probabilities of the windows.
+            float_windows: (n, window) float32 audio windows.
+        """
+        if not len(probs):
+            return
+
+        int_windows = float_windows * 32767
+        all_bytes = int_windows.astype(np.int16).tobytes()
+        window_bytes = len(all_bytes) // len(probs)
+        dbs = self.calculate_dbs(int_windows)
+
+        probs = np.asarray(probs, dtype=np.float64)
+        smoothed_probs = self._moving_average(self.prob_window, probs)
+        smoothed_dbs = self._moving_average(self.db_window, dbs)
+        self.prob_window.extend(probs.tolist())
+        self.db_window.extend(dbs)
+
+        for i in range(len(probs)):
+            yield from self._step(
+                all_bytes[i * window_bytes : (i + 1) * window_bytes],
+                smoothed_probs[i],
+                smoothed_dbs[i],
+            )
+
+    def _step(self, chunk_bytes: bytes, smoothed_prob, smoothed_db):
+        """Advance the state machine by one window."""
         if self.state == State.IDLE:
             self.pre_buffer.append(chunk_bytes)
             if (
@@ -141,6 +504,7 @@ class StateMachine:
                 self.hit_count += 1
                 if self.hit_count >= self.required_hits:
                     self.state = State.ACTIVE
+                    self.segments += 1
                     self.update(chunk_bytes, smoothed_prob, smoothed_db)
                     self.hit_count = 0
                     yield [], [], b"<|PAUSE|>"
@@ -153,12 +517,22 @@ class StateMachine:
                 smoothed_prob >= self.prob_threshold
                 and smoothed_db >= self.db_threshold
             ):
+                if self.endpointing is not None and self.miss_count:
+                    self.endpointing.record_pause(self.miss_count)
                 self.miss_count = 0
             else:
                 self.miss_count += 1
-                if self.miss_count >= self.required_misses:
+                if self.miss_count == 1 and self.endpointing is not None:
+                    # A pause starts: decide how long it has to last
+                    self.hangover = self.endpointing.required_misses(
+                        len(self.probs) - 1, self.probs[:-1], self.dbs[:-1]
+                    )
+                if self.miss_count >= self.hangover:
                     self.state = State.INACTIVE
                     self.miss_count = 0
+                    # The utterance ends here unless the user resumes
+                    # speaking before the hangover is over
+                    yield [], [], b"<|HANGOVER|>"
 
         elif self.state == State.INACTIVE:
             self.update(chunk_bytes, smoothed_prob, smoothed_db)
@@ -168,13 +542,18 @@ class StateMachine:
             ):
                 self.hit_count += 1
                 if self.hit_count >= self.required_hits:
+                    if self.endpointing is not None:
+                        self.endpointing.record_pause(self.hangover + self.miss_count)
                     self.state = State.ACTIVE
                     self.hit_count = 0
                     self.miss_count = 0
+                    yield [], [], b"<|HANGOVER_CANCEL|>"
             else:
                 self.hit_count = 0
                 self.miss_count += 1
-                if self.miss_count >= self.required_misses:
+                if self.miss_count >= self.hangover:
+                    if self.endpointing is not None:
+                        self.endpointing.record_turn(self.hangover)
                     self.state = State.IDLE
                     self.miss_count = 0
                     yield [], [], b"<|RESUME|>"
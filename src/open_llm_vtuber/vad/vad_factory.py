@@ -16,4 +16,9 @@ class VADFactory:
                 kwargs.get("required_hits"),
                 kwargs.get("required_misses"),
                 kwargs.get("smoothing_window"),
+                kwargs.get("batched_inference", True),
+                kwargs.get("max_batch_size", 64),
+                kwargs.get("adaptive_endpointing", False),
+                kwargs.get("min_required_misses", 8),
+                kwargs.get("max_required_misses", 32),
             )
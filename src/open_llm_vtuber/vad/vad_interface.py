@@ -1,12 +1,47 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 
 class VADInterface(ABC):
     @abstractmethod
-    def detect_speech(self, audio_data: bytes):
+    def detect_speech(self, audio_data: list[float] | np.ndarray):
         """
         Detect if there is voice activity in the audio data.
-        :param audio_data: Input audio data
+        :param audio_data: Input audio data as float samples in the range [-1, 1]
         :return: Returns a sequence of audio bytes containing human voice if voice activity is detected
         """
         pass
+
+    async def async_detect_speech(
+        self, audio_data: list[float] | np.ndarray
+    ) -> list[bytes]:
+        """
+        Asynchronous version of `detect_speech`.
+
+        Engines that can run inference off the event loop (e.g. batched across
+        clients) should override this. The default runs `detect_speech` inline.
+        :param audio_data: Input audio data as float samples in the range [-1, 1]
+        :return: The audio bytes / control markers `detect_speech` would yield
+        """
+        return list(self.detect_speech(audio_data))
+
+    def pending_speech(self) -> np.ndarray:
+        """
+        Audio of the utterance in progress as float samples, i.e. the audio that
+        will be yielded if the current speech ends up being detected as an
+        utterance. Empty while no speech is in progress or if the engine cannot
+        tell. The result may be a view that is only valid until the next chunk
+        is processed; copy it to keep it.
+        """
+        return np.empty(0, dtype=np.float32)
+
+    def create_session(self) -> "VADInterface":
+        """
+        Create a detector for a new audio stream (e.g. a new client).
+
+        Engines that keep per-stream state should return a lightweight object
+        that shares the loaded model but not the state. The default returns the
+        engine itself, i.e. all streams share one state.
+        """
+        return self
@@ -0,0 +1,167 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from loguru import logger
+
+if TYPE_CHECKING:
+    from .silero import VADEngine, VADSession
+
+
+@dataclass
+class _VADJob:
+    """The windows of one audio chunk waiting for their speech probabilities"""
+
+    session: "VADSession"
+    windows: np.ndarray  # (n, window_size_samples)
+    probs: np.ndarray  # (n,)
+    future: asyncio.Future
+    index: int = 0
+
+
+class VADBatchScheduler:
+    """
+    Batches Silero VAD inference across all connected clients.
+
+    Each tick takes the next pending window of every session with queued
+    audio, stacks them (together with the sessions' recurrent states) into a
+    single batch and runs the model once in a worker thread. The
+    probabilities and new states are then handed back to the sessions.
+
+    Windows of the same session depend on each other through the model's
+    recurrent state, so a session contributes at most one window per tick.
+    With N talking clients a tick therefore replaces N model calls with one,
+    and the event loop never blocks on inference.
+    """
+
+    def __init__(self, engine: "VADEngine", max_batch_size: int = 64):
+        """
+        Args:
+            engine: The engine whose model runs the batches.
+            max_batch_size: Maximum number of windows per model call. Sessions
+                beyond this wait for the next tick (round-robin).
+        """
+        self.engine = engine
+        self.max_batch_size = max(1, max_batch_size)
+        # session -> queued jobs of that session, in arrival order. Sessions
+        # are moved to the end after each tick so all of them get a turn.
+        self._jobs: dict["VADSession", list[_VADJob]] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="vad-batch"
+        )
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+        self.ticks = 0
+        self.windows_processed = 0
+
+    async def infer(self, session: "VADSession", windows: np.ndarray) -> np.ndarray:
+        """
+        Queue the windows of a session and wait for their probabilities.
+
+        Args:
+            session: The session the windows belong to. Its model state and
+                context are updated as the windows are processed.
+            windows: (n, window_size_samples) float32 windows in stream order.
+
+        Returns:
+            np.ndarray: The speech probability of each window.
+        """
+        if not len(windows):
+            return np.empty(0, dtype=np.float32)
+
+        self._ensure_running()
+        job = _VADJob(
+            session=session,
+            windows=windows,
+            probs=np.empty(len(windows), dtype=np.float32),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._jobs.setdefault(session, []).append(job)
+        self._wakeup.set()
+        return await job.future
+
+    def _ensure_running(self) -> None:
+        if (
+            self._task is None
+            or self._task.done()
+            or self._task.get_loop() is not asyncio.get_running_loop()
+        ):
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def _next_batch(self) -> list[_VADJob]:
+        """Pick the head job of up to `max_batch_size` sessions."""
+        batch = []
+        for session in list(self._jobs):
+            jobs = self._jobs[session]
+            # Drop jobs whose caller went away (e.g. client disconnected)
+            while jobs and jobs[0].future.done():
+                jobs.pop(0)
+            if not jobs:
+                del self._jobs[session]
+                continue
+            batch.append(jobs[0])
+            if len(batch) >= self.max_batch_size:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while batch := self._next_batch():
+                windows = np.stack([job.windows[job.index] for job in batch])
+                states = np.concatenate(
+                    [job.session.model_state for job in batch], axis=1
+                )
+                contexts = np.concatenate(
+                    [job.session.model_context for job in batch], axis=0
+                )
+                try:
+                    probs, states, contexts = await loop.run_in_executor(
+                        self._executor, self.engine.infer, windows, states, contexts
+                    )
+                except Exception as e:
+                    logger.error(f"Batched VAD inference failed: {e}")
+                    # The sessions' states are now unusable for their queued
+                    # windows, so fail all of their jobs
+                    for job in batch:
+                        for queued in self._jobs.pop(job.session, []):
+                            if not queued.future.done():
+                                queued.future.set_exception(e)
+                    continue
+
+                self.ticks += 1
+                self.windows_processed += len(batch)
+                for i, job in enumerate(batch):
+                    session = job.session
+                    session.model_state = states[:, i : i + 1]
+                    session.model_context = contexts[i : i + 1]
+                    job.probs[job.index] = probs[i]
+                    job.index += 1
+
+                    # Move the session to the back of the round-robin order
+                    jobs = self._jobs.pop(session)
+                    if job.index == len(job.windows):
+                        jobs.pop(0)
+                        if not job.future.done():
+                            job.future.set_result(job.probs)
+                    if jobs:
+                        self._jobs[session] = jobs
+
+    def close(self) -> None:
+        """Stop the scheduler task and the worker thread."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for jobs in self._jobs.values():
+            for job in jobs:
+                if not job.future.done():
+                    job.future.cancel()
+        self._jobs.clear()
+        self._executor.shutdown(wait=False)
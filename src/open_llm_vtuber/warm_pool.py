@@ -0,0 +1,139 @@
+"""
+Background preloading of the characters clients are likely to switch to.
+
+Switching characters loads the new character's ASR, TTS and VAD engines in
+the request path, which can take many seconds for local models. The warm
+pool loads the engines of the configs listed in `system_config.warm_configs`
+in the background after startup and holds references to them in the engine
+registry, so a switch to a warm character finds every engine loaded and
+only swaps references. The registry keys engines on the selected model's
+settings (see `ServiceContext._engine_config`), not on the whole merged
+character config, so this works whichever character a session switches
+from.
+"""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from loguru import logger
+
+from .engine_registry import engine_registry
+
+if TYPE_CHECKING:
+    from .service_context import ServiceContext
+
+
+class WarmPool:
+    """Preloads the engines of selected character configs."""
+
+    def __init__(self) -> None:
+        # file name -> "pending", "loading", "ready", "failed" or "skipped"
+        self.states: Dict[str, str] = {}
+        self._contexts: Dict[str, "ServiceContext"] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def status(self) -> Dict[str, str]:
+        """Readiness of each warm config"""
+        return dict(self.states)
+
+    def is_ready(self, config_file_name: str) -> bool:
+        return self.states.get(config_file_name) == "ready"
+
+    def start(self, default_context: "ServiceContext") -> None:
+        """
+        Start preloading the configs of `system_config.warm_configs` (call
+        from the event loop, after the default context is loaded).
+        """
+        config_files = default_context.system_config.warm_configs or []
+        if not config_files or self._task is not None:
+            return
+        self.states = {config_file: "pending" for config_file in config_files}
+        self._task = asyncio.create_task(self._warm(default_context, config_files))
+
+    async def close(self) -> None:
+        """Stop preloading and release the warm engines."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for context in self._contexts.values():
+            context.close()
+        self._contexts.clear()
+
+    async def _warm(
+        self, default_context: "ServiceContext", config_files: List[str]
+    ) -> None:
+        for config_file in config_files:
+            if self._over_budget():
+                logger.warning(
+                    f"Warm pool: skipping {config_file}, the engine memory "
+                    f"budget is used up"
+                )
+                self.states[config_file] = "skipped"
+                continue
+
+            self.states[config_file] = "loading"
+            start = time.perf_counter()
+            try:
+                context = await asyncio.to_thread(
+                    self._load, default_context, config_file
+                )
+            except Exception as e:
+                logger.error(f"Warm pool: failed to preload {config_file}: {e}")
+                self.states[config_file] = "failed"
+                continue
+
+            if self._over_budget():
+                # Let the registry evict what this config loaded
+                context.close()
+                logger.warning(
+                    f"Warm pool: {config_file} does not fit in the engine "
+                    f"memory budget, not keeping it warm"
+                )
+                self.states[config_file] = "skipped"
+                continue
+
+            self._contexts[config_file] = context
+            self.states[config_file] = "ready"
+            logger.info(
+                f"Warm pool: {config_file} ready in {time.perf_counter() - start:.1f} s "
+                f"({engine_registry.memory_usage() / 1024 / 1024:.0f} MB of engines loaded)"
+            )
+
+    @staticmethod
+    def _load(default_context: "ServiceContext", config_file: str) -> "ServiceContext":
+        """Load the engines of a config the way a switch to it would."""
+        config = default_context.load_switch_config(config_file)
+        if config is None:
+            raise ValueError(f"{config_file} has no character config")
+
+        context = type(default_context)()
+        context.config = config
+        context.system_config = config.system_config
+        context.character_config = config.character_config
+        character_config = config.character_config
+        context.live2d_model = context.init_live2d(character_config.live2d_model_name)
+        # A new context has no engines, so each of these loads one
+        context.asr_engine, context.engine_keys["asr"] = context.init_asr(
+            character_config.asr_config
+        )
+        context.tts_engine, context.engine_keys["tts"] = context.init_tts(
+            character_config.tts_config
+        )
+        context.vad_engine, context.engine_keys["vad"] = context.init_vad(
+            character_config.vad_config
+        )
+        # The agent holds per-session memory, so it is created on switch
+        return context
+
+    @staticmethod
+    def _over_budget() -> bool:
+        budget = engine_registry.memory_budget
+        return budget > 0 and engine_registry.memory_usage() > budget
+
+
+warm_pool = WarmPool()
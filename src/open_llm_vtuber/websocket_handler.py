@@ -15,6 +15,11 @@ from .chat_group import (
 )
 from .message_handler import message_handler
 from .utils.stream_audio import prepare_audio_payload
+from .utils.audio_codec import AudioEncoding, audio_encoder
+from .warm_pool import warm_pool
+from .utils.audio_buffer import AudioBuffer
+from .utils.audio_frame import AudioFrameKind, SEQUENCE_MODULO, decode_audio_frame
+from .utils.resample import StreamingResampler
 from .chat_history_manager import (
     create_new_history,
     get_history,
@@ -22,6 +27,11 @@ from .chat_history_manager import (
     get_history_list,
 )
 from .config_manager.utils import scan_config_alts_directory, scan_bg_directory
+from .conversations.speculative_transcription import SpeculativeTranscription
+from .conversations.streaming_transcription import (
+    StreamingTranscription,
+    supports_streaming,
+)
 from .conversations.conversation_handler import (
     handle_conversation_trigger,
     handle_group_interrupt,
@@ -52,10 +62,14 @@ class WSMessage(TypedDict, total=False):
     action: Optional[str]
     text: Optional[str]
     audio: Optional[List[float]]
+    sample_rate: Optional[int]
     images: Optional[List[str]]
     history_uid: Optional[str]
     file: Optional[str]
     display_text: Optional[dict]
+    binary_audio: Optional[bool]
+    audio_codecs: Optional[List[str]]
+    audio_bitrate_kbps: Optional[int]
 
 
 class WebSocketHandler:
@@ -68,7 +82,24 @@ class WebSocketHandler:
         self.chat_group_manager = ChatGroupManager()
         self.current_conversation_tasks: Dict[str, Optional[asyncio.Task]] = {}
         self.default_context_cache = default_context_cache
-        self.received_data_buffers: Dict[str, np.ndarray] = {}
+        self.received_data_buffers: Dict[str, AudioBuffer] = {}
+        self.audio_frame_sequences: Dict[str, int] = {}
+        self.resamplers: Dict[str, StreamingResampler] = {}
+        # Utterances being transcribed while the user speaks, and final
+        # transcripts waiting for their mic-audio-end
+        self.transcriptions: Dict[str, StreamingTranscription] = {}
+        self.final_transcripts: Dict[str, str] = {}
+        # Utterances transcribed during the VAD hangover, before and after the
+        # VAD confirmed them
+        self.speculations: Dict[str, SpeculativeTranscription] = {}
+        self.confirmed_speculations: Dict[str, SpeculativeTranscription] = {}
+        # Optional protocol features announced by each client
+        self.client_capabilities: Dict[str, Dict[str, bool]] = {}
+        # Codec and bitrate of the speech sent to each client
+        self.audio_encodings: Dict[str, AudioEncoding] = {}
+        codec_config = default_context_cache.system_config.audio_codec
+        if codec_config:
+            audio_encoder.configure(workers=codec_config.workers)
 
         # Message handlers mapping
         self._message_handlers = self._init_message_handlers()
@@ -93,6 +124,7 @@ class WebSocketHandler:
             "switch-config": self._handle_config_switch,
             "fetch-backgrounds": self._handle_fetch_backgrounds,
             "audio-play-start": self._handle_audio_play_start,
+            "client-capabilities": self._handle_client_capabilities,
         }
 
     async def handle_new_connection(
@@ -137,7 +169,7 @@ class WebSocketHandler:
         """Store client data and initialize group status"""
         self.client_connections[client_uid] = websocket
         self.client_contexts[client_uid] = session_service_context
-        self.received_data_buffers[client_uid] = np.array([])
+        self.received_data_buffers[client_uid] = AudioBuffer()
 
         self.chat_group_manager.client_group_map[client_uid] = ""
         await self.send_group_update(websocket, client_uid)
@@ -185,9 +217,20 @@ class WebSocketHandler:
             live2d_model=self.default_context_cache.live2d_model,
             asr_engine=self.default_context_cache.asr_engine,
             tts_engine=self.default_context_cache.tts_engine,
-            vad_engine=self.default_context_cache.vad_engine,
-            agent_engine=self.default_context_cache.agent_engine,
+            # share the loaded model, but give each session its own VAD state
+            vad_engine=(
+                self.default_context_cache.vad_engine.create_session()
+                if self.default_context_cache.vad_engine
+                else None
+            ),
+            # share the LLM client, but give each session its own memory
+            agent_engine=(
+                self.default_context_cache.agent_engine.fork()
+                if self.default_context_cache.agent_engine
+                else None
+            ),
             translate_engine=self.default_context_cache.translate_engine,
+            engine_keys=self.default_context_cache.engine_keys,
         )
         return session_service_context
 
@@ -204,7 +247,18 @@ class WebSocketHandler:
         try:
             while True:
                 try:
-                    data = await websocket.receive_json()
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+
+                    # Binary frames carry int16 microphone audio
+                    if message.get("bytes") is not None:
+                        await self._handle_audio_frame(
+                            websocket, client_uid, message["bytes"]
+                        )
+                        continue
+
+                    data = json.loads(message["text"])
                     message_handler.handle_message(client_uid, data)
                     await self._route_message(websocket, client_uid, data)
                 except WebSocketDisconnect:
@@ -289,8 +343,19 @@ class WebSocketHandler:
 
         # Clean up other client data
         self.client_connections.pop(client_uid, None)
-        self.client_contexts.pop(client_uid, None)
+        context = self.client_contexts.pop(client_uid, None)
+        if context:
+            context.close()
         self.received_data_buffers.pop(client_uid, None)
+        self.audio_frame_sequences.pop(client_uid, None)
+        self.resamplers.pop(client_uid, None)
+        self.transcriptions.pop(client_uid, None)
+        self.final_transcripts.pop(client_uid, None)
+        self.client_capabilities.pop(client_uid, None)
+        self.audio_encodings.pop(client_uid, None)
+        self._cancel_speculation(client_uid)
+        if speculation := self.confirmed_speculations.pop(client_uid, None):
+            speculation.cancel()
         if client_uid in self.current_conversation_tasks:
             task = self.current_conversation_tasks[client_uid]
             if task and not task.done():
@@ -451,39 +516,243 @@ class WebSocketHandler:
         """Handle incoming audio data"""
         audio_data = data.get("audio", [])
         if audio_data:
-            self.received_data_buffers[client_uid] = np.append(
-                self.received_data_buffers[client_uid],
+            audio = self._resample(
+                client_uid,
                 np.array(audio_data, dtype=np.float32),
+                data.get("sample_rate"),
             )
+            self._append_audio(client_uid, audio)
+            await self._feed_transcription(websocket, client_uid, audio)
 
     async def _handle_raw_audio_data(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
         """Handle incoming raw audio data for VAD processing"""
-        context = self.client_contexts[client_uid]
         chunk = data.get("audio", [])
         if chunk:
-            for audio_bytes in context.vad_engine.detect_speech(chunk):
-                if audio_bytes == b"<|PAUSE|>":
-                    await websocket.send_text(
-                        json.dumps({"type": "control", "text": "interrupt"})
-                    )
-                elif audio_bytes == b"<|RESUME|>":
-                    pass
-                elif len(audio_bytes) > 1024:
-                    # Detected audio activity (voice)
-                    self.received_data_buffers[client_uid] = np.append(
-                        self.received_data_buffers[client_uid],
-                        np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32),
-                    )
-                    await websocket.send_text(
-                        json.dumps({"type": "control", "text": "mic-audio-end"})
-                    )
+            await self._process_vad_chunk(
+                websocket,
+                client_uid,
+                self._resample(
+                    client_uid,
+                    np.array(chunk, dtype=np.float32),
+                    data.get("sample_rate"),
+                ),
+            )
+
+    async def _handle_audio_frame(
+        self, websocket: WebSocket, client_uid: str, frame_bytes: bytes
+    ) -> None:
+        """Handle a binary int16 audio frame (see utils/audio_frame.py)"""
+        frame = decode_audio_frame(frame_bytes)
+
+        last_sequence = self.audio_frame_sequences.get(client_uid)
+        if (
+            last_sequence is not None
+            and frame.sequence != (last_sequence + 1) % SEQUENCE_MODULO
+        ):
+            logger.warning(
+                f"Audio frame sequence gap from {client_uid}: "
+                f"expected {(last_sequence + 1) % SEQUENCE_MODULO}, got {frame.sequence}"
+            )
+        self.audio_frame_sequences[client_uid] = frame.sequence
+
+        if not len(frame.samples):
+            return
+
+        audio = self._resample(client_uid, frame.to_float32(), frame.sample_rate)
+        if frame.kind == AudioFrameKind.MIC_AUDIO_DATA:
+            self._append_audio(client_uid, audio)
+            await self._feed_transcription(websocket, client_uid, audio)
+        else:
+            await self._process_vad_chunk(websocket, client_uid, audio)
+
+    def _resample(
+        self, client_uid: str, audio: np.ndarray, sample_rate: Optional[int]
+    ) -> np.ndarray:
+        """
+        Resample client audio to the rate the VAD and ASR work at.
+
+        Each client stream is resampled once here, so VAD and ASR both get
+        the target rate. Audio without an explicit sample rate is assumed to be
+        at the VAD's configured `orig_sr`.
+        """
+        orig_sr, target_sr = 16000, 16000
+        vad_config = self.client_contexts[client_uid].character_config.vad_config
+        engine_config = vad_config and getattr(vad_config, vad_config.vad_model, None)
+        if engine_config is not None:
+            orig_sr, target_sr = engine_config.orig_sr, engine_config.target_sr
+        sample_rate = sample_rate or orig_sr
+
+        resampler = self.resamplers.get(client_uid)
+        if (
+            resampler is None
+            or resampler.orig_sr != sample_rate
+            or resampler.target_sr != target_sr
+        ):
+            if sample_rate == target_sr:
+                self.resamplers.pop(client_uid, None)
+                return audio
+            logger.debug(
+                f"Resampling audio of {client_uid}: {sample_rate} -> {target_sr} Hz"
+            )
+            resampler = StreamingResampler(sample_rate, target_sr)
+            self.resamplers[client_uid] = resampler
+        return resampler.process(audio)
+
+    def _append_audio(self, client_uid: str, audio: np.ndarray) -> None:
+        """Append float32 samples to the client's utterance buffer"""
+        self.received_data_buffers[client_uid].append(audio)
+
+    async def _process_vad_chunk(
+        self, websocket: WebSocket, client_uid: str, chunk: np.ndarray
+    ) -> None:
+        """Run a float32 audio chunk through the client's VAD"""
+        context = self.client_contexts[client_uid]
+        # The VAD yields the utterance right after <|RESUME|>, or nothing if
+        # the speech was too short to count as one
+        segment_closed = False
+        for audio_bytes in await context.vad_engine.async_detect_speech(chunk):
+            if segment_closed and len(audio_bytes) <= 1024:
+                self._cancel_speculation(client_uid)
+            segment_closed = audio_bytes == b"<|RESUME|>"
+            if audio_bytes == b"<|PAUSE|>":
+                await websocket.send_text(
+                    json.dumps({"type": "control", "text": "interrupt"})
+                )
+                # Speech started: transcribe it while the user is talking
+                self.transcriptions.pop(client_uid, None)
+                await self._feed_transcription(websocket, client_uid, None)
+            elif audio_bytes == b"<|RESUME|>":
+                pass
+            elif audio_bytes == b"<|HANGOVER|>":
+                self._start_speculation(websocket, client_uid)
+            elif audio_bytes == b"<|HANGOVER_CANCEL|>":
+                self._cancel_speculation(client_uid)
+            elif len(audio_bytes) > 1024:
+                # Detected audio activity (voice)
+                audio = (
+                    np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32)
+                    / 32768.0
+                )
+                await self._finish_transcription(client_uid, audio)
+                if speculation := self.speculations.pop(client_uid, None):
+                    self.confirmed_speculations[client_uid] = speculation
+                self._append_audio(client_uid, audio)
+                await websocket.send_text(
+                    json.dumps({"type": "control", "text": "mic-audio-end"})
+                )
+        if segment_closed:
+            # The segment closed without an utterance: drop its speculation
+            self._cancel_speculation(client_uid)
+
+        transcription = self.transcriptions.get(client_uid)
+        if transcription is not None:
+            speech = context.vad_engine.pending_speech()
+            if not len(speech):
+                # The speech was too short to count as an utterance
+                self.transcriptions.pop(client_uid)
+            else:
+                await transcription.feed(speech[transcription.samples_fed :].copy())
+
+    async def _feed_transcription(
+        self, websocket: WebSocket, client_uid: str, audio: Optional[np.ndarray]
+    ) -> None:
+        """
+        Feed utterance audio to the client's streaming transcription, starting
+        one if the ASR engine supports streaming
+        """
+        transcription = self.transcriptions.get(client_uid)
+        if transcription is None:
+            asr_engine = self.client_contexts[client_uid].asr_engine
+            if not supports_streaming(asr_engine):
+                return
+            transcription = StreamingTranscription(asr_engine, websocket.send_text)
+            self.transcriptions[client_uid] = transcription
+        if audio is not None:
+            await transcription.feed(audio)
+
+    async def _finish_transcription(
+        self, client_uid: str, utterance: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Finish the client's streaming transcription and keep the final
+        transcript for the conversation triggered by mic-audio-end
+
+        Args:
+            client_uid: The client whose utterance ended.
+            utterance: The whole utterance, if only part of it has been fed.
+        """
+        transcription = self.transcriptions.pop(client_uid, None)
+        if transcription is None:
+            return
+        if utterance is not None:
+            await transcription.feed(utterance[transcription.samples_fed :])
+        text = await transcription.finish()
+        if text.strip():
+            self.final_transcripts[client_uid] = text
+
+    def _start_speculation(self, websocket: WebSocket, client_uid: str) -> None:
+        """
+        Start transcribing the client's utterance in the background when the
+        VAD hangover begins, if speculative transcription is enabled and the
+        utterance is not already being transcribed by streaming ASR
+        """
+        self._cancel_speculation(client_uid)
+        context = self.client_contexts[client_uid]
+        if (
+            not context.character_config.asr_config.speculative
+            or client_uid in self.transcriptions
+        ):
+            return
+        speech = context.vad_engine.pending_speech()
+        if not len(speech):
+            return
+        self.speculations[client_uid] = SpeculativeTranscription(
+            context.asr_engine,
+            websocket.send_text,
+            speech.copy(),
+            client_uid=client_uid,
+        )
+
+    def _cancel_speculation(self, client_uid: str) -> None:
+        """Discard the client's speculative transcription, if any"""
+        speculation = self.speculations.pop(client_uid, None)
+        if speculation is not None:
+            speculation.cancel()
+
+    async def _finish_speculation(self, client_uid: str) -> None:
+        """
+        Keep the transcript of the client's confirmed speculative
+        transcription for the conversation triggered by mic-audio-end
+        """
+        speculation = self.confirmed_speculations.pop(client_uid, None)
+        if speculation is None:
+            return
+        if client_uid in self.final_transcripts:
+            speculation.cancel()
+            return
+        try:
+            text = await speculation.result()
+        except Exception as e:
+            # Fall back to transcribing the utterance buffer
+            logger.warning(f"Discarding speculative transcription: {e}")
+            return
+        if text.strip():
+            self.final_transcripts[client_uid] = text
 
     async def _handle_conversation_trigger(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
         """Handle triggers that start a conversation"""
+        if data.get("type") == "mic-audio-end":
+            await self._finish_transcription(client_uid)
+            await self._finish_speculation(client_uid)
+        else:
+            self.final_transcripts.pop(client_uid, None)
+            if speculation := self.confirmed_speculations.pop(client_uid, None):
+                speculation.cancel()
+
         await handle_conversation_trigger(
             msg_type=data.get("type", ""),
             data=data,
@@ -496,6 +765,11 @@ class WebSocketHandler:
             received_data_buffers=self.received_data_buffers,
             current_conversation_tasks=self.current_conversation_tasks,
             broadcast_to_group=self.broadcast_to_group,
+            transcripts=self.final_transcripts,
+            binary_audio=self.client_capabilities.get(client_uid, {}).get(
+                "binary_audio", False
+            ),
+            audio_encoding=self.audio_encodings.get(client_uid),
         )
 
     async def _handle_fetch_configs(
@@ -504,6 +778,11 @@ class WebSocketHandler:
         """Handle fetching available configurations"""
         context = self.client_contexts[client_uid]
         config_files = scan_config_alts_directory(context.system_config.config_alts_dir)
+        # Readiness of the characters preloaded in the background
+        warm_states = warm_pool.status()
+        for config_file in config_files:
+            if config_file["filename"] in warm_states:
+                config_file["warm"] = warm_states[config_file["filename"]]
         await websocket.send_text(
             json.dumps({"type": "config-files", "configs": config_files})
         )
@@ -546,6 +825,47 @@ class WebSocketHandler:
                     group_members, silent_payload, exclude_uid=client_uid
                 )
 
+    async def _handle_client_capabilities(
+        self, websocket: WebSocket, client_uid: str, data: WSMessage
+    ) -> None:
+        """
+        Record the optional protocol features the client supports and confirm
+        the ones that will be used. Clients that never send this message get
+        the original protocol (e.g. base64 audio inside JSON).
+        """
+        capabilities = {"binary_audio": bool(data.get("binary_audio", False))}
+        self.client_capabilities[client_uid] = capabilities
+
+        # Compress speech only with a codec the client can play, at the
+        # bitrate it asked for (e.g. lower on a metered connection)
+        encoding = AudioEncoding()
+        codec_config = self.client_contexts[client_uid].system_config.audio_codec
+        if codec_config and codec_config.codec in (data.get("audio_codecs") or []):
+            bitrate = data.get("audio_bitrate_kbps") or codec_config.bitrate_kbps
+            encoding = AudioEncoding(
+                codec=codec_config.codec,
+                bitrate_kbps=min(
+                    max(int(bitrate), codec_config.min_bitrate_kbps),
+                    codec_config.max_bitrate_kbps,
+                ),
+            )
+        self.audio_encodings[client_uid] = encoding
+
+        logger.info(
+            f"Client {client_uid} capabilities: {capabilities}, "
+            f"audio: {encoding.codec} @ {encoding.bitrate_kbps} kbps"
+        )
+        await websocket.send_text(
+            json.dumps(
+                {
+                    "type": "client-capabilities-ack",
+                    **capabilities,
+                    "audio_codec": encoding.codec,
+                    "audio_bitrate_kbps": encoding.bitrate_kbps,
+                }
+            )
+        )
+
     async def _handle_group_info(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark batched faster-whisper transcription at different batch windows.
+
+Simulates clients that each finish an utterance at a random point within a
+short burst, sends them through `ASRWorkerPool`, and reports throughput and
+latency for each batch window (0 = no waiting for a batch to fill). The
+utterances are cut from a wav file if one is given, otherwise synthetic
+audio is used (fine for throughput, meaningless transcripts).
+
+Usage:
+    python tests/benchmark_asr_batching.py --model distil-medium.en
+    python tests/benchmark_asr_batching.py --model models/whisper/small \\
+        --device cuda --wav speech16k.wav --clients 16 --windows 0 25 50 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.open_llm_vtuber.asr.asr_pool import ASRWorkerPool
+from src.open_llm_vtuber.asr.faster_whisper_asr import VoiceRecognition
+
+
+def load_utterances(path: str | None, count: int, seconds: float) -> list:
+    """Cut `count` utterances of `seconds` from a 16 kHz mono wav file."""
+    length = int(16000 * seconds)
+    if path is None:
+        rng = np.random.default_rng(0)
+        t = np.arange(length) / 16000
+        return [
+            (0.3 * np.sin(2 * np.pi * (150 + 20 * i) * t)).astype(np.float32)
+            + rng.normal(0, 0.01, length).astype(np.float32)
+            for i in range(count)
+        ]
+
+    with wave.open(path, "rb") as wf:
+        if wf.getframerate() != 16000 or wf.getnchannels() != 1:
+            raise SystemExit("The wav file must be 16 kHz mono")
+        audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    audio = audio.astype(np.float32) / 32768.0
+    audio = np.tile(audio, -(-length * count // len(audio)))
+    return [audio[i * length : (i + 1) * length] for i in range(count)]
+
+
+async def run_burst(
+    pool: ASRWorkerPool, utterances: list, spread: float
+) -> tuple[float, list]:
+    """Submit every utterance within `spread` seconds and wait for all."""
+    rng = np.random.default_rng(1)
+    latencies = []
+
+    async def client(index: int, audio: np.ndarray):
+        await asyncio.sleep(rng.uniform(0, spread))
+        start = time.perf_counter()
+        await pool.async_transcribe_np(audio, client_uid=f"client-{index}")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i, a) for i, a in enumerate(utterances)))
+    return time.perf_counter() - start, latencies
+
+
+async def main_async(args):
+    engine = VoiceRecognition(
+        model_path=args.model,
+        download_root=args.download_root,
+        language=args.language,
+        device=args.device,
+    )
+    utterances = load_utterances(args.wav, args.clients, args.seconds)
+
+    # Warm up the model before timing
+    engine.transcribe_np(utterances[0])
+
+    print(
+        f"{args.clients} clients, {args.seconds:.1f} s utterances, "
+        f"finishing within {args.spread_ms:.0f} ms\n"
+    )
+    print(
+        f"{'window ms':>9}  {'batch':>5}  {'utt/s':>7}  "
+        f"{'avg lat ms':>10}  {'p95 lat ms':>10}  {'avg batch':>9}"
+    )
+    for window in args.windows:
+        pool = ASRWorkerPool(
+            engine,
+            batch_window_ms=max(window, 0),
+            max_batch_size=args.max_batch_size if window >= 0 else 1,
+        )
+        elapsed, latencies = await run_burst(pool, utterances, args.spread_ms / 1000)
+        stats = pool.stats()
+        pool.close()
+        print(
+            f"{'off' if window < 0 else f'{window:g}':>9}  "
+            f"{pool.max_batch_size:>5}  {len(utterances) / elapsed:>7.2f}  "
+            f"{np.mean(latencies) * 1000:>10.0f}  "
+            f"{np.percentile(latencies, 95) * 1000:>10.0f}  "
+            f"{stats['avg_batch_size']:>9.2f}"
+        )
+
+
+def main():
+    """Run the ASR batching benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark batched faster-whisper transcription"
+    )
+    parser.add_argument("--model", required=True, help="faster-whisper model")
+    parser.add_argument("--download-root", default="models/whisper")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--device", default="auto", choices=["auto", "cpu", "cuda"])
+    parser.add_argument("--wav", help="16 kHz mono wav file to cut utterances from")
+    parser.add_argument(
+        "--clients", type=int, default=8, help="Number of concurrent utterances"
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=3.0, help="Length of each utterance"
+    )
+    parser.add_argument(
+        "--spread-ms",
+        type=float,
+        default=100.0,
+        help="Utterances finish at random times within this many milliseconds",
+    )
+    parser.add_argument(
+        "--windows",
+        type=float,
+        nargs="+",
+        default=[-1, 0, 25, 50, 100, 200],
+        help="Batch windows in milliseconds to compare (-1 = no batching)",
+    )
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming microphone resampler.
+
+Feeds audio at common capture rates through `StreamingResampler` in
+chunks the size a browser typically sends, and reports the CPU time spent per
+second of audio (and the resulting real-time factor) for each rate. It also
+checks that chunked resampling matches resampling the whole stream at once.
+
+Usage:
+    python tests/benchmark_resample.py
+    python tests/benchmark_resample.py --rates 48000 44100 --chunk-ms 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.open_llm_vtuber.utils.resample import StreamingResampler
+
+
+def main():
+    """Run the resampler benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the audio resampler")
+    parser.add_argument(
+        "--rates",
+        type=int,
+        nargs="+",
+        default=[48000, 44100, 32000, 22050, 8000],
+        help="Input sample rates to benchmark",
+    )
+    parser.add_argument(
+        "--target-sr",
+        type=int,
+        default=16000,
+        help="Sample rate to resample to",
+    )
+    parser.add_argument(
+        "--chunk-ms",
+        type=float,
+        default=85.3,
+        help="Chunk length sent by the client in milliseconds",
+    )
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        default=60.0,
+        help="Seconds of audio to resample per rate",
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(
+        f"{'rate':>6}  {'up/down':>9}  {'taps':>5}  "
+        f"{'cpu ms per s':>12}  {'realtime x':>10}  {'max diff':>9}"
+    )
+    for rate in args.rates:
+        audio = rng.normal(0, 0.1, int(args.seconds * rate)).astype(np.float32)
+        chunk_size = max(1, int(rate * args.chunk_ms / 1000))
+        resampler = StreamingResampler(rate, args.target_sr)
+
+        outputs = []
+        start = time.process_time()
+        for i in range(0, len(audio), chunk_size):
+            outputs.append(resampler.process(audio[i : i + chunk_size]))
+        cpu = time.process_time() - start
+
+        resampler.reset()
+        reference = resampler.process(audio)
+        streamed = np.concatenate(outputs)
+        diff = float(np.abs(streamed - reference).max()) if len(reference) else 0.0
+
+        print(
+            f"{rate:>6}  {resampler.up:>4}/{resampler.down:<4}  "
+            f"{resampler.taps_per_phase:>5}  {cpu / args.seconds * 1000:>12.2f}  "
+            f"{args.seconds / max(cpu, 1e-9):>10.0f}  {diff:>9.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTTP path of server-based TTS engines against a stub server.
+
+Starts a local stub of the XTTS API that answers every request with a WAV
+after a fixed synthesis delay, then sends bursts of sentences through the
+XTTS engine two ways:
+
+- thread: the blocking `requests` call in a worker thread (the previous
+  path), a new connection per sentence
+- async: the engine's native `async_generate_audio_data` on the shared,
+  keep-alive httpx client
+
+and reports p50/p99 latency, throughput and the connections each path
+opened, at several concurrency levels.
+
+Usage:
+    python tests/benchmark_tts_http.py
+    python tests/benchmark_tts_http.py --concurrency 1 8 32 --requests 200 --delay-ms 20
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.open_llm_vtuber.tts.http_client import (
+    HTTPClientSettings,
+    close_http_client,
+    configure_http_client,
+)
+from src.open_llm_vtuber.tts.x_tts import TTSEngine
+
+
+def make_wav(seconds: float, sample_rate: int = 24000) -> bytes:
+    """A WAV of a quiet tone, the size of a spoken sentence."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pcm = (0.2 * np.sin(2 * np.pi * 200 * t) * 32767).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+class StubTTSServer(ThreadingHTTPServer):
+    """Answers every POST with `wav` after `delay` seconds."""
+
+    daemon_threads = True
+    # Bursts open many connections at once
+    request_queue_size = 256
+
+    def __init__(self, wav: bytes, delay: float):
+        self.wav = wav
+        self.delay = delay
+        self.connections = 0
+        self._lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), StubTTSHandler)
+
+
+class StubTTSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Content-Length", str(len(self.server.wav)))
+        self.end_headers()
+        # Send the body in pieces, as a server streaming a file would
+        for i in range(0, len(self.server.wav), 16384):
+            self.wfile.write(self.server.wav[i : i + 16384])
+
+    def log_message(self, *args):
+        pass
+
+
+async def run_burst(generate, requests: int, concurrency: int) -> tuple:
+    """Send `requests` sentences, `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            audio = await generate(f"Sentence number {i}.")
+            latencies.append(time.perf_counter() - start)
+            if audio is None:
+                raise SystemExit("The stub server request failed")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    """Run the TTS HTTP benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the HTTP path of server-based TTS engines"
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--requests", type=int, default=128)
+    parser.add_argument(
+        "--delay-ms", type=float, default=50, help="Synthesis time of the stub"
+    )
+    parser.add_argument(
+        "--audio-seconds", type=float, default=3, help="Length of each reply"
+    )
+    parser.add_argument("--max-connections", type=int, default=16)
+    args = parser.parse_args()
+
+    server = StubTTSServer(make_wav(args.audio_seconds), args.delay_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    engine = TTSEngine(api_url=f"http://127.0.0.1:{server.server_port}/tts_to_audio")
+    configure_http_client(
+        HTTPClientSettings(
+            max_connections=args.max_connections,
+            max_keepalive_connections=args.max_connections,
+        )
+    )
+
+    paths = {
+        "thread": lambda text: asyncio.to_thread(engine.generate_audio_data, text),
+        "async": engine.async_generate_audio_data,
+    }
+
+    async def run() -> None:
+        print(
+            f"{args.requests} requests, {args.delay_ms:g} ms synthesis, "
+            f"{len(server.wav) / 1024:.0f} KB replies\n"
+        )
+        print(
+            f"{'conc':>4}  {'path':>6}  {'p50 ms':>7}  {'p99 ms':>7}  "
+            f"{'req/s':>7}  {'conns':>5}"
+        )
+        for concurrency in args.concurrency:
+            for name, generate in paths.items():
+                # Warm up, then count the connections of the measured burst
+                await run_burst(generate, concurrency, concurrency)
+                connections = server.connections
+                elapsed, latencies = await run_burst(
+                    generate, args.requests, concurrency
+                )
+                p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+                print(
+                    f"{concurrency:>4}  {name:>6}  {p50:>7.1f}  {p99:>7.1f}  "
+                    f"{args.requests / elapsed:>7.0f}  "
+                    f"{server.connections - connections:>5}"
+                )
+        await close_http_client()
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark the batched VAD scheduler against per-window Silero VAD inference.
+
+Simulates N clients that each stream audio chunks through their own VAD
+session, once with every window run inline on the event loop (the old path)
+and once through the cross-client `VADBatchScheduler`. For each run it
+reports the VAD throughput in windows/sec and how long the event loop was
+stalled, measured by a probe task that should wake up every millisecond.
+
+Usage:
+    python tests/benchmark_vad_scheduler.py
+    python tests/benchmark_vad_scheduler.py --clients 1 10 50 --seconds 5
+    python tests/benchmark_vad_scheduler.py --wav speech_16k.wav
+"""
+
+import os
+import sys
+import time
+import wave
+import asyncio
+import argparse
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.open_llm_vtuber.vad.silero import VADEngine  # noqa: E402
+
+PROBE_INTERVAL = 0.001
+
+
+def load_audio(path: str | None, seconds: float, sample_rate: int) -> np.ndarray:
+    """Load a 16-bit mono WAV file, or generate noise if no file is given."""
+    if path is None:
+        rng = np.random.default_rng(0)
+        return rng.normal(0, 0.1, int(seconds * sample_rate)).astype(np.float32)
+
+    with wave.open(path, "rb") as f:
+        if f.getnchannels() != 1 or f.getsampwidth() != 2:
+            raise ValueError("Expected a 16-bit mono WAV file")
+        if f.getframerate() != sample_rate:
+            raise ValueError(f"Expected a {sample_rate} Hz WAV file")
+        audio = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+    return audio.astype(np.float32) / 32768.0
+
+
+async def probe_loop(stalls: list[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes this task up."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        stalls.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def run_client(session, audio: np.ndarray, chunk_size: int) -> None:
+    for i in range(0, len(audio) - chunk_size + 1, chunk_size):
+        await session.async_detect_speech(audio[i : i + chunk_size])
+        # Let other clients and the probe run between chunks, like a real
+        # receive loop would
+        await asyncio.sleep(0)
+
+
+async def run_benchmark(
+    engine: VADEngine, clients: int, audio: np.ndarray, chunk_size: int
+) -> dict:
+    sessions = [engine.create_session() for _ in range(clients)]
+    stalls: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop(stalls, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(s, audio, chunk_size) for s in sessions))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+
+    windows = (
+        clients
+        * (len(audio) // chunk_size)
+        * (chunk_size // engine.window_size_samples)
+    )
+    stalls_ms = np.array(stalls or [0.0]) * 1000
+    return {
+        "windows_per_sec": windows / elapsed,
+        "stall_p50_ms": float(np.percentile(stalls_ms, 50)),
+        "stall_p99_ms": float(np.percentile(stalls_ms, 99)),
+        "stall_max_ms": float(stalls_ms.max()),
+    }
+
+
+def main():
+    """Run the VAD scheduler benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark batched VAD inference")
+    parser.add_argument(
+        "--clients",
+        type=int,
+        nargs="+",
+        default=[1, 10, 50],
+        help="Numbers of simulated clients",
+    )
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        default=5.0,
+        help="Seconds of audio each client sends",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4096,
+        help="Samples per audio chunk sent by a client",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=64,
+        help="Maximum number of windows per batched inference",
+    )
+    parser.add_argument(
+        "--wav",
+        type=str,
+        default=None,
+        help="16 kHz 16-bit mono WAV file to stream (default: white noise)",
+    )
+    args = parser.parse_args()
+
+    engines = {
+        "per-window": VADEngine(batched_inference=False),
+        "batched": VADEngine(
+            batched_inference=True, max_batch_size=args.max_batch_size
+        ),
+    }
+    audio = load_audio(args.wav, args.seconds, engines["batched"].config.target_sr)
+
+    print(
+        f"{'clients':>7}  {'mode':<10}  {'windows/s':>10}  "
+        f"{'stall p50':>9}  {'stall p99':>9}  {'stall max':>9}"
+    )
+    for clients in args.clients:
+        for mode, engine in engines.items():
+            result = asyncio.run(run_benchmark(engine, clients, audio, args.chunk_size))
+            print(
+                f"{clients:>7}  {mode:<10}  {result['windows_per_sec']:>10.0f}  "
+                f"{result['stall_p50_ms']:>7.2f}ms  {result['stall_p99_ms']:>7.2f}ms  "
+                f"{result['stall_max_ms']:>7.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark the lip-sync volume envelope against the previous pydub version.
+
+The pydub version cuts the audio with `make_chunks` and reads `chunk.rms` in
+a Python loop; the NumPy version computes the RMS of every slice in one
+pass. Both are run on synthetic speech-like clips of increasing length, and
+the envelopes are compared to make sure they match.
+
+Usage:
+    python tests/benchmark_volume_envelope.py
+    python tests/benchmark_volume_envelope.py --sample-rate 44100 --lengths 1 5 30
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.utils import make_chunks
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.open_llm_vtuber.utils.stream_audio import (
+    VolumeEnvelope,
+    _get_volume_by_chunks,
+)
+
+
+def pydub_volumes(audio: AudioSegment, chunk_length_ms: int) -> list:
+    """The previous implementation of `_get_volume_by_chunks`."""
+    chunks = make_chunks(audio, chunk_length_ms)
+    volumes = [chunk.rms for chunk in chunks]
+    max_volume = max(volumes)
+    if max_volume == 0:
+        raise ValueError("Audio is empty or all zero.")
+    return [volume / max_volume for volume in volumes]
+
+
+def make_clip(seconds: float, sample_rate: int) -> AudioSegment:
+    """A tone with a syllable-like amplitude envelope, plus some noise."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    envelope = np.abs(np.sin(2 * np.pi * 3 * t))
+    signal = envelope * np.sin(2 * np.pi * 180 * t) + rng.normal(0, 0.02, len(t))
+    pcm = (np.clip(signal * 0.5, -1, 1) * 32767).astype(np.int16)
+    return AudioSegment(
+        pcm.tobytes(), frame_rate=sample_rate, sample_width=2, channels=1
+    )
+
+
+def best_of(repeat: int, func, *args) -> float:
+    """Fastest of `repeat` runs, in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def incremental(audio: AudioSegment, chunk_length_ms: int, piece_ms: int) -> list:
+    """Envelope of the clip fed to VolumeEnvelope in `piece_ms` pieces."""
+    envelope = VolumeEnvelope(audio.frame_rate, chunk_length_ms)
+    data = audio.raw_data
+    step = audio.frame_rate * 2 * piece_ms // 1000
+    volumes = [envelope.feed(data[i : i + step])[1] for i in range(0, len(data), step)]
+    volumes.append(envelope.flush()[1])
+    return np.concatenate(volumes)
+
+
+def main():
+    """Run the volume envelope benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the lip-sync volume envelope"
+    )
+    parser.add_argument("--sample-rate", type=int, default=24000)
+    parser.add_argument("--slice-ms", type=int, default=20)
+    parser.add_argument(
+        "--lengths",
+        type=float,
+        nargs="+",
+        default=[1, 2, 5, 10, 30],
+        help="Clip lengths in seconds",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.sample_rate} Hz, {args.slice_ms} ms slices\n")
+    print(
+        f"{'clip s':>6}  {'pydub ms':>9}  {'numpy ms':>9}  {'speedup':>8}  "
+        f"{'stream ms':>9}  {'max diff':>9}"
+    )
+    for seconds in args.lengths:
+        audio = make_clip(seconds, args.sample_rate)
+        reference = np.array(pydub_volumes(audio, args.slice_ms))
+        volumes = np.array(_get_volume_by_chunks(audio, args.slice_ms))
+        streamed = incremental(audio, args.slice_ms, 250)
+        streamed = streamed / streamed.max()
+        if len(reference) != len(volumes) or len(volumes) != len(streamed):
+            raise SystemExit(
+                f"Slice counts differ: {len(reference)} (pydub), "
+                f"{len(volumes)} (numpy), {len(streamed)} (incremental)"
+            )
+        diff = max(np.abs(reference - volumes).max(), np.abs(volumes - streamed).max())
+
+        pydub_ms = best_of(args.repeat, pydub_volumes, audio, args.slice_ms)
+        numpy_ms = best_of(args.repeat, _get_volume_by_chunks, audio, args.slice_ms)
+        stream_ms = best_of(args.repeat, incremental, audio, args.slice_ms, 250)
+        print(
+            f"{seconds:>6g}  {pydub_ms:>9.2f}  {numpy_ms:>9.2f}  "
+            f"{pydub_ms / numpy_ms:>7.1f}x  {stream_ms:>9.2f}  {diff:>9.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
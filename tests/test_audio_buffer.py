@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-client utterance buffer.
+
+The samples `AudioBuffer.take()` returns can still be waiting in the ASR
+pool (or in a speculative transcription) while the next utterance is being
+recorded, so they must not change when the buffer is reused.
+
+Usage:
+    python tests/test_audio_buffer.py
+"""
+
+import os
+import sys
+
+import numpy as np
+from loguru import logger
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.open_llm_vtuber.utils.audio_buffer import AudioBuffer  # noqa: E402
+
+
+def test_take_back_to_back_keeps_first_utterance():
+    buffer = AudioBuffer(initial_capacity=1024)
+    rng = np.random.default_rng(0)
+
+    first_audio = rng.uniform(-1, 1, 3000).astype(np.float32)
+    for chunk in np.array_split(first_audio, 7):
+        buffer.append(chunk)
+    first = buffer.take()
+
+    second_audio = rng.uniform(-1, 1, 2000).astype(np.float32)
+    buffer.append(second_audio)
+    second = buffer.take()
+
+    # Record a third utterance over the reused backing array
+    buffer.append(np.zeros(500, dtype=np.float32))
+
+    assert np.array_equal(first, first_audio)
+    assert np.array_equal(second, second_audio)
+    assert len(buffer) == 500
+
+
+def test_append_grows_and_converts():
+    buffer = AudioBuffer(initial_capacity=4)
+    buffer.append(np.arange(3, dtype=np.int16))
+    buffer.append(np.arange(3, 10, dtype=np.float64))
+    assert buffer.capacity >= 10
+    assert buffer.view().dtype == np.float32
+    assert np.array_equal(buffer.take(), np.arange(10, dtype=np.float32))
+    assert len(buffer) == 0
+
+
+def main():
+    """Run the audio buffer tests."""
+    tests = [
+        test_take_back_to_back_keeps_first_utterance,
+        test_append_grows_and_converts,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            logger.info(f"{test.__name__}: ok")
+        except AssertionError:
+            logger.exception(f"{test.__name__}: failed")
+            failed += 1
+    if failed:
+        sys.exit(1)
+    logger.success("All audio buffer tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Parity test for the vectorized Silero VAD state machine.
+
+`StateMachine.process_chunk` computes the int16 conversion, dB and smoothed
+probability/dB of all windows of a chunk at once. This script checks that it
+produces exactly the same output as feeding the same windows one at a time
+through `StateMachine.process`: the same PAUSE/RESUME markers at the same
+windows, the same utterance bytes and the same smoothed values.
+
+It always runs on synthetic probability sequences. Pass recorded 16 kHz
+16-bit mono WAV files with --wav to also check real Silero probabilities on
+real speech.
+
+No recording is committed as a fixture. The check compares two code paths
+fed the same probabilities and audio, so it does not depend on where they
+come from. The synthetic cases also cover what a short clip rarely does:
+skipped (zero-probability) windows, digital silence (-inf dB), many
+segment boundaries and every chunk size. Recordings are better kept out of
+the repository, but --wav runs the same check on them.
+
+Usage:
+    python tests/test_vad_parity.py
+    python tests/test_vad_parity.py --wav recording1.wav recording2.wav
+"""
+
+import os
+import sys
+import wave
+import argparse
+
+import numpy as np
+from loguru import logger
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.open_llm_vtuber.vad.silero import (  # noqa: E402
+    SileroVADConfig,
+    StateMachine,
+    VADEngine,
+)
+
+WINDOW_SIZE = 512
+CHUNK_SIZES = [1, 2, 3, 8, 13, 32]  # in windows
+
+
+def reference_events(config: SileroVADConfig, probs, windows) -> list:
+    """Feed windows one at a time, like the original per-window loop."""
+    state = StateMachine(config)
+    events = []
+    for prob, window in zip(probs, windows):
+        if prob:
+            for smoothed_probs, dbs, chunk in state.process(float(prob), window):
+                events.append((list(smoothed_probs), list(dbs), bytes(chunk)))
+    return events
+
+
+def vectorized_events(
+    config: SileroVADConfig, probs, windows, chunk_windows: int
+) -> list:
+    """Feed windows in chunks through `process_chunk`."""
+    state = StateMachine(config)
+    events = []
+    for start in range(0, len(probs), chunk_windows):
+        chunk_probs = np.asarray(probs[start : start + chunk_windows], np.float64)
+        chunk = windows[start : start + chunk_windows]
+        # Same filtering as VADSession.feed_state_machine
+        voiced = chunk_probs != 0
+        results = state.process_chunk(chunk_probs[voiced], chunk[voiced])
+        for smoothed_probs, dbs, data in results:
+            events.append((list(smoothed_probs), list(dbs), bytes(data)))
+    return events
+
+
+def compare(name: str, expected: list, actual: list) -> bool:
+    if len(expected) != len(actual):
+        logger.error(f"{name}: {len(expected)} events expected, got {len(actual)}")
+        return False
+    for i, (exp, act) in enumerate(zip(expected, actual)):
+        exp_probs, exp_dbs, exp_bytes = exp
+        act_probs, act_dbs, act_bytes = act
+        if exp_bytes != act_bytes:
+            logger.error(f"{name}: event {i} has different audio bytes")
+            return False
+        if not (
+            np.array_equal(exp_probs, act_probs) and np.array_equal(exp_dbs, act_dbs)
+        ):
+            logger.error(f"{name}: event {i} has different smoothed values")
+            return False
+    return True
+
+
+def synthetic_case(rng: np.random.Generator, windows: int):
+    """Bursty speech probabilities with matching loud/quiet audio."""
+    probs = np.empty(windows)
+    audio = np.empty((windows, WINDOW_SIZE), dtype=np.float32)
+    speaking = False
+    for i in range(windows):
+        if rng.random() < 0.03:
+            speaking = not speaking
+        if speaking:
+            probs[i] = rng.uniform(0.2, 1.0)
+            audio[i] = rng.normal(0, rng.uniform(0.02, 0.5), WINDOW_SIZE)
+        else:
+            probs[i] = rng.uniform(0.0, 0.5)
+            audio[i] = rng.normal(0, rng.uniform(0.0, 0.01), WINDOW_SIZE)
+        if rng.random() < 0.02:
+            probs[i] = 0.0  # skipped by the state machine
+        if rng.random() < 0.02:
+            audio[i] = 0.0  # digital silence, -inf dB
+    return probs, np.clip(audio, -1.0, 1.0)
+
+
+def load_wav(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as f:
+        if f.getnchannels() != 1 or f.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected a 16-bit mono WAV file")
+        if f.getframerate() != 16000:
+            raise ValueError(f"{path}: expected a 16 kHz WAV file")
+        audio = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+    return audio.astype(np.float32) / 32768.0
+
+
+def check_case(name: str, config: SileroVADConfig, probs, windows) -> bool:
+    expected = reference_events(config, probs, windows)
+    ok = True
+    for chunk_windows in CHUNK_SIZES:
+        actual = vectorized_events(config, probs, windows, chunk_windows)
+        ok &= compare(f"{name} (chunk={chunk_windows})", expected, actual)
+    markers = sum(1 for event in expected if event[2] == b"<|PAUSE|>")
+    logger.info(f"{name}: {len(expected)} events, {markers} utterances")
+    return ok
+
+
+def main():
+    """Run the VAD parity checks."""
+    parser = argparse.ArgumentParser(description="Check vectorized VAD parity")
+    parser.add_argument(
+        "--wav",
+        type=str,
+        nargs="*",
+        default=[],
+        help="Recorded 16 kHz 16-bit mono WAV files to check",
+    )
+    parser.add_argument(
+        "--cases",
+        type=int,
+        default=20,
+        help="Number of synthetic cases",
+    )
+    args = parser.parse_args()
+
+    configs = [
+        SileroVADConfig(),
+        SileroVADConfig(smoothing_window=1, required_hits=1, required_misses=5),
+        SileroVADConfig(smoothing_window=3, prob_threshold=0.6, db_threshold=50),
+        SileroVADConfig(smoothing_window=8, required_misses=10),
+        SileroVADConfig(adaptive_endpointing=True),
+    ]
+
+    ok = True
+    rng = np.random.default_rng(0)
+    for case in range(args.cases):
+        probs, windows = synthetic_case(rng, 2000)
+        config = configs[case % len(configs)]
+        ok &= check_case(f"synthetic #{case}", config, probs, windows)
+
+    if args.wav:
+        engine = VADEngine(batched_inference=False)
+        for path in args.wav:
+            session = engine.create_session()
+            windows = session.split_windows(load_wav(path))
+            probs = np.array([session.get_speech_prob(w) for w in windows])
+            for config in configs:
+                ok &= check_case(os.path.basename(path), config, probs, windows)
+
+    if not ok:
+        logger.error("Vectorized VAD output differs from the reference")
+        sys.exit(1)
+    logger.success("Vectorized VAD output matches the reference")
+
+
+if __name__ == "__main__":
+    main()